@@ -149,6 +149,44 @@ MEDIA_URL = "/media/"
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 
 
+# =========================
+# CACHE (SHARED BY ALL WORKERS)
+# =========================
+# Signal invalidation, dashboard dirty flags / rebuild locks and report
+# job state must be seen by every process, so the cache is never the
+# per-process LocMem default. Redis when REDIS_URL is set, otherwise the
+# database (table created by core migration 0022 / `createcachetable`).
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+        }
+    }
+
+
+# =========================
+# SKILL PROFILE QUEUE
+# =========================
+# On by default: triggers for a user within PROFILE_QUEUE_WINDOW_SECONDS
+# coalesce into one SkillProfile recompute, drained by a background
+# thread of the web process. To drain from a dedicated worker instead,
+# set PROFILE_QUEUE_INLINE_WORKER=0 and run
+# `python manage.py process_profile_queue --loop` (or without --loop
+# from cron). PROFILE_QUEUE_ENABLED=0 recomputes inline on every trigger.
+PROFILE_QUEUE_ENABLED = os.environ.get("PROFILE_QUEUE_ENABLED", "1") == "1"
+PROFILE_QUEUE_INLINE_WORKER = os.environ.get("PROFILE_QUEUE_INLINE_WORKER", "1") == "1"
+
+
 # =========================
 # AUTHENTICATION (FIX 🔥)
 # =========================
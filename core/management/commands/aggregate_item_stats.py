@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from core.utils_checkpoint import reset_checkpoint
+from core.utils_item_stats import (
+    CHECKPOINT_NAME,
+    RESPONSES_CHECKPOINT_NAME,
+    aggregate_item_stats,
+)
+from core.models import ItemStat
+
+
+class Command(BaseCommand):
+    help = "Incrementally fold new quiz attempts and daily/weekly responses into per-item statistics"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop all item stats and re-aggregate from the first attempt and response",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["rebuild"]:
+            ItemStat.objects.all().delete()
+            reset_checkpoint(CHECKPOINT_NAME)
+            reset_checkpoint(RESPONSES_CHECKPOINT_NAME)
+
+        processed = aggregate_item_stats(batch_size=opts["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Item stats updated from {processed} attempts/responses")
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from core.models import DailyUsageRollup, TopicImprovementRollup, UserDailyActivity
+from core.utils_checkpoint import reset_checkpoint
+from core.utils_readiness_series import aggregate_readiness
+from core.utils_rollups import CHECKPOINT_NAME, aggregate_topic_improvement, aggregate_usage
+
+
+class Command(BaseCommand):
+    help = "Incrementally fold UsageLog / TopicStat / ReadinessHistory into their rollups"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=2000)
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help=(
+                "Drop the usage/topic rollups and re-aggregate from the first log row. "
+                "Readiness rollups are kept: their raw rows are pruned once folded."
+            ),
+        )
+
+    def handle(self, *args, **opts):
+        if opts["rebuild"]:
+            DailyUsageRollup.objects.all().delete()
+            UserDailyActivity.objects.all().delete()
+            TopicImprovementRollup.objects.all().delete()
+            reset_checkpoint(CHECKPOINT_NAME)
+
+        processed = aggregate_usage(batch_size=opts["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Usage rollups updated from {processed} log rows"))
+
+        topics = aggregate_topic_improvement(full=opts["rebuild"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Topic improvement rollups refreshed for {topics} topics"))
+
+        readiness = aggregate_readiness()
+        self.stdout.write(self.style.SUCCESS(f"✅ Readiness rollups updated from {readiness} history rows"))
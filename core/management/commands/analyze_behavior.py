@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import InterviewSession
+from core.utils_behavior_engine import analyze_sessions
+
+
+class Command(BaseCommand):
+    help = "Nightly: recompute interview behavior metrics for many sessions at once"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since-days", type=int, default=None,
+                            help="Only sessions created in the last N days (default: all)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        sessions = InterviewSession.objects.filter(total_questions__gte=2).order_by("id")
+
+        if opts["since_days"] is not None:
+            sessions = sessions.filter(
+                created_at__gte=timezone.now() - timedelta(days=opts["since_days"])
+            )
+
+        analysed = 0
+        last_id = 0
+        batch_size = opts["batch_size"]
+
+        while True:
+            batch = list(sessions.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+
+            analysed += analyze_sessions(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Analysed {analysed} interview sessions"))
@@ -0,0 +1,182 @@
+import random
+import time
+import uuid
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Avg, Count
+from django.test.utils import CaptureQueriesContext
+
+from core.models import (
+    Book,
+    Institution,
+    InstitutionMembership,
+    InterviewSession,
+    SkillProfile,
+    TopicStat,
+)
+from core.utils_institution_analytics import get_institution_analytics, student_ids_for
+from core.utils_prediction_store import refresh_predictions
+
+
+BRANCHES = ["CSE", "ECE", "IT", "MECH"]
+BATCHES = ["2025", "2026", "2027"]
+TOPICS = [f"Topic {i}" for i in range(30)]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the college admin analytics on a seeded dataset (creates and removes its own data)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=10000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--skip-legacy", action="store_true", help="Don't time the pre-engine queries")
+        parser.add_argument("--keep", action="store_true", help="Keep the generated institution/students")
+
+    # --------------------------------------------------
+    # FIXTURES
+    # --------------------------------------------------
+    @transaction.atomic
+    def _seed(self, n, seed):
+        rng = random.Random(seed)
+        tag = uuid.uuid4().hex[:8]
+        User = get_user_model()
+
+        institution = Institution.objects.create(
+            name=f"Benchmark College {tag}", code=f"BENCH-{tag}", plan="enterprise"
+        )
+        book = Book.objects.create(title=f"Benchmark {tag}", slug=f"bench-{tag}")
+
+        User.objects.bulk_create(
+            [User(username=f"bench-{tag}-{i}", password="!") for i in range(n)],
+            batch_size=1000,
+        )
+        users = list(User.objects.filter(username__startswith=f"bench-{tag}-").values_list("id", flat=True))
+
+        InstitutionMembership.objects.bulk_create([
+            InstitutionMembership(
+                user_id=uid, institution=institution, role="student",
+                branch=rng.choice(BRANCHES), batch=rng.choice(BATCHES),
+            )
+            for uid in users
+        ], batch_size=1000)
+
+        SkillProfile.objects.bulk_create([
+            SkillProfile(
+                user_id=uid,
+                technical_score=rng.uniform(0, 100),
+                communication_score=rng.uniform(0, 100),
+                confidence_score=rng.uniform(0, 100),
+                accuracy_score=rng.uniform(0, 100),
+                consistency_score=rng.uniform(0, 100),
+                readiness_score=rng.uniform(0, 100),
+                behavior_score=rng.uniform(0, 100),
+                risk_level=rng.choice(["low", "medium", "high"]),
+            )
+            for uid in users
+        ], batch_size=1000)
+
+        monday = date.today() - timedelta(days=date.today().weekday())
+        InterviewSession.objects.bulk_create([
+            InterviewSession(
+                user_id=uid,
+                week_start=monday - timedelta(weeks=w),
+                total_questions=5,
+                average_score=rng.uniform(3, 9),
+                performance_slope=rng.uniform(-3, 3),
+                confidence_trend=rng.uniform(-2, 2),
+                risk_flag=rng.random() < 0.2,
+            )
+            for uid in users
+            for w in range(rng.randint(0, 3))
+        ], batch_size=1000)
+
+        TopicStat.objects.bulk_create([
+            TopicStat(user_id=uid, book=book, topic=topic, mastery_score=rng.uniform(0, 100))
+            for uid in users
+            for topic in rng.sample(TOPICS, 3)
+        ], batch_size=1000)
+
+        return institution, book, users
+
+    def _teardown(self, institution, book, users):
+        User = get_user_model()
+        for i in range(0, len(users), 1000):
+            User.objects.filter(id__in=users[i:i + 1000]).delete()
+        institution.delete()
+        book.delete()
+
+    # --------------------------------------------------
+    # PRE-ENGINE QUERIES (for comparison)
+    # --------------------------------------------------
+    def _legacy(self, institution):
+        student_ids = (
+            InstitutionMembership.objects
+            .filter(institution=institution, role="student")
+            .values_list("user_id", flat=True)
+        )
+        profiles = SkillProfile.objects.filter(user_id__in=student_ids)
+
+        list(profiles.filter(risk_level="high").order_by("readiness_score"))
+        list(profiles.filter(risk_level="medium").order_by("readiness_score"))
+        list(profiles.filter(risk_level="low").order_by("-readiness_score"))
+        profiles.aggregate(avg=Avg("readiness_score"))
+        profiles.filter(readiness_score__lt=40).count()
+        profiles.filter(readiness_score__gte=40, readiness_score__lt=70).count()
+        profiles.filter(readiness_score__gte=70).count()
+        list(profiles.order_by("-readiness_score")[:10])
+        list(
+            TopicStat.objects
+            .filter(user_id__in=student_ids, mastery_score__lt=40)
+            .values("topic")
+            .annotate(student_count=Count("user", distinct=True))
+            .order_by("-student_count")[:5]
+        )
+
+        latest = {}
+        for session in InterviewSession.objects.filter(user_id__in=student_ids).order_by("user_id", "-created_at"):
+            latest.setdefault(session.user_id, session)
+        sorted(
+            [s for s in latest.values() if s.risk_flag],
+            key=lambda x: x.user.skillprofile.readiness_score,
+        )
+
+    # --------------------------------------------------
+    # RUN
+    # --------------------------------------------------
+    def _timed(self, label, fn):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+        self.stdout.write(f"{label:<28} {elapsed * 1000:>9.1f} ms  {len(queries):>6} queries")
+        return elapsed
+
+    def handle(self, *args, **opts):
+        start = time.perf_counter()
+        institution, book, users = self._seed(opts["students"], opts["seed"])
+        self.stdout.write(f"Seeded {len(users)} students in {time.perf_counter() - start:.1f}s")
+
+        try:
+            # Predictions are materialized by their own job; warm them first
+            self._timed("refresh predictions", lambda: refresh_predictions(
+                list(student_ids_for(institution).values_list("user_id", flat=True))
+            ))
+
+            if not opts["skip_legacy"]:
+                self._timed("legacy (per-panel, N+1)", lambda: self._legacy(institution))
+
+            cold = self._timed("engine (cold)", lambda: get_institution_analytics(institution, refresh=True))
+            self._timed("engine (branch+batch)", lambda: get_institution_analytics(
+                institution, BRANCHES[0], BATCHES[0], refresh=True
+            ))
+            warm = self._timed("engine (cached)", lambda: get_institution_analytics(institution))
+        finally:
+            if not opts["keep"]:
+                self._teardown(institution, book, users)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Cold {cold * 1000:.1f} ms, cached {warm * 1000:.2f} ms"
+        ))
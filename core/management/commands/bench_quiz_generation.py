@@ -0,0 +1,146 @@
+import os
+import random
+import re
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import quiz_generator
+from core.quiz_generator import (
+    generate_full_quiz,
+    generate_mixed_quiz_from_text,
+    tokenize_chapter,
+    clean_text_tokenized,
+)
+from core.utils_format import _meaningful_sentences, _sanitize_content
+
+
+# ------------------------------------------------------------
+# BASELINE: the generators before sentence tokens were cached —
+# re.findall per sentence and a fresh re.escape pattern per question
+# on every request. Same four calls as Command._run.
+# ------------------------------------------------------------
+def _baseline_blank(word, sentence, mask="_____"):
+    return re.sub(re.escape(word), mask, sentence, flags=re.IGNORECASE)
+
+
+def _baseline_split_quiz(text, min_chars, mcq_n, fill_slice):
+    sentences = [s.strip() for s in text.split(".") if len(s.strip()) > min_chars]
+    quiz = {"mcq": [], "fill": []}
+
+    for s in sentences[:mcq_n]:
+        words = [w for w in re.findall(r"\w+", s) if len(w) > 4]
+        if not words:
+            continue
+        correct = words[0]
+        options = [correct] + random.sample(
+            [w for w in words if w.lower() != correct.lower()],
+            min(3, len([w for w in words if w.lower() != correct.lower()])),
+        )
+        quiz["mcq"].append({"question": _baseline_blank(correct, s), "options": options})
+
+    for s in sentences[fill_slice]:
+        parts = s.split()
+        if len(parts) >= 4:
+            quiz["fill"].append({"question": s.replace(parts[-1], "______"), "answer": parts[-1]})
+    return quiz
+
+
+def _baseline_sentence_quiz(text, mcq_n=10, fill_n=5):
+    sentences = _meaningful_sentences(_sanitize_content(text or ""))
+    out = []
+
+    for s in random.sample(sentences, min(mcq_n, len(sentences))):
+        words = re.findall(r"\w+", s)
+        if not words:
+            continue
+        correct = sorted(words, key=lambda w: (-len(w), w))[0]
+        out.append(_baseline_blank(correct, s))
+
+    for s in random.sample(sentences, min(fill_n, len(sentences))):
+        words = re.findall(r"\w+", s)
+        if len(words) >= 4:
+            out.append(_baseline_blank(words[max(1, min(len(words) - 2, len(words) // 3))], s))
+    return out
+
+
+def baseline_quiz_set(text):
+    _baseline_split_quiz(text, 25, 5, slice(5, 10))    # generate_full_quiz
+    _baseline_split_quiz(text, 20, 10, slice(10, 15))  # generate_mixed_quiz_from_text
+    _baseline_sentence_quiz(text)                      # MCQ + fill from clean_text
+
+
+class Command(BaseCommand):
+    help = "Microbenchmark per-quiz generation cost (regex baseline vs tokenized, cold and cached)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subject", default="java")
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def _chapter_texts(self, subject):
+        from core.books_loader import BOOK_KB, BOOKS_PATH
+
+        texts = [
+            " ".join(sec["sentences"])
+            for sec in BOOK_KB.get(subject, {}).get("sections", {}).values()
+            if sec.get("sentences")
+        ]
+        if texts:
+            return texts
+
+        # Books not loaded (e.g. embeddings unavailable) → read raw chapter files
+        from core.utils import extract_text
+
+        folder = os.path.join(BOOKS_PATH, subject)
+        if not os.path.isdir(folder):
+            return []
+
+        return [
+            extract_text(os.path.join(folder, fname))
+            for fname in sorted(os.listdir(folder))
+            if fname.endswith(".html")
+        ]
+
+    def _run_baseline(self, texts, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for text in texts:
+                baseline_quiz_set(text)
+        elapsed = time.perf_counter() - start
+        return elapsed / max(1, iterations * len(texts))
+
+    def _run(self, texts, iterations, cold):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for text in texts:
+                if cold:
+                    tokenize_chapter.cache_clear()
+                    clean_text_tokenized.cache_clear()
+                generate_full_quiz(text)
+                generate_mixed_quiz_from_text(text)
+                quiz_generator.generate_mcq_from_sentences(clean_text_tokenized(text), 10)
+                quiz_generator.generate_fill_from_sentences(clean_text_tokenized(text), 5)
+        elapsed = time.perf_counter() - start
+        return elapsed / max(1, iterations * len(texts))
+
+    def handle(self, *args, **opts):
+        texts = [t for t in self._chapter_texts(opts["subject"]) if t]
+
+        if not texts:
+            self.stdout.write(self.style.ERROR(f"No chapter text found for '{opts['subject']}'"))
+            return
+
+        iterations = opts["iterations"]
+
+        baseline = self._run_baseline(texts, iterations)
+        cold = self._run(texts, iterations, cold=True)
+        warm = self._run(texts, iterations, cold=False)
+
+        self.stdout.write(f"Chapters: {len(texts)}  Iterations: {iterations}")
+        self.stdout.write(f"Baseline (regex per question):  {baseline * 1000:.3f} ms / chapter quiz set")
+        self.stdout.write(f"Cold (tokenize every request):  {cold * 1000:.3f} ms / chapter quiz set")
+        self.stdout.write(f"Warm (cached chapter tokens):   {warm * 1000:.3f} ms / chapter quiz set")
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Speed-up vs baseline: cold {baseline / cold if cold else 0:.1f}x, "
+            f"warm {baseline / warm if warm else 0:.1f}x"
+        ))
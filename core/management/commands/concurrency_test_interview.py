@@ -0,0 +1,138 @@
+import json
+import math
+import threading
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Avg, Count
+from django.test import Client
+
+from core.models import InterviewSession
+from core.utils_interview_engine import get_week_start
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire parallel POST /api/interview/hr/ answers for the same students and "
+        "check that no session aggregate update was lost (creates and removes its own data)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5)
+        parser.add_argument("--answers", type=int, default=4, help="Parallel answers per student")
+        parser.add_argument("--keep", action="store_true", help="Keep generated users/sessions")
+
+    # --------------------------------------------------
+    # FIXTURES
+    # --------------------------------------------------
+    def _setup(self, n_users):
+        tag = uuid.uuid4().hex[:8]
+        User = get_user_model()
+
+        users = [
+            User.objects.create_user(username=f"concurrency-{tag}-{i}", password=None)
+            for i in range(n_users)
+        ]
+        # Pre-create the weekly sessions so only the answer path races
+        for user in users:
+            InterviewSession.objects.create(user=user, week_start=get_week_start())
+
+        return users
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+    def _worker(self, user, i, barrier, statuses, lock):
+        try:
+            client = Client()
+            client.force_login(user)
+
+            body = json.dumps({
+                "question": f"Explain the JVM ({i})",
+                "answer": " ".join(["java class object method memory."] * (i + 1)),
+                "time_taken": 10 + i * 7,
+            })
+
+            barrier.wait()
+            r = client.post(
+                "/api/interview/hr/", body,
+                content_type="application/json", HTTP_HOST="localhost",
+            )
+
+            with lock:
+                statuses.append(r.status_code)
+        finally:
+            connection.close()
+
+    # --------------------------------------------------
+    # CHECK
+    # --------------------------------------------------
+    def _lost_updates(self, users):
+        sessions = (
+            InterviewSession.objects
+            .filter(user__in=users)
+            .annotate(
+                n=Count("responses"),
+                mean=Avg("responses__total_score"),
+                mean_len=Avg("responses__answer_length"),
+                mean_time=Avg("responses__time_taken_seconds"),
+            )
+        )
+
+        problems = []
+        for s in sessions:
+            expected = {
+                "total_questions": s.n,
+                "average_score": s.mean or 0.0,
+                "avg_answer_length": s.mean_len or 0.0,
+                "avg_time_taken": s.mean_time or 0.0,
+            }
+            for field, value in expected.items():
+                if not math.isclose(getattr(s, field), value, abs_tol=1e-6):
+                    problems.append(f"session {s.pk}: {field}={getattr(s, field)} expected {value}")
+
+        return problems
+
+    # --------------------------------------------------
+    # RUN
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        users = self._setup(opts["users"])
+        answers = max(1, opts["answers"])
+
+        statuses, lock = [], threading.Lock()
+
+        try:
+            for user in users:
+                barrier = threading.Barrier(answers)
+                threads = [
+                    threading.Thread(
+                        target=self._worker,
+                        args=(user, i, barrier, statuses, lock),
+                    )
+                    for i in range(answers)
+                ]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+
+            problems = self._lost_updates(users)
+        finally:
+            if not opts["keep"]:
+                for u in users:
+                    u.delete()
+
+        ok = statuses.count(200)
+        self.stdout.write(f"Students: {len(users)}  Parallel answers each: {answers}")
+        self.stdout.write(f"Accepted: {ok}  Rejected: {len(statuses) - ok} {sorted(set(statuses) - {200}) or ''}")
+
+        if problems:
+            for p in problems:
+                self.stdout.write(self.style.ERROR(f"❌ {p}"))
+            self.stdout.write(self.style.ERROR(f"❌ {len(problems)} lost/incorrect aggregate updates"))
+            return
+
+        self.stdout.write(self.style.SUCCESS("✅ Session aggregates match their responses — no lost updates"))
@@ -0,0 +1,140 @@
+import json
+import statistics
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+
+from core.models import Book, QuizChapter
+
+
+class Command(BaseCommand):
+    help = "Load test POST /api/submit-quiz/ and report submits/sec (creates and removes its own data)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--submits", type=int, default=10, help="Submissions per user")
+        parser.add_argument("--threads", type=int, default=4)
+        parser.add_argument("--proctor-events", type=int, default=5)
+        parser.add_argument("--keep", action="store_true", help="Keep generated users/quiz")
+
+    # --------------------------------------------------
+    # FIXTURES
+    # --------------------------------------------------
+    def _setup(self, n_users):
+        tag = uuid.uuid4().hex[:8]
+        User = get_user_model()
+
+        book = Book.objects.create(
+            title=f"Load test {tag}", slug=f"loadtest-{tag}"
+        )
+        quiz = QuizChapter.objects.create(
+            subject=book.slug,
+            chapter="Load test chapter",
+            questions_json={
+                "mcq": [
+                    {"question": f"Q{i}?", "options": ["a", "b", "c", "d"], "answer": "a"}
+                    for i in range(10)
+                ],
+                "fill": [
+                    {"question": f"F{i} ____", "answer": "x"} for i in range(5)
+                ],
+            },
+        )
+        users = [
+            User.objects.create_user(username=f"loadtest-{tag}-{i}", password=None)
+            for i in range(n_users)
+        ]
+        return book, quiz, users
+
+    def _teardown(self, book, quiz, users):
+        for u in users:
+            u.delete()
+        quiz.delete()
+        book.delete()
+
+    # --------------------------------------------------
+    # WORKER
+    # --------------------------------------------------
+    def _worker(self, users, quiz, submits, n_events, latencies, errors, lock):
+        try:
+            for user in users:
+                client = Client()
+                client.force_login(user)
+
+                for i in range(submits):
+                    body = json.dumps({
+                        "quiz_id": quiz.id,
+                        "answers": {
+                            "mcq": ["a" if (i + j) % 3 else "b" for j in range(10)],
+                            "fill": ["x"] * 5,
+                        },
+                        "proctor_events": [
+                            {"type": "tab_switch", "n": k} for k in range(n_events)
+                        ],
+                    })
+
+                    start = time.perf_counter()
+                    r = client.post(
+                        "/api/submit-quiz/", body,
+                        content_type="application/json", HTTP_HOST="localhost",
+                    )
+                    elapsed = time.perf_counter() - start
+
+                    with lock:
+                        if r.status_code == 200:
+                            latencies.append(elapsed)
+                        else:
+                            errors.append(r.status_code)
+        finally:
+            connection.close()
+
+    # --------------------------------------------------
+    # RUN
+    # --------------------------------------------------
+    def handle(self, *args, **opts):
+        book, quiz, users = self._setup(opts["users"])
+
+        threads_n = max(1, opts["threads"])
+        shards = [users[i::threads_n] for i in range(threads_n)]
+        latencies, errors, lock = [], [], threading.Lock()
+
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(shard, quiz, opts["submits"], opts["proctor_events"],
+                      latencies, errors, lock),
+            )
+            for shard in shards if shard
+        ]
+
+        try:
+            start = time.perf_counter()
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            wall = time.perf_counter() - start
+        finally:
+            if not opts["keep"]:
+                self._teardown(book, quiz, users)
+
+        ok = len(latencies)
+        self.stdout.write(f"Users: {len(users)}  Threads: {len(threads)}  Submits: {ok + len(errors)}")
+        self.stdout.write(f"Errors: {len(errors)} {sorted(set(errors)) if errors else ''}")
+
+        if not ok:
+            self.stdout.write(self.style.ERROR("No successful submissions"))
+            return
+
+        latencies.sort()
+        p95 = latencies[min(ok - 1, int(ok * 0.95))]
+        self.stdout.write(
+            f"Latency ms: p50={statistics.median(latencies) * 1000:.1f} "
+            f"p95={p95 * 1000:.1f} max={latencies[-1] * 1000:.1f}"
+        )
+        self.stdout.write(self.style.SUCCESS(f"✅ Throughput: {ok / wall:.1f} submits/sec"))
@@ -0,0 +1,76 @@
+import joblib
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils_model_registry import (
+    activate_version,
+    current_version,
+    list_versions,
+    save_model,
+)
+from core import utils_prediction_engine, utils_prediction_ml
+from core.utils_prediction_store import refresh_after_promote
+
+
+DEFAULT_FEATURES = {
+    "placement": utils_prediction_engine.FEATURES,
+    "hiring": utils_prediction_ml.FEATURES,
+}
+
+
+class Command(BaseCommand):
+    help = "List, activate or import versioned ML model artifacts"
+
+    def add_arguments(self, parser):
+        parser.add_argument("action", choices=["list", "activate", "import"])
+        parser.add_argument("name", choices=sorted(DEFAULT_FEATURES))
+        parser.add_argument("target", nargs="?", help="Version (activate) or .pkl path (import)")
+        parser.add_argument(
+            "--no-refresh",
+            action="store_true",
+            help="Don't re-score stored predictions / candidate rows after activating",
+        )
+
+    def handle(self, *args, **opts):
+        name, target = opts["name"], opts["target"]
+
+        if opts["action"] == "list":
+            active = current_version(name)
+            for meta in list_versions(name):
+                marker = "*" if meta["version"] == active else " "
+                self.stdout.write(
+                    f"{marker} {meta['version']}  n={meta['training_size']}  "
+                    f"metrics={meta.get('metrics', {})}"
+                )
+            return
+
+        if not target:
+            raise CommandError(f"{opts['action']} needs a target")
+
+        if opts["action"] == "activate":
+            try:
+                activate_version(name, target)
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"✅ {name} → {target}"))
+            self._refresh(opts)
+            return
+
+        # import: register an existing pickle (e.g. a pre-registry artifact)
+        model = joblib.load(target)
+        version = save_model(
+            name, model,
+            features=DEFAULT_FEATURES[name],
+            training_size=0,
+            extra={"imported_from": target},
+        )
+        self.stdout.write(self.style.SUCCESS(f"✅ Imported {target} as {name}@{version}"))
+        self._refresh(opts)
+
+    def _refresh(self, opts):
+        # Predictions and candidate rows carry the model version; without
+        # this they keep the old model's scores until something else
+        # touches each profile
+        if opts["no_refresh"]:
+            return
+        written = refresh_after_promote()
+        self.stdout.write(self.style.SUCCESS(f"✅ Re-scored {written} placement predictions"))
@@ -0,0 +1,40 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.utils_profile_queue import process_profile_queue
+
+
+class Command(BaseCommand):
+    help = "Recompute SkillProfiles for users marked dirty (coalesced queue)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument("--batch-size", type=int, default=200)
+        parser.add_argument("--loop", action="store_true", help="Keep polling the queue")
+        parser.add_argument("--interval", type=float, default=5.0, help="Seconds between polls with --loop")
+        parser.add_argument("--flush", action="store_true", help="Ignore the coalescing window and drain everything")
+
+    def _drain(self, opts):
+        now = timezone.now() + timedelta(days=3650) if opts["flush"] else None
+        return process_profile_queue(
+            workers=opts["workers"], batch_size=opts["batch_size"], now=now
+        )
+
+    def handle(self, *args, **opts):
+        if not opts["loop"]:
+            done = self._drain(opts)
+            self.stdout.write(self.style.SUCCESS(f"✅ Recomputed {done} skill profiles"))
+            return
+
+        self.stdout.write(f"Polling profile queue every {opts['interval']}s (Ctrl+C to stop)")
+        try:
+            while True:
+                done = self._drain(opts)
+                if done:
+                    self.stdout.write(f"Recomputed {done} skill profiles")
+                time.sleep(opts["interval"])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.utils_candidate_search import refresh_candidates
+
+
+class Command(BaseCommand):
+    help = "Rebuild the CandidateProfile search rows from SkillProfile / PlacementPrediction"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        written = refresh_candidates(batch_size=opts["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Indexed {written} candidates"))
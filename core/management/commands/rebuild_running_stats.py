@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.utils_running_stats import backfill_user_stats, backfill_session_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild running skill statistics (per user and per interview session) from history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--users-only", action="store_true")
+        parser.add_argument("--sessions-only", action="store_true")
+
+    def handle(self, *args, **opts):
+        if not opts["sessions_only"]:
+            users = backfill_user_stats(batch_size=opts["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt running stats for {users} users"))
+
+        if not opts["users_only"]:
+            sessions = backfill_session_stats(batch_size=opts["batch_size"])
+            self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt running stats for {sessions} interview sessions"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.utils_streak import rebuild_all_streaks
+
+
+class Command(BaseCommand):
+    help = "Rebuild UserProfile.streak from DailyQuizAttempt history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        profiles = rebuild_all_streaks(batch_size=opts["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Rebuilt streaks for {profiles} profiles"))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from core.models import SkillProfile
+from core.utils_prediction_store import (
+    current_model_version,
+    refresh_predictions,
+    stale_user_ids,
+)
+
+
+class Command(BaseCommand):
+    help = "Refresh materialized PlacementPrediction rows (stale only, or --all after retraining)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **opts):
+        if opts["all"]:
+            user_ids = SkillProfile.objects.values_list("user_id", flat=True)
+        else:
+            user_ids = stale_user_ids()
+
+        written = refresh_predictions(user_ids, batch_size=opts["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Refreshed {written} placement predictions ({current_model_version()})"
+        ))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import InterviewResponse, InterviewSession
+from core.utils_answer_scoring import parity_mismatches, regrade_responses
+from core.utils_behavior_engine import analyze_sessions
+from core.utils_running_stats import SESSION_STATS_FIELDS, rebuild_session_stats
+
+
+class Command(BaseCommand):
+    help = "Re-score historical interview answers with the current rubrics"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--subject", default=None, help="Only responses scored with this rubric")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="Report counts without writing")
+        parser.add_argument(
+            "--check-parity",
+            action="store_true",
+            help="Verify the Java rubric finds the same legacy keywords as the old loop on stored answers",
+        )
+
+    def handle(self, *args, **opts):
+        responses = InterviewResponse.objects.all()
+        if opts["subject"]:
+            responses = responses.filter(subject=opts["subject"].lower())
+
+        if opts["check_parity"]:
+            texts = responses.values_list("answer_text", flat=True).iterator(chunk_size=opts["batch_size"])
+            mismatches = parity_mismatches(texts)
+            for text in mismatches[:10]:
+                self.stdout.write(f"  ✗ {text[:80]!r}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} answers differ from the legacy keyword loop")
+            self.stdout.write(self.style.SUCCESS("✅ Legacy keyword parity holds"))
+            return
+
+        if opts["dry_run"]:
+            self.stdout.write(f"Would re-score {responses.count()} interview responses")
+            return
+
+        scanned, session_ids = regrade_responses(responses, batch_size=opts["batch_size"])
+        self.stdout.write(f"Scanned {scanned} responses, sessions affected: {len(session_ids)}")
+
+        # Totals changed → session aggregates and behavior metrics follow
+        sessions = list(InterviewSession.objects.filter(id__in=session_ids))
+        for session in sessions:
+            rebuild_session_stats(session)
+
+        InterviewSession.objects.bulk_update(
+            sessions, SESSION_STATS_FIELDS, batch_size=opts["batch_size"]
+        )
+        analyze_sessions(sessions)
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Re-graded {len(sessions)} interview sessions"))
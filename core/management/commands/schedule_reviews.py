@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.utils_spaced_repetition import schedule_pending_reviews
+
+
+class Command(BaseCommand):
+    help = "Nightly: reschedule spaced-repetition reviews for topics attempted since the last run"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **opts):
+        updated = schedule_pending_reviews(batch_size=opts["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Rescheduled {updated} topic reviews")
+        )
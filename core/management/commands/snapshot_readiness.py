@@ -0,0 +1,22 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from core.utils_readiness_series import aggregate_readiness, snapshot_readiness
+
+
+class Command(BaseCommand):
+    help = "Record today's readiness for every user (run once a day) and fold it into the rollups"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--day", type=date.fromisoformat, help="YYYY-MM-DD (defaults to today)")
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--skip-rollups", action="store_true")
+
+    def handle(self, *args, **opts):
+        inserted = snapshot_readiness(day=opts["day"], batch_size=opts["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✅ Recorded {inserted} readiness snapshots"))
+
+        if not opts["skip_rollups"]:
+            folded = aggregate_readiness()
+            self.stdout.write(self.style.SUCCESS(f"✅ Readiness rollups updated from {folded} history rows"))
@@ -0,0 +1,54 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.utils_prediction_store import refresh_after_promote
+from core.utils_training import train_placement_model
+
+
+class Command(BaseCommand):
+    help = "Train and register the placement model (streams features; batch or incremental SGD)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=["batch", "incremental"], default="batch")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+        parser.add_argument("--epochs", type=int, default=3, help="partial_fit passes (incremental)")
+        parser.add_argument("--cv-folds", type=int, default=5)
+        parser.add_argument("--cv-sample", type=int, default=50000, help="Rows sampled for CV (incremental)")
+        parser.add_argument("--jobs", type=int, default=-1, help="Parallel CV workers")
+        parser.add_argument("--outcomes-csv", help="user_id,label CSV of real placement outcomes")
+        parser.add_argument("--report", help="Write the training report JSON here")
+        parser.add_argument("--dry-run", action="store_true", help="Don't register the model")
+        parser.add_argument(
+            "--no-refresh",
+            action="store_true",
+            help="Don't re-score stored predictions / candidate rows after registering",
+        )
+
+    def handle(self, *args, **opts):
+        report = train_placement_model(
+            mode=opts["mode"],
+            chunk_size=opts["chunk_size"],
+            epochs=opts["epochs"],
+            cv_folds=opts["cv_folds"],
+            cv_sample=opts["cv_sample"],
+            n_jobs=opts["jobs"],
+            outcomes_csv=opts["outcomes_csv"],
+            register=not opts["dry_run"],
+        )
+
+        body = json.dumps(report, indent=2)
+        self.stdout.write(body)
+
+        if opts["report"]:
+            with open(opts["report"], "w") as f:
+                f.write(body)
+
+        if "error" in report:
+            self.stdout.write(self.style.ERROR(report["error"]))
+        elif report.get("version"):
+            self.stdout.write(self.style.SUCCESS(f"✅ Registered placement@{report['version']}"))
+
+            if not opts["no_refresh"]:
+                written = refresh_after_promote()
+                self.stdout.write(self.style.SUCCESS(f"✅ Re-scored {written} placement predictions"))
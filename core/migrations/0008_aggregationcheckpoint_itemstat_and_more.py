@@ -0,0 +1,59 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_userprofile_branch_userprofile_date_of_birth_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AggregationCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ItemStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_key', models.CharField(max_length=40, unique=True)),
+                ('subject', models.CharField(max_length=200)),
+                ('section', models.CharField(blank=True, max_length=20)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('correct', models.PositiveIntegerField(default=0)),
+                ('timed_attempts', models.PositiveIntegerField(default=0)),
+                ('total_time_seconds', models.FloatField(default=0.0)),
+                ('correct_rate', models.FloatField(default=0.0)),
+                ('avg_time_seconds', models.FloatField(default=0.0)),
+                ('difficulty', models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], default='medium', max_length=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='dailyquizquestion',
+            index=models.Index(fields=['subject', 'difficulty'], name='core_dailyq_subject_77ef52_idx'),
+        ),
+        migrations.AddField(
+            model_name='itemstat',
+            name='bank_question',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='item_stats', to='core.dailyquizquestion'),
+        ),
+        migrations.AddField(
+            model_name='itemstat',
+            name='quiz',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='item_stats', to='core.quizchapter'),
+        ),
+        migrations.AddIndex(
+            model_name='itemstat',
+            index=models.Index(fields=['subject', 'difficulty', 'attempts'], name='core_itemst_subject_e4ed12_idx'),
+        ),
+    ]
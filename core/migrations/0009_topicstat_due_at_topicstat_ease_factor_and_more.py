@@ -0,0 +1,53 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_aggregationcheckpoint_itemstat_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topicstat',
+            name='due_at',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='topicstat',
+            name='ease_factor',
+            field=models.FloatField(default=2.5),
+        ),
+        migrations.AddField(
+            model_name='topicstat',
+            name='interval_days',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='topicstat',
+            name='last_review_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='topicstat',
+            name='repetitions',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='topicstat',
+            name='review_pending',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='topicstat',
+            index=models.Index(fields=['user', 'due_at'], name='core_topics_user_id_6044d2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='topicstat',
+            index=models.Index(fields=['review_pending'], name='core_topics_review__7c39c2_idx'),
+        ),
+    ]
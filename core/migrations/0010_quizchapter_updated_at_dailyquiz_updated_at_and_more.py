@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:02
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_topicstat_due_at_topicstat_ease_factor_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyquiz',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='quizchapter',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='quizchapter',
+            index=models.Index(fields=['created_at'], name='core_quizch_created_3037fa_idx'),
+        ),
+    ]
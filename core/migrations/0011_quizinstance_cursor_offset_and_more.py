@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_quizchapter_updated_at_dailyquiz_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quizinstance',
+            name='cursor_offset',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='quizinstance',
+            name='cursor_section',
+            field=models.CharField(blank=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='quizinstance',
+            name='daily_quiz',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='instances', to='core.dailyquiz'),
+        ),
+        migrations.AddField(
+            model_name='quizinstance',
+            name='source',
+            field=models.CharField(choices=[('chapter', 'Chapter'), ('daily', 'Daily'), ('weekly', 'Weekly')], default='chapter', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='quizinstance',
+            name='weekly_quiz',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='instances', to='core.weeklyquiz'),
+        ),
+    ]
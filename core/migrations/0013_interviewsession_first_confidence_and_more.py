@@ -0,0 +1,60 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_profileupdatequeue'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='first_confidence',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='first_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='last_confidence',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='last_score',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='score_m2',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='time_m2',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.CreateModel(
+            name='UserRunningStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quiz_count', models.PositiveIntegerField(default=0)),
+                ('quiz_score_mean', models.FloatField(default=0.0)),
+                ('quiz_score_m2', models.FloatField(default=0.0)),
+                ('recent_scores', models.JSONField(blank=True, default=list)),
+                ('topic_count', models.PositiveIntegerField(default=0)),
+                ('mastery_sum', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='running_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_interviewsession_first_confidence_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlacementPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=30)),
+                ('tier1_probability', models.FloatField(default=0.0)),
+                ('service_probability', models.FloatField(default=0.0)),
+                ('failure_risk', models.FloatField(default=0.0)),
+                ('hire_probability', models.FloatField(blank=True, null=True)),
+                ('model_version', models.CharField(blank=True, max_length=100)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='placement_prediction', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', 'tier1_probability'], name='core_placem_categor_a95668_idx'), models.Index(fields=['hire_probability'], name='core_placem_hire_pr_ab54b0_idx'), models.Index(fields=['model_version'], name='core_placem_model_v_94a7ed_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_placementprediction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewresponse',
+            name='subject',
+            field=models.CharField(default='java', max_length=50),
+        ),
+    ]
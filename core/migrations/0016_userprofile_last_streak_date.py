@@ -0,0 +1,54 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:44
+
+from datetime import timedelta
+
+from django.db import migrations, models
+
+
+def rebuild_streaks(apps, schema_editor):
+    # Stored streaks only count once last_streak_date is set — rebuild
+    # both from attempt history so existing runs survive the upgrade.
+    # Frozen copy of core.utils_streak.rebuild_all_streaks as of this migration.
+    DailyQuizAttempt = apps.get_model("core", "DailyQuizAttempt")
+    UserProfile = apps.get_model("core", "UserProfile")
+
+    runs = {}   # user_id → (length, last_date) of the run ending at the newest attempt
+    rows = (
+        DailyQuizAttempt.objects
+        .order_by("user_id", "-date")
+        .values_list("user_id", "date")
+        .iterator(chunk_size=2000)
+    )
+    for user_id, day in rows:
+        run = runs.get(user_id)
+        if run is None:
+            runs[user_id] = [1, day, day, False]   # length, last, oldest so far, broken
+        elif not run[3]:
+            if day == run[2] - timedelta(days=1):
+                run[0] += 1
+                run[2] = day
+            elif day != run[2]:
+                run[3] = True
+
+    profiles = list(UserProfile.objects.only("id", "user_id", "streak", "last_streak_date"))
+    for profile in profiles:
+        run = runs.get(profile.user_id)
+        profile.streak, profile.last_streak_date = (run[0], run[1]) if run else (0, None)
+
+    UserProfile.objects.bulk_update(profiles, ["streak", "last_streak_date"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_interviewresponse_subject'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='last_streak_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.RunPython(rebuild_streaks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_userprofile_last_streak_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyUsageRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('action', models.CharField(blank=True, default='', max_length=50)),
+                ('events', models.PositiveIntegerField(default=0)),
+                ('active_users', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('institution', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='usage_rollups', to='core.institution')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['institution', 'day'], name='core_dailyu_institu_f15081_idx')],
+                'unique_together': {('day', 'institution', 'action')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TopicImprovementRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('topic', models.CharField(max_length=400)),
+                ('students', models.PositiveIntegerField(default=0)),
+                ('improvement_sum', models.FloatField(default=0.0)),
+                ('avg_improvement', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.book')),
+            ],
+            options={
+                'unique_together': {('book', 'topic')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UserDailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('action', models.CharField(blank=True, max_length=50)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='core_userda_day_602795_idx')],
+                'unique_together': {('user', 'day', 'action')},
+            },
+        ),
+    ]
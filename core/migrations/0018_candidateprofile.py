@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:54
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0017_dailyusagerollup_topicimprovementrollup_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateProfile',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='candidate', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('username', models.CharField(max_length=150)),
+                ('branch', models.CharField(blank=True, max_length=10)),
+                ('batch', models.CharField(blank=True, max_length=10)),
+                ('readiness_score', models.FloatField(default=0.0)),
+                ('behavior_score', models.FloatField(default=0.0)),
+                ('risk_level', models.CharField(default='low', max_length=10)),
+                ('category', models.CharField(blank=True, max_length=30)),
+                ('hire_probability', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('institution', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.institution')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-readiness_score', 'user'], name='core_candid_readine_cee024_idx'), models.Index(fields=['risk_level', '-readiness_score', 'user'], name='core_candid_risk_le_ea5102_idx'), models.Index(fields=['branch', 'batch', '-readiness_score', 'user'], name='core_candid_branch_7fa8f3_idx'), models.Index(fields=['institution', '-readiness_score', 'user'], name='core_candid_institu_047aed_idx'), models.Index(fields=['-hire_probability', 'user'], name='core_candid_hire_pr_1fd704_idx'), models.Index(fields=['-behavior_score', 'user'], name='core_candid_behavio_c3a279_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+from django.utils import timezone
+
+
+def fill_day(apps, schema_editor):
+    """Backfill day from recorded_at and keep the first snapshot of each (user, day)."""
+    ReadinessHistory = apps.get_model("core", "ReadinessHistory")
+
+    rows = []
+    for row in ReadinessHistory.objects.only("id", "recorded_at").iterator(chunk_size=2000):
+        row.day = timezone.localdate(row.recorded_at) if timezone.is_aware(row.recorded_at) else row.recorded_at.date()
+        rows.append(row)
+        if len(rows) == 2000:
+            ReadinessHistory.objects.bulk_update(rows, ["day"])
+            rows = []
+    if rows:
+        ReadinessHistory.objects.bulk_update(rows, ["day"])
+
+    duplicates = (
+        ReadinessHistory.objects
+        .values("user_id", "day")
+        .annotate(n=Count("id"), keep=Min("id"))
+        .filter(n__gt=1)
+    )
+    for d in duplicates:
+        ReadinessHistory.objects.filter(user_id=d["user_id"], day=d["day"]).exclude(id=d["keep"]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0019_readinessrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readinesshistory',
+            name='day',
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(fill_day, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='readinesshistory',
+            name='day',
+            field=models.DateField(default=timezone.localdate),
+        ),
+        migrations.AlterUniqueTogether(
+            name='readinesshistory',
+            unique_together={('user', 'day')},
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_readinesshistory_day'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyquiz',
+            name='subject',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='weeklyquiz',
+            name='subject',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.CreateModel(
+            name='ItemResponse',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('item_key', models.CharField(max_length=40)),
+                ('subject', models.CharField(max_length=200)),
+                ('section', models.CharField(blank=True, max_length=20)),
+                ('position', models.PositiveIntegerField(default=0)),
+                ('correct', models.BooleanField(default=False)),
+                ('time_taken', models.FloatField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('bank_question', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='responses', to='core.dailyquizquestion')),
+            ],
+        ),
+    ]
@@ -0,0 +1,67 @@
+from django.db import migrations, models
+
+
+def backfill_sums(apps, schema_editor):
+    InterviewSession = apps.get_model("core", "InterviewSession")
+    InterviewResponse = apps.get_model("core", "InterviewResponse")
+
+    sums = {}   # session_id → [count, Σ i·score, Σ confidence, Σ i·confidence]
+    rows = (
+        InterviewResponse.objects
+        .order_by("session_id", "created_at", "id")
+        .values_list("session_id", "total_score", "confidence_score")
+        .iterator(chunk_size=2000)
+    )
+    for session_id, score, confidence in rows:
+        s = sums.setdefault(session_id, [0, 0.0, 0.0, 0.0])
+        i, score, confidence = s[0], float(score or 0.0), float(confidence or 0.0)
+        s[0] += 1
+        s[1] += i * score
+        s[2] += confidence
+        s[3] += i * confidence
+
+    sessions = list(InterviewSession.objects.filter(id__in=list(sums)).only("id"))
+    for session in sessions:
+        _, session.score_index_sum, session.confidence_sum, session.confidence_index_sum = sums[session.id]
+
+    InterviewSession.objects.bulk_update(
+        sessions, ["score_index_sum", "confidence_sum", "confidence_index_sum"], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0022_cache_table'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewsession',
+            name='confidence_index_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='confidence_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='interviewsession',
+            name='score_index_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.RunPython(backfill_sums, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='interviewsession',
+            name='first_confidence',
+        ),
+        migrations.RemoveField(
+            model_name='interviewsession',
+            name='last_confidence',
+        ),
+        migrations.RemoveField(
+            model_name='interviewsession',
+            name='last_score',
+        ),
+    ]
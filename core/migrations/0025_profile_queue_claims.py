@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_item_response_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profileupdatequeue',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
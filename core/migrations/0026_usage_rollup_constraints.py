@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:32
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def merge_platform_duplicates(apps, schema_editor):
+    """
+    Platform rows (institution=None) were never deduplicated by the old
+    unique_together. Each duplicate holds the deltas of a different
+    batch, so they are summed into the oldest row.
+    """
+    DailyUsageRollup = apps.get_model("core", "DailyUsageRollup")
+
+    dupes = (
+        DailyUsageRollup.objects
+        .filter(institution__isnull=True)
+        .values("day", "action")
+        .annotate(n=Count("id"))
+        .filter(n__gt=1)
+    )
+    for key in dupes:
+        rows = list(
+            DailyUsageRollup.objects
+            .filter(institution__isnull=True, day=key["day"], action=key["action"])
+            .order_by("id")
+        )
+        keep, extra = rows[0], rows[1:]
+        keep.events += sum(r.events for r in extra)
+        keep.active_users += sum(r.active_users for r in extra)
+        keep.save(update_fields=["events", "active_users"])
+        DailyUsageRollup.objects.filter(id__in=[r.id for r in extra]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_profile_queue_claims'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_platform_duplicates, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='dailyusagerollup',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyusagerollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('institution__isnull', False)), fields=('day', 'institution', 'action'), name='usage_rollup_unique_institution'),
+        ),
+        migrations.AddConstraint(
+            model_name='dailyusagerollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('institution__isnull', True)), fields=('day', 'action'), name='usage_rollup_unique_platform'),
+        ),
+    ]
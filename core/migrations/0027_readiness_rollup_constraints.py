@@ -0,0 +1,63 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def _extreme(fn, *values):
+    values = [v for v in values if v is not None]
+    return fn(values) if values else None
+
+
+def merge_duplicates(apps, schema_editor):
+    """
+    The old unique_together (user, institution, ...) never matched, as
+    one of the two is always NULL. Each duplicate holds the deltas of a
+    different batch, so they are folded into the oldest row.
+    """
+    ReadinessRollup = apps.get_model("core", "ReadinessRollup")
+
+    for scope in ("user", "institution"):
+        dupes = (
+            ReadinessRollup.objects
+            .filter(**{f"{scope}__isnull": False})
+            .values(scope, "period", "period_start")
+            .annotate(n=Count("id"))
+            .filter(n__gt=1)
+        )
+        for key in dupes:
+            key.pop("n")
+            rows = list(ReadinessRollup.objects.filter(**key).order_by("id"))
+            keep, extra = rows[0], rows[1:]
+            for r in extra:
+                keep.samples += r.samples
+                keep.score_sum += r.score_sum
+                keep.score_min = _extreme(min, keep.score_min, r.score_min)
+                keep.score_max = _extreme(max, keep.score_max, r.score_max)
+            keep.save(update_fields=["samples", "score_sum", "score_min", "score_max"])
+            ReadinessRollup.objects.filter(id__in=[r.id for r in extra]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_usage_rollup_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='readinessrollup',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='readinessrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('user', 'period', 'period_start'), name='readiness_rollup_unique_user'),
+        ),
+        migrations.AddConstraint(
+            model_name='readinessrollup',
+            constraint=models.UniqueConstraint(condition=models.Q(('institution__isnull', False)), fields=('institution', 'period', 'period_start'), name='readiness_rollup_unique_institution'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:34
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_readiness_rollup_constraints'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='userrunningstats',
+            name='quiz_score_m2',
+        ),
+    ]
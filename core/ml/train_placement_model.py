@@ -20,80 +20,32 @@ os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ai_tutor.settings")
 import django
 django.setup()
 
-# ---------------------------------------------
-# ML Imports
-# ---------------------------------------------
-import joblib
-import numpy as np
-
-from sklearn.linear_model import LogisticRegression
-from sklearn.preprocessing import StandardScaler
-from sklearn.pipeline import Pipeline
+import argparse
+import json
 
-from core.models import SkillProfile
+from core.utils_training import train_placement_model
 
 
 # =====================================================
-# Generate Training Data
+# Train Model (see core.utils_training for the pipeline)
 # =====================================================
-def generate_training_data():
-    profiles = SkillProfile.objects.all()
-
-    X = []
-    y = []
-
-    for p in profiles:
+def train(**kwargs):
+    report = train_placement_model(**kwargs)
 
-        features = [
-            p.readiness_score,
-            p.technical_score,
-            p.communication_score,
-            p.confidence_score,
-            p.consistency_score,
-            getattr(p, "behavior_score", 0),
-        ]
+    if "error" in report:
+        print(report["error"])
+        return report
 
-        # ---------------------------------------
-        # TEMP LABEL LOGIC (Replace with real later)
-        # ---------------------------------------
-        if p.readiness_score >= 75:
-            label = 2   # Tier-1
-        elif p.readiness_score >= 50:
-            label = 1   # Service
-        else:
-            label = 0   # Fail
-
-        X.append(features)
-        y.append(label)
-
-    return np.array(X), np.array(y)
-
-
-# =====================================================
-# Train Model
-# =====================================================
-def train():
-    X, y = generate_training_data()
-
-    if len(X) < 10:
-        print("Not enough data to train model.")
-        return
-
-    model = Pipeline([
-        ("scaler", StandardScaler()),
-        ("clf", LogisticRegression(
-            multi_class="multinomial",
-            max_iter=1000
-        ))
-    ])
-
-    model.fit(X, y)
-
-    model_path = os.path.join(BASE_DIR, "core", "ml", "placement_model.pkl")
-    joblib.dump(model, model_path)
-
-    print("✅ Model trained and saved at:", model_path)
+    print(json.dumps(report, indent=2))
+    print(f"✅ Model trained and registered: placement@{report.get('version')}")
+    return report
 
 
 if __name__ == "__main__":
-    train()
+    parser = argparse.ArgumentParser(description="Train the placement model")
+    parser.add_argument("--mode", choices=["batch", "incremental"], default="batch")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--outcomes-csv")
+    args = parser.parse_args()
+
+    train(mode=args.mode, chunk_size=args.chunk_size, outcomes_csv=args.outcomes_csv)
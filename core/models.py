@@ -60,6 +60,7 @@ class UserProfile(models.Model):
     level = models.PositiveIntegerField(default=1)
     xp = models.PositiveIntegerField(default=0)
     streak = models.PositiveIntegerField(default=0)
+    last_streak_date = models.DateField(null=True, blank=True)  # day the stored streak ends on
 
     timezone = models.CharField(max_length=64, default="Asia/Kolkata")
     weekly_quiz_enabled = models.BooleanField(default=True)
@@ -154,20 +155,45 @@ class QuizChapter(models.Model):
 
     questions_json = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
 
     def __str__(self):
         return f"{self.subject} — {self.chapter}"
 
 
 class QuizInstance(models.Model):
+    SOURCE_CHOICES = [
+        ("chapter", "Chapter"),
+        ("daily", "Daily"),
+        ("weekly", "Weekly"),
+    ]
+
     quiz = models.ForeignKey(
         QuizChapter, on_delete=models.CASCADE,
         related_name="instances", null=True, blank=True
     )
+    source = models.CharField(max_length=10, choices=SOURCE_CHOICES, default="chapter")
+    daily_quiz = models.ForeignKey(
+        "DailyQuiz", on_delete=models.SET_NULL,
+        related_name="instances", null=True, blank=True
+    )
+    weekly_quiz = models.ForeignKey(
+        "WeeklyQuiz", on_delete=models.SET_NULL,
+        related_name="instances", null=True, blank=True
+    )
     student_id = models.CharField(max_length=200, default="anon")
     started_at = models.DateTimeField(auto_now_add=True)
     finished_at = models.DateTimeField(null=True, blank=True)
 
+    # Paged delivery: next section/offset to serve
+    cursor_section = models.CharField(max_length=20, blank=True)
+    cursor_offset = models.PositiveIntegerField(default=0)
+
     client_info = models.JSONField(default=dict, blank=True, null=True)
 
     def __str__(self):
@@ -217,6 +243,20 @@ class TopicStat(models.Model):
     last_mastery_score = models.FloatField(default=0.0)
     last_improved_at = models.DateTimeField(null=True, blank=True)
 
+    # Spaced repetition (SM-2) — see core.utils_spaced_repetition
+    last_review_score = models.FloatField(null=True, blank=True)
+    ease_factor = models.FloatField(default=2.5)
+    interval_days = models.PositiveIntegerField(default=0)
+    repetitions = models.PositiveIntegerField(default=0)
+    due_at = models.DateField(null=True, blank=True)
+    review_pending = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "due_at"]),
+            models.Index(fields=["review_pending"]),
+        ]
+
     def __str__(self):
         return f"{self.user}-{self.topic} ({self.mastery_score})"
 
@@ -228,8 +268,10 @@ class TopicStat(models.Model):
 
 class DailyQuiz(models.Model):
     date = models.DateField(unique=True)
+    subject = models.CharField(max_length=200, blank=True)
     questions_json = models.JSONField(default=dict, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Daily Quiz - {self.date}"
@@ -242,6 +284,7 @@ class DailyQuiz(models.Model):
 class WeeklyQuiz(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     week_start = models.DateField()
+    subject = models.CharField(max_length=200, blank=True)
     questions_json = models.JSONField(default=dict)
     score = models.FloatField(null=True, blank=True)
 
@@ -313,10 +356,121 @@ class DailyQuizQuestion(models.Model):
         default="medium"
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["subject", "difficulty"]),
+        ]
+
     def __str__(self):
         return f"{self.subject} – {self.question[:40]}"
 
 
+# =========================================================
+# PER-ITEM STATISTICS (DIFFICULTY CALIBRATION)
+# =========================================================
+
+class ItemStat(models.Model):
+    """
+    Running statistics for one quiz item, aggregated incrementally
+    from QuizAttempt.answers_json (see core.utils_item_stats).
+    """
+    DIFFICULTY_CHOICES = [
+        ("easy", "Easy"),
+        ("medium", "Medium"),
+        ("hard", "Hard"),
+    ]
+
+    # sha1(subject | normalized question text)
+    item_key = models.CharField(max_length=40, unique=True)
+    subject = models.CharField(max_length=200)
+
+    # Where the item lives (generated quiz JSON or question bank)
+    quiz = models.ForeignKey(
+        QuizChapter, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="item_stats"
+    )
+    section = models.CharField(max_length=20, blank=True)
+    position = models.PositiveIntegerField(default=0)
+    bank_question = models.ForeignKey(
+        DailyQuizQuestion, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="item_stats"
+    )
+
+    attempts = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    timed_attempts = models.PositiveIntegerField(default=0)
+    total_time_seconds = models.FloatField(default=0.0)
+
+    correct_rate = models.FloatField(default=0.0)
+    avg_time_seconds = models.FloatField(default=0.0)
+
+    # Calibrated from correct_rate once enough attempts exist
+    difficulty = models.CharField(
+        max_length=10,
+        choices=DIFFICULTY_CHOICES,
+        default="medium"
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["subject", "difficulty", "attempts"]),
+        ]
+
+    def __str__(self):
+        return f"ItemStat({self.subject} {self.item_key[:8]} {self.correct_rate:.2f})"
+
+
+class ItemResponse(models.Model):
+    """
+    One graded answer from a quiz that has no QuizAttempt row (daily and
+    weekly quizzes). Appended in bulk on submit, folded into ItemStat
+    by core.utils_item_stats.aggregate_item_stats. A student's answers
+    to one quiz ("daily:<id>" / "weekly:<id>") are logged once.
+    """
+    # Rows logged before responses were tied to a student have neither
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE,
+        null=True, blank=True, related_name="item_responses"
+    )
+    quiz_key = models.CharField(max_length=40, blank=True)
+
+    item_key = models.CharField(max_length=40)
+    subject = models.CharField(max_length=200)
+    section = models.CharField(max_length=20, blank=True)
+    position = models.PositiveIntegerField(default=0)
+    bank_question = models.ForeignKey(
+        DailyQuizQuestion, on_delete=models.SET_NULL,
+        null=True, blank=True, related_name="responses"
+    )
+
+    correct = models.BooleanField(default=False)
+    time_taken = models.FloatField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("user", "quiz_key", "section", "position")
+
+    def __str__(self):
+        return f"ItemResponse({self.item_key[:8]} {'✓' if self.correct else '✗'})"
+
+
+# =========================================================
+# INCREMENTAL JOB CHECKPOINTS
+# =========================================================
+
+class AggregationCheckpoint(models.Model):
+    """High-water mark (last processed row id) for incremental jobs."""
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_id}"
+
+
 # =========================================================
 # DAILY QUIZ ATTEMPT (PER USER / PER DAY)
 # =========================================================
@@ -395,15 +549,107 @@ class SkillProfile(models.Model):
         return f"SkillProfile({self.user})"
 
 
+class UserRunningStats(models.Model):
+    """
+    Running aggregates behind SkillProfile so a recompute is O(1)
+    instead of re-scanning QuizAttempt / TopicStat history.
+    Maintained by core.utils_running_stats.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="running_stats"
+    )
+
+    # Quiz scores (running mean; consistency uses the latest few)
+    quiz_count = models.PositiveIntegerField(default=0)
+    quiz_score_mean = models.FloatField(default=0.0)
+    recent_scores = models.JSONField(default=list, blank=True)
+
+    # Topic mastery (mean = mastery_sum / topic_count)
+    topic_count = models.PositiveIntegerField(default=0)
+    mastery_sum = models.FloatField(default=0.0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"UserRunningStats({self.user})"
+
+
+class PlacementPrediction(models.Model):
+    """
+    Materialized output of the placement engines, one row per student.
+    Kept fresh by core.utils_prediction_store.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="placement_prediction"
+    )
+
+    category = models.CharField(max_length=30)
+    tier1_probability = models.FloatField(default=0.0)
+    service_probability = models.FloatField(default=0.0)
+    failure_risk = models.FloatField(default=0.0)
+
+    # Hiring model output (0–1); null when that model isn't deployed
+    hire_probability = models.FloatField(null=True, blank=True)
+
+    model_version = models.CharField(max_length=100, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["category", "tier1_probability"]),
+            models.Index(fields=["hire_probability"]),
+            models.Index(fields=["model_version"]),
+        ]
+
+    def as_dict(self):
+        return {
+            "category": self.category,
+            "tier1_probability": self.tier1_probability,
+            "service_probability": self.service_probability,
+            "failure_risk": self.failure_risk,
+        }
+
+    def __str__(self):
+        return f"PlacementPrediction({self.user} - {self.category})"
+
+
+class ProfileUpdateQueue(models.Model):
+    """
+    One row per user whose SkillProfile is stale. Repeated triggers
+    before due_at coalesce into the same row; a worker marks it claimed
+    and deletes it only after the recompute — see core.utils_profile_queue.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, related_name="profile_update"
+    )
+    requested_at = models.DateTimeField(auto_now_add=True)  # latest trigger
+    due_at = models.DateTimeField()
+    claimed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["due_at"]),
+        ]
+
+    def __str__(self):
+        return f"ProfileUpdateQueue({self.user} @ {self.due_at})"
+
+
 
 
 class ReadinessHistory(models.Model):
+    """
+    One readiness snapshot per user per day, written in bulk by the
+    daily snapshot job (core.utils_readiness_series.snapshot_readiness).
+    """
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     readiness_score = models.FloatField()
+    day = models.DateField(default=timezone.localdate)
     recorded_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ["-recorded_at"]
+        unique_together = ("user", "day")
 
 
 
@@ -426,6 +672,144 @@ class UsageLog(models.Model):
         return f"{self.user} - {self.action} - {self.created_at.date()}"
 
 
+# =========================================================
+# PLATFORM METRIC ROLLUPS (see core.utils_rollups)
+# =========================================================
+
+class DailyUsageRollup(models.Model):
+    """
+    UsageLog counters per day, folded in incrementally.
+    institution=None → whole platform; action="" → any action.
+    """
+    ALL_ACTIONS = ""
+
+    day = models.DateField()
+    institution = models.ForeignKey(
+        "Institution", on_delete=models.CASCADE,
+        null=True, blank=True, related_name="usage_rollups"
+    )
+    action = models.CharField(max_length=50, blank=True, default=ALL_ACTIONS)
+
+    events = models.PositiveIntegerField(default=0)
+    active_users = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # NULLs never collide in a plain unique key, so the platform
+        # scope (institution=None) gets its own partial one
+        constraints = [
+            models.UniqueConstraint(
+                fields=["day", "institution", "action"],
+                condition=models.Q(institution__isnull=False),
+                name="usage_rollup_unique_institution",
+            ),
+            models.UniqueConstraint(
+                fields=["day", "action"],
+                condition=models.Q(institution__isnull=True),
+                name="usage_rollup_unique_platform",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["institution", "day"]),
+        ]
+
+    def __str__(self):
+        scope = self.institution_id or "platform"
+        return f"{self.day} {scope} {self.action or 'all'}: {self.active_users} users"
+
+
+class UserDailyActivity(models.Model):
+    """Recent (user, day, action) set used to count distinct active users."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    day = models.DateField()
+    action = models.CharField(max_length=50, blank=True)
+
+    class Meta:
+        unique_together = ("user", "day", "action")
+        indexes = [
+            models.Index(fields=["day"]),
+        ]
+
+
+class TopicImprovementRollup(models.Model):
+    """Per-topic TopicStat.improvement_rate totals across all students."""
+    book = models.ForeignKey(Book, on_delete=models.CASCADE)
+    topic = models.CharField(max_length=400)
+
+    students = models.PositiveIntegerField(default=0)
+    improvement_sum = models.FloatField(default=0.0)
+    avg_improvement = models.FloatField(default=0.0)
+
+    # Set by the job to its start time: TopicStats attempted later get picked up next run
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("book", "topic")
+
+    def __str__(self):
+        return f"{self.topic}: {self.avg_improvement:+.2f} ({self.students})"
+
+
+class ReadinessRollup(models.Model):
+    """
+    ReadinessHistory pre-aggregated per day / week / month, for one
+    user or one institution (exactly one of the two is set).
+    Maintained by core.utils_readiness_series.
+    """
+    PERIOD_CHOICES = [
+        ("day", "Day"),
+        ("week", "Week"),
+        ("month", "Month"),
+    ]
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE,
+        null=True, blank=True, related_name="readiness_rollups"
+    )
+    institution = models.ForeignKey(
+        "Institution", on_delete=models.CASCADE,
+        null=True, blank=True, related_name="readiness_rollups"
+    )
+    period = models.CharField(max_length=5, choices=PERIOD_CHOICES)
+    period_start = models.DateField()
+
+    samples = models.PositiveIntegerField(default=0)
+    score_sum = models.FloatField(default=0.0)
+    score_min = models.FloatField(null=True, blank=True)
+    score_max = models.FloatField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        # One key per scope: the other FK is always NULL, and NULLs never
+        # collide in a plain unique key
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "period", "period_start"],
+                condition=models.Q(user__isnull=False),
+                name="readiness_rollup_unique_user",
+            ),
+            models.UniqueConstraint(
+                fields=["institution", "period", "period_start"],
+                condition=models.Q(institution__isnull=False),
+                name="readiness_rollup_unique_institution",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "period", "period_start"]),
+            models.Index(fields=["institution", "period", "period_start"]),
+        ]
+
+    @property
+    def avg_score(self):
+        return self.score_sum / self.samples if self.samples else 0.0
+
+    def __str__(self):
+        scope = f"user {self.user_id}" if self.user_id else f"institution {self.institution_id}"
+        return f"{scope} {self.period} {self.period_start}: {self.avg_score:.2f}"
+
+
 # =========================================================
 # PLATFORM SUPER ADMIN (MULTI-COLLEGE CONTROL)
 # =========================================================
@@ -644,6 +1028,17 @@ class InterviewSession(models.Model):
 
     risk_flag = models.BooleanField(default=False)
 
+    # Running state (Welford) — average_score / avg_time_taken hold the means
+    score_m2 = models.FloatField(default=0.0)
+    time_m2 = models.FloatField(default=0.0)
+    first_score = models.FloatField(null=True, blank=True)  # set once running state exists
+
+    # Least-squares sums over answer index i (Σi, Σi² follow from the count,
+    # Σscore from average_score)
+    score_index_sum = models.FloatField(default=0.0)        # Σ i·score
+    confidence_sum = models.FloatField(default=0.0)         # Σ confidence
+    confidence_index_sum = models.FloatField(default=0.0)   # Σ i·confidence
+
 
 class InterviewResponse(models.Model):
 
@@ -656,6 +1051,9 @@ class InterviewResponse(models.Model):
     question_text = models.TextField()
     answer_text = models.TextField()
 
+    # Rubric the answer was scored against (utils_answer_scoring)
+    subject = models.CharField(max_length=50, default="java")
+
     technical_score = models.FloatField(default=0.0)
     clarity_score = models.FloatField(default=0.0)
     communication_score = models.FloatField(default=0.0)
@@ -723,4 +1121,43 @@ class CompanyUser(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.company.name}"
 
-    
+
+class CandidateProfile(models.Model):
+    """
+    Denormalized hiring-search row, one per student with a SkillProfile.
+    Indexes mirror the company search filters; every one ends in the
+    user (primary key) tiebreak used for keyset paging.
+    Maintained by core.utils_candidate_search.
+    """
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="candidate"
+    )
+    username = models.CharField(max_length=150)
+
+    institution = models.ForeignKey(
+        Institution, on_delete=models.SET_NULL, null=True, blank=True
+    )
+    branch = models.CharField(max_length=10, blank=True)
+    batch = models.CharField(max_length=10, blank=True)
+
+    readiness_score = models.FloatField(default=0.0)
+    behavior_score = models.FloatField(default=0.0)
+    risk_level = models.CharField(max_length=10, default="low")
+
+    category = models.CharField(max_length=30, blank=True)
+    hire_probability = models.FloatField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-readiness_score", "user"]),
+            models.Index(fields=["risk_level", "-readiness_score", "user"]),
+            models.Index(fields=["branch", "batch", "-readiness_score", "user"]),
+            models.Index(fields=["institution", "-readiness_score", "user"]),
+            models.Index(fields=["-hire_probability", "user"]),
+            models.Index(fields=["-behavior_score", "user"]),
+        ]
+
+    def __str__(self):
+        return f"CandidateProfile({self.username} - {self.readiness_score})"
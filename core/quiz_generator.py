@@ -2,56 +2,194 @@
 import re
 import random
 import json
-from typing import List, Dict
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import List, Dict, Tuple, Union
 from .utils_format import _meaningful_sentences, _sanitize_content
 
+
+# ------------------------------------------------------------
+# TOKENIZATION LAYER
+# ------------------------------------------------------------
+# Every generator below used to re-run re.findall(r"\w+") per sentence
+# and compile a fresh re.escape(...) pattern per question. Chapter text is
+# static (BOOK_KB), so sentences are tokenized once and cached per text.
+_WORD_RE = re.compile(r"\w+")
+
+KEY_TERM_MIN_LEN = 5   # words longer than 4 chars are key-term candidates
+BLANK = "_____"
+
+# Tokenized texts kept per cache, keyed by digest rather than the text
+# itself; sized for every book section at both sentence cut-offs
+TOKEN_CACHE_SIZE = 1024
+
+
+class TokenizedSentence:
+    """
+    One sentence, tokenized once.
+      - tokens:    word tokens (\\w+)
+      - offsets:   (start, end) of each token inside `text`
+      - key_terms: indices into `tokens` of candidate answer words
+    """
+    __slots__ = ("text", "tokens", "offsets", "key_terms")
+
+    def __init__(self, text: str):
+        self.text = text
+        tokens = []
+        offsets = []
+        for m in _WORD_RE.finditer(text):
+            tokens.append(m.group())
+            offsets.append(m.span())
+        self.tokens = tuple(tokens)
+        self.offsets = tuple(offsets)
+        self.key_terms = tuple(
+            i for i, w in enumerate(tokens) if len(w) >= KEY_TERM_MIN_LEN
+        )
+
+    def key_words(self) -> List[str]:
+        return [self.tokens[i] for i in self.key_terms]
+
+    def blank(self, idx: int, mask: str = BLANK) -> str:
+        """
+        Mask token `idx` and every other token equal to it (case-insensitive),
+        using the stored offsets (no regex needed) — the answer must not
+        stay readable elsewhere in the sentence.
+        """
+        word = self.tokens[idx].lower()
+        parts = []
+        pos = 0
+        for token, (start, end) in zip(self.tokens, self.offsets):
+            if token.lower() == word:
+                parts.append(self.text[pos:start])
+                parts.append(mask)
+                pos = end
+        parts.append(self.text[pos:])
+        return "".join(parts)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def __repr__(self):
+        return f"TokenizedSentence({self.text[:40]!r})"
+
+
+SentenceInput = Union[str, TokenizedSentence]
+
+
+def _as_tokenized(sentences: List[SentenceInput]) -> List[TokenizedSentence]:
+    """Accept plain strings from older callers; tokenize only when needed."""
+    return [
+        s if isinstance(s, TokenizedSentence) else TokenizedSentence(s)
+        for s in sentences
+    ]
+
+
+def _cached_by_digest(maxsize: int):
+    """
+    LRU cache for functions of (text, *args) keyed on the text's SHA-1,
+    so the cache never pins whole chapter texts as keys. Exposes
+    cache_clear() like functools.lru_cache.
+    """
+    def decorator(fn):
+        cache = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(fn)
+        def wrapper(text, *args):
+            key = (hashlib.sha1((text or "").encode("utf-8")).digest(), *args)
+            with lock:
+                if key in cache:
+                    cache.move_to_end(key)
+                    return cache[key]
+
+            value = fn(text, *args)
+
+            with lock:
+                cache[key] = value
+                if len(cache) > maxsize:
+                    cache.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+
+@_cached_by_digest(TOKEN_CACHE_SIZE)
+def tokenize_chapter(text: str, min_chars: int = 25) -> Tuple[TokenizedSentence, ...]:
+    """
+    Split chapter text on '.' (the splitter used by the quiz builders),
+    keep sentences longer than `min_chars` and tokenize each one once.
+    Cached per (text, min_chars) — repeated quizzes on a chapter are free.
+    """
+    return tuple(
+        TokenizedSentence(s)
+        for s in (part.strip() for part in (text or "").split("."))
+        if len(s) > min_chars
+    )
+
+
+@_cached_by_digest(TOKEN_CACHE_SIZE)
+def clean_text_tokenized(raw: str) -> Tuple[TokenizedSentence, ...]:
+    """Sanitized + tokenized sentences, cached per raw text."""
+    s = _sanitize_content(raw or "")
+    return tuple(TokenizedSentence(x) for x in _meaningful_sentences(s))
+
+
 # Conservative text cleaning wrapper
 def clean_text(raw: str) -> List[str]:
-    s = _sanitize_content(raw or "")
-    sents = _meaningful_sentences(s)
-    return sents
+    return [ts.text for ts in clean_text_tokenized(raw or "")]
 
 # Utility to pick random sentences safely
-def pick_sentences(sentences: List[str], n: int) -> List[str]:
+def pick_sentences(sentences: List, n: int) -> List:
     if not sentences:
         return []
     if len(sentences) <= n:
-        return sentences[:]
-    return random.sample(sentences, n)
+        return list(sentences)
+    return random.sample(list(sentences), n)
+
+
+def _distractors(pool: List[str], correct: str, n: int = 3) -> List[str]:
+    """Pick up to n distractors from `pool`, padding with a scrambled answer."""
+    candidates = [w for w in pool if w.lower() != correct.lower()]
+    distractors = random.sample(candidates, min(n, len(candidates)))
+    while len(distractors) < n:
+        distractors.append(correct[::-1])
+    return distractors
 
 # 1) MCQ generator (simple but meaningful)
-def generate_mcq_from_sentences(sentences: List[str], count: int = 10) -> List[Dict]:
+def generate_mcq_from_sentences(sentences: List[SentenceInput], count: int = 10) -> List[Dict]:
     out = []
-    pick = pick_sentences(sentences, max(count, min(len(sentences), count)))
-    for s in pick[:count]:
-        words = re.findall(r"\w+", s)
-        if len(words) < 4: words = [w for w in re.findall(r"\w+", s) if len(w) > 4]
-        if not words: continue
-        
-        correct = words[0]
-        distractors = random.sample(
-        [w for w in words if w != correct],
-        min(3, len(words) - 1) )
-        while len(distractors) < 3:
-            distractors.append(correct[::-1])
-            
-            
-            options = [correct] + distractors[:3]
+    pick = pick_sentences(_as_tokenized(sentences), count)
+    for ts in pick[:count]:
+        if not ts.tokens:
+            continue
+
+        # short sentence → blank the first key term
+        if len(ts) < 4:
+            if not ts.key_terms:
+                continue
+            idx = ts.key_terms[0]
+            correct = ts.tokens[idx]
+            options = [correct] + _distractors(ts.key_words(), correct)
             random.shuffle(options)
-            question_text = re.sub(
-                  re.escape(correct),  "_____",  s, count=1,  flags=re.IGNORECASE )
             out.append({
-                  "question": f"Fill in the blank: {question_text}",
+                "question": f"Fill in the blank: {ts.blank(idx)}",
                 "options": options,
-                "answer": correct })
+                "answer": correct
+            })
             continue
 
         # choose a key word (prefer nouns/long words heuristically)
-        words_sorted = sorted(words, key=lambda w: (-len(w), w))
-        correct = words_sorted[0]
+        order = sorted(range(len(ts.tokens)), key=lambda i: (-len(ts.tokens[i]), ts.tokens[i]))
+        idx = order[0]
+        correct = ts.tokens[idx]
         # build distractors: different words from sentence or scrambled
         distractors = []
-        for w in words_sorted[1:]:
+        for i in order[1:]:
+            w = ts.tokens[i]
             if w.lower() != correct.lower() and len(distractors) < 2:
                 distractors.append(w)
         # fill remaining distractors with plausible variations
@@ -59,8 +197,7 @@ def generate_mcq_from_sentences(sentences: List[str], count: int = 10) -> List[D
             distractors.append(correct[::-1][:len(correct)])
         options = [correct] + distractors[:3]
         random.shuffle(options)
-        qtext = re.sub(re.escape(correct), "_____", s, flags=re.IGNORECASE)
-        question = f"(MCQ) Fill the blank: {qtext}"
+        question = f"(MCQ) Fill the blank: {ts.blank(idx)}"
         out.append({
             "question": question,
             "options": options,
@@ -69,52 +206,47 @@ def generate_mcq_from_sentences(sentences: List[str], count: int = 10) -> List[D
     return out
 
 # 2) Fill-in-the-blank generator
-def generate_fill_from_sentences(sentences: List[str], count: int = 5) -> List[Dict]:
+def generate_fill_from_sentences(sentences: List[SentenceInput], count: int = 5) -> List[Dict]:
     out = []
-    pick = pick_sentences(sentences, count)
-    for s in pick:
-        words = re.findall(r"\w+", s)
-        if len(words) < 4:
+    pick = pick_sentences(_as_tokenized(sentences), count)
+    for ts in pick:
+        if len(ts) < 4:
             continue
         # choose a mid-sentence word to mask
-        idx = max(1, min(len(words) - 2, len(words) // 3))
-        missing = words[idx]
-        # replace only first occurrence of word (case-insensitive)
-        pattern = re.compile(re.escape(missing), flags=re.IGNORECASE)
-        qtext = pattern.sub("_____", s, count=1)
-        out.append({"question": qtext, "answer": missing})
+        idx = max(1, min(len(ts) - 2, len(ts) // 3))
+        out.append({"question": ts.blank(idx), "answer": ts.tokens[idx]})
     return out
 
 # 3) Short answer questions
-def generate_short_from_sentences(sentences: List[str], count: int = 5) -> List[Dict]:
+def generate_short_from_sentences(sentences: List[SentenceInput], count: int = 5) -> List[Dict]:
     out = []
-    pick = pick_sentences(sentences, count)
-    for s in pick:
+    pick = pick_sentences(_as_tokenized(sentences), count)
+    for s in (ts.text for ts in pick):
         q = f"(Short) In 1-3 sentences, explain: \"{s[:100]}...\""
         out.append({"question": q, "answer": s})
     return out
 
 # 4) Long answer questions
-def generate_long_from_sentences(sentences: List[str], count: int = 3) -> List[Dict]:
+def generate_long_from_sentences(sentences: List[SentenceInput], count: int = 3) -> List[Dict]:
     out = []
-    pick = pick_sentences(sentences, count)
-    for s in pick:
+    pick = pick_sentences(_as_tokenized(sentences), count)
+    for s in (ts.text for ts in pick):
         q = f"(Long) Write a detailed answer about: \"{s[:120]}...\" (250-400 words)"
         out.append({"question": q, "answer": s})
     return out
 
 # 5) Program questions (outline)
-def generate_program_questions(sentences: List[str], count: int = 2) -> List[Dict]:
+def generate_program_questions(sentences: List[SentenceInput], count: int = 2) -> List[Dict]:
     out = []
-    pick = pick_sentences(sentences, count)
-    for s in pick:
+    pick = pick_sentences(_as_tokenized(sentences), count)
+    for s in (ts.text for ts in pick):
         q = f"(Program) Design and write a program related to: \"{s[:90]}...\""
         out.append({"question": q, "notes": "Write code, include sample input and output."})
     return out
 
 # Full mixed quiz generator (25 questions configured)
 def generate_mixed_quiz_from_text(raw_text: str, total_questions: int = 25) -> Dict:
-    sentences = clean_text(raw_text)
+    sentences = clean_text_tokenized(raw_text or "")
     # desired distribution for 25 Q:
     # MCQ 10, Fill 5, Short 5, Long 3, Program 2 = 25
     mcq_n = 10
@@ -152,7 +284,7 @@ def generate_full_quiz(text):
     Used by Chapter Quiz API.
     """
 
-    sentences = [s.strip() for s in text.split(".") if len(s.strip()) > 25]
+    sentences = tokenize_chapter(text or "", 25)
     if not sentences:
         return {"mcq": [], "fill": [], "short": [], "long": [], "program": []}
 
@@ -167,36 +299,19 @@ def generate_full_quiz(text):
     # -------------------------
     # 1️⃣ MCQ (Real options)
     # -------------------------
-    for i, s in enumerate(sentences[:5]):
-        words = [w for w in re.findall(r"\w+", s) if len(w) > 4]
-
-        if not words:
+    for ts in sentences[:5]:
+        if not ts.key_terms:
             continue
 
-        correct = words[0]
-
-        # create distractors from other words
-        distractors = random.sample(
-            [w for w in words if w != correct],
-            min(3, len(words) - 1)
-        )
-
-        while len(distractors) < 3:
-            distractors.append(correct[::-1])
+        idx = ts.key_terms[0]
+        correct = ts.tokens[idx]
 
-        options = [correct] + distractors[:3]
+        # create distractors from other key terms
+        options = [correct] + _distractors(ts.key_words(), correct)
         random.shuffle(options)
 
-        question_text = re.sub(
-            re.escape(correct),
-            "_____",
-            s,
-            count=1,
-            flags=re.IGNORECASE
-        )
-
         quiz["mcq"].append({
-            "question": f"Fill in the blank: {question_text}",
+            "question": f"Fill in the blank: {ts.blank(idx)}",
             "options": options,
             "answer": correct
         })
@@ -204,34 +319,30 @@ def generate_full_quiz(text):
     # -------------------------
     # 2️⃣ Fill in the blank
     # -------------------------
-    for s in sentences[5:10]:
-        words = s.split()
-        if len(words) < 4:
+    for ts in sentences[5:10]:
+        if len(ts) < 4:
             continue
 
-        answer = words[-1]
-        q = s.replace(answer, "______", 1)
-
         quiz["fill"].append({
-            "question": q,
-            "answer": answer
+            "question": ts.blank(len(ts) - 1, "______"),
+            "answer": ts.tokens[-1]
         })
 
     # -------------------------
     # 3️⃣ Short Answer
     # -------------------------
-    for s in sentences[10:13]:
+    for ts in sentences[10:13]:
         quiz["short"].append({
-            "question": f"Explain: {s}",
+            "question": f"Explain: {ts.text}",
             "answer": ""
         })
 
     # -------------------------
     # 4️⃣ Long Answer
     # -------------------------
-    for s in sentences[13:15]:
+    for ts in sentences[13:15]:
         quiz["long"].append({
-            "question": f"Write a detailed note on: {s}",
+            "question": f"Write a detailed note on: {ts.text}",
             "answer": ""
         })
 
@@ -257,65 +368,49 @@ def combine_texts_from_sections(text_list):
 # Mix generator for daily quiz (MCQ + fill + short + long)
 # ------------------------------------------------------------
 def generate_mixed_quiz_from_text(text, total_questions=25):
-    sentences = [s.strip() for s in text.split(".") if len(s.strip()) > 20]
+    sentences = tokenize_chapter(text or "", 20)
     if not sentences:
         return {"mcq": [], "fill": [], "short": [], "long": [], "program": []}
 
     quiz = {"mcq": [], "fill": [], "short": [], "long": [], "program": []}
 
     # 1) MCQ – 10
-    for s in sentences[:10]:
-        words = [w for w in re.findall(r"\w+", s) if len(w) > 4]
-        if len(words) < 2:continue
-
-    correct = words[0]
-
-    distractors = random.sample(
-        [w for w in words if w.lower() != correct.lower()],
-        min(3, len(words) - 1)
-    )
-
-    while len(distractors) < 3:
-        distractors.append(correct[::-1])
-
-    options = [correct] + distractors[:3]
-    random.shuffle(options)
+    for ts in sentences[:10]:
+        if len(ts.key_terms) < 2:
+            continue
 
-    question_text = re.sub(
-        re.escape(correct),
-        "_____",
-        s,
-        count=1,
-        flags=re.IGNORECASE
-    )
+        idx = ts.key_terms[0]
+        correct = ts.tokens[idx]
 
-    quiz["mcq"].append({
-        "question": f"Fill in the blank: {question_text}",
-        "options": options,
-        "answer": correct
-    })
+        options = [correct] + _distractors(ts.key_words(), correct)
+        random.shuffle(options)
 
+        quiz["mcq"].append({
+            "question": f"Fill in the blank: {ts.blank(idx)}",
+            "options": options,
+            "answer": correct
+        })
 
     # 2) Fill – 5
-    for s in sentences[10:15]:
-        parts = s.split()
-        if len(parts) < 4:
+    for ts in sentences[10:15]:
+        if len(ts) < 4:
             continue
-        ans = parts[-1]
-        q = s.replace(ans, "______")
-        quiz["fill"].append({"question": q, "answer": ans})
+        quiz["fill"].append({
+            "question": ts.blank(len(ts) - 1, "______"),
+            "answer": ts.tokens[-1]
+        })
 
     # 3) Short – 5
-    for s in sentences[15:20]:
+    for ts in sentences[15:20]:
         quiz["short"].append({
-            "question": f"Explain briefly: {s}",
+            "question": f"Explain briefly: {ts.text}",
             "answer": ""
         })
 
     # 4) Long – 4
-    for s in sentences[20:24]:
+    for ts in sentences[20:24]:
         quiz["long"].append({
-            "question": f"Write a detailed answer on: {s}",
+            "question": f"Write a detailed answer on: {ts.text}",
             "answer": ""
         })
 
@@ -1,8 +1,16 @@
 # core/signals.py
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from .models import UserProfile
+from .models import (
+    UserProfile, QuizChapter, DailyQuiz, DailyQuizAttempt, WeeklyQuiz, SkillProfile,
+    QuizAttempt, UserChapterProgress, InterviewSession,
+    InstitutionMembership, CandidateProfile,
+)
+from .utils_quiz_cache import invalidate_chapter_quiz, invalidate_daily_quiz
+from .utils_quiz_paging import invalidate_quiz_sections
+from .utils_dashboard import invalidate_dashboard
 
 User = get_user_model()
 
@@ -19,3 +27,72 @@ def save_user_profile(sender, instance, **kwargs):
     """Ensure profile always exists."""
     if not hasattr(instance, "profile"):
         UserProfile.objects.get_or_create(user=instance)
+
+
+@receiver([post_save, post_delete], sender=QuizChapter)
+def invalidate_chapter_quiz_cache(sender, instance, **kwargs):
+    """Drop cached quiz payloads whenever a quiz is (re)generated."""
+    invalidate_chapter_quiz(instance.pk)
+    invalidate_quiz_sections("chapter", instance.pk)
+
+
+@receiver([post_save, post_delete], sender=DailyQuiz)
+def invalidate_daily_quiz_cache(sender, instance, **kwargs):
+    invalidate_daily_quiz(instance.date)
+    invalidate_quiz_sections("daily", instance.pk)
+
+
+@receiver([post_save, post_delete], sender=WeeklyQuiz)
+def invalidate_weekly_quiz_cache(sender, instance, **kwargs):
+    invalidate_quiz_sections("weekly", instance.pk)
+
+
+@receiver(post_save, sender=SkillProfile)
+def refresh_placement_prediction(sender, instance, **kwargs):
+    """Keep the materialized PlacementPrediction in step with its inputs."""
+    from .utils_prediction_store import refresh_predictions
+
+    user_id = instance.user_id
+    transaction.on_commit(lambda: refresh_predictions([user_id]))
+
+
+@receiver(post_delete, sender=SkillProfile)
+def drop_candidate_profile(sender, instance, **kwargs):
+    CandidateProfile.objects.filter(user_id=instance.user_id).delete()
+
+
+@receiver([post_save, post_delete], sender=InstitutionMembership)
+def refresh_candidate_membership(sender, instance, **kwargs):
+    """Branch / batch / institution are denormalized into CandidateProfile."""
+    from .utils_candidate_search import refresh_candidates
+
+    user_id = instance.user_id
+    transaction.on_commit(lambda: refresh_candidates([user_id]))
+
+
+@receiver(post_save, sender=DailyQuizAttempt)
+def extend_daily_streak(sender, instance, created, **kwargs):
+    """Maintain UserProfile.streak incrementally (one conditional UPDATE)."""
+    from .utils_streak import STREAK_INCREMENTAL, record_daily_attempt
+
+    if created and STREAK_INCREMENTAL:
+        record_daily_attempt(instance.user_id, instance.date)
+
+
+@receiver(post_delete, sender=DailyQuizAttempt)
+def rebuild_daily_streak(sender, instance, **kwargs):
+    from .utils_streak import STREAK_INCREMENTAL, rebuild_streak
+
+    if STREAK_INCREMENTAL:
+        rebuild_streak(instance.user_id)
+
+
+@receiver([post_save, post_delete], sender=QuizAttempt)
+@receiver([post_save, post_delete], sender=UserChapterProgress)
+@receiver([post_save, post_delete], sender=DailyQuizAttempt)
+@receiver([post_save, post_delete], sender=InterviewSession)
+@receiver([post_save, post_delete], sender=WeeklyQuiz)
+@receiver(post_save, sender=SkillProfile)
+def invalidate_dashboard_snapshot(sender, instance, **kwargs):
+    """Anything shown on the student dashboard changed → mark its snapshot stale."""
+    invalidate_dashboard(instance.user_id)
@@ -1,3 +1,410 @@
+import importlib
+import statistics
+from datetime import date, timedelta
+from unittest import mock
+
+from django.apps import apps
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
 from django.test import TestCase
+from django.utils import timezone
+
+from core.models import (
+    AggregationCheckpoint,
+    Book,
+    DailyQuizAttempt,
+    InterviewResponse,
+    InterviewSession,
+    ItemResponse,
+    ItemStat,
+    QuizAttempt,
+    QuizChapter,
+    TopicStat,
+    UsageLog,
+    UserProfile,
+    UserRunningStats,
+)
+from core.utils_item_stats import (
+    CHECKPOINT_NAME,
+    RESPONSES_CHECKPOINT_NAME,
+    aggregate_item_stats,
+    make_item_key,
+    record_item_responses,
+)
+from core.utils_running_stats import pstdev_from, record_interview_response
+from core.utils_streak import rebuild_all_streaks, stored_streak
+from core.utils_submission import record_submission
+
+
+User = get_user_model()
+
+
+# ======================================================
+# ITEM STATS — CHECKPOINTED AGGREGATION
+# ======================================================
+class ItemStatAggregationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="x")
+        self.quiz = QuizChapter.objects.create(
+            subject="java",
+            chapter="Classes",
+            questions_json=[
+                {"question": "Q1", "answer": "a"},
+                {"question": "Q2", "answer": "b"},
+            ],
+        )
+        self.q1 = make_item_key("java", "Q1")
+        self.q2 = make_item_key("java", "Q2")
+
+    def _attempt(self, answers, duration=None):
+        return QuizAttempt.objects.create(
+            user=self.user,
+            quiz=self.quiz,
+            answers_json=answers,
+            duration_seconds=duration,
+            submitted_at=timezone.now(),
+        )
+
+    def _checkpoint(self, name):
+        return AggregationCheckpoint.objects.get(name=name).last_id
+
+    def test_attempts_are_folded_once(self):
+        self._attempt(["a", "b"], duration=20)
+        last = self._attempt(["a", "x"])
+
+        self.assertEqual(aggregate_item_stats(), 2)
+        self.assertEqual(self._checkpoint(CHECKPOINT_NAME), last.id)
+
+        # A second run finds nothing past the checkpoint
+        self.assertEqual(aggregate_item_stats(), 0)
+
+        q1 = ItemStat.objects.get(item_key=self.q1)
+        q2 = ItemStat.objects.get(item_key=self.q2)
+        self.assertEqual((q1.attempts, q1.correct), (2, 2))
+        self.assertEqual((q2.attempts, q2.correct), (2, 1))
+        self.assertEqual(q2.correct_rate, 0.5)
+
+        # Only the first attempt was timed: 20s spread over two items
+        self.assertEqual((q1.timed_attempts, q1.avg_time_seconds), (1, 10.0))
+
+    def test_new_attempts_add_to_existing_rows(self):
+        self._attempt(["a", "b"])
+        aggregate_item_stats()
+
+        last = self._attempt(["x", "b"])
+        self.assertEqual(aggregate_item_stats(), 1)
+        self.assertEqual(self._checkpoint(CHECKPOINT_NAME), last.id)
+
+        q1 = ItemStat.objects.get(item_key=self.q1)
+        self.assertEqual((q1.attempts, q1.correct), (2, 1))
+
+    def test_batches_match_a_single_pass(self):
+        for answers in (["a", "b"], ["a", "x"], ["x", "x"], ["a", "b"], ["x", "b"]):
+            self._attempt(answers)
+
+        self.assertEqual(aggregate_item_stats(batch_size=2), 5)
+
+        q1 = ItemStat.objects.get(item_key=self.q1)
+        q2 = ItemStat.objects.get(item_key=self.q2)
+        self.assertEqual((q1.attempts, q1.correct), (5, 3))
+        self.assertEqual((q2.attempts, q2.correct), (5, 3))
+
+    def test_unsubmitted_attempts_are_skipped_but_passed(self):
+        QuizAttempt.objects.create(user=self.user, quiz=self.quiz, answers_json=["a", "b"])
+        last = self._attempt(["a", "b"])
+
+        aggregate_item_stats()
+
+        self.assertEqual(ItemStat.objects.get(item_key=self.q1).attempts, 1)
+        self.assertEqual(self._checkpoint(CHECKPOINT_NAME), last.id)
+
+    def test_responses_use_their_own_checkpoint(self):
+        questions = {"mcq": [{"question": "Q1", "answer": "a"}]}
+
+        self.assertEqual(
+            record_item_responses(self.user, "daily:1", "java", questions, {"mcq": ["a"]}), 1
+        )
+        self._attempt(["x", "b"])
+
+        self.assertEqual(aggregate_item_stats(), 2)
+        self.assertEqual(
+            self._checkpoint(RESPONSES_CHECKPOINT_NAME),
+            ItemResponse.objects.latest("id").id,
+        )
+
+        q1 = ItemStat.objects.get(item_key=self.q1)
+        self.assertEqual((q1.attempts, q1.correct), (2, 1))
+
+
+# ======================================================
+# ITEM RESPONSES — ONE LOG PER STUDENT AND QUIZ
+# ======================================================
+class ItemResponseTests(TestCase):
+
+    questions = {
+        "mcq": [{"question": "Q1", "answer": "a"}, {"question": "Q2", "answer": "b"}],
+        "fill": [{"question": "Q3", "answer": "c"}],
+        "short": [{"question": "Q4", "answer": "free text"}],
+    }
+    answers = {"mcq": ["a", "x"], "fill": ["C"]}
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="x")
+
+    def test_graded_items_are_logged(self):
+        self.assertEqual(
+            record_item_responses(self.user, "daily:1", "java", self.questions, self.answers), 3
+        )
+        self.assertEqual(
+            sorted(ItemResponse.objects.values_list("section", "position", "correct")),
+            [("fill", 0, True), ("mcq", 0, True), ("mcq", 1, False)],
+        )
+
+    def test_resubmit_logs_nothing(self):
+        record_item_responses(self.user, "daily:1", "java", self.questions, self.answers)
+
+        self.assertEqual(
+            record_item_responses(self.user, "daily:1", "java", self.questions, {"mcq": ["a", "b"]}), 0
+        )
+        self.assertEqual(ItemResponse.objects.count(), 3)
+
+        # Another quiz of the same student still counts
+        self.assertEqual(
+            record_item_responses(self.user, "weekly:1", "java", self.questions, self.answers), 3
+        )
+
+    def test_anonymous_is_not_logged(self):
+        self.assertEqual(
+            record_item_responses(AnonymousUser(), "daily:1", "java", self.questions, self.answers), 0
+        )
+        self.assertFalse(ItemResponse.objects.exists())
+
+
+# ======================================================
+# QUIZ SUBMISSION — ONE TRANSACTION, RECOMPUTE ON COMMIT
+# ======================================================
+class RecordSubmissionTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="x")
+        Book.objects.create(slug="java", title="Java")
+        self.quiz = QuizChapter.objects.create(
+            subject="java",
+            chapter="Classes",
+            questions_json=[
+                {"question": "Q1", "answer": "a"},
+                {"question": "Q2", "answer": "b"},
+            ],
+        )
+
+    @mock.patch("core.utils_submission.enqueue_profile_recompute")
+    def test_recompute_runs_only_after_commit(self, enqueue):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            attempt, correct, total = record_submission(self.user, self.quiz, ["a", "x"])
+
+        self.assertEqual((correct, total, attempt.score), (1, 2, 50.0))
+        enqueue.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+        enqueue.assert_called_once_with(self.user)
+
+    @mock.patch("core.utils_submission.enqueue_profile_recompute")
+    def test_all_writes_land_together(self, enqueue):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_submission(self.user, self.quiz, ["a", "b"])
+
+        stat = TopicStat.objects.get(user=self.user, topic="Classes")
+        self.assertEqual((stat.attempts, stat.correct, stat.mastery_score), (1, 2, 100.0))
+        self.assertEqual(UserRunningStats.objects.get(user=self.user).quiz_count, 1)
+        self.assertEqual(UsageLog.objects.filter(user=self.user, action="quiz").count(), 1)
+        enqueue.assert_called_once()
+
+    @mock.patch("core.utils_submission.enqueue_profile_recompute")
+    def test_failure_rolls_back_and_skips_recompute(self, enqueue):
+        with mock.patch(
+            "core.utils_submission.record_quiz_result", side_effect=RuntimeError("boom")
+        ):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertRaises(RuntimeError):
+                    record_submission(self.user, self.quiz, ["a", "b"])
+
+        self.assertEqual(callbacks, [])
+        enqueue.assert_not_called()
+        self.assertFalse(QuizAttempt.objects.exists())
+        self.assertFalse(TopicStat.objects.exists())
+        self.assertFalse(UsageLog.objects.exists())
+
+    @mock.patch("core.utils_submission.enqueue_profile_recompute")
+    def test_anonymous_submit_only_stores_the_attempt(self, enqueue):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            record_submission(None, self.quiz, ["a", "b"])
+
+        self.assertEqual(callbacks, [])
+        self.assertEqual(QuizAttempt.objects.filter(user__isnull=True).count(), 1)
+        self.assertFalse(TopicStat.objects.exists())
+        self.assertFalse(UsageLog.objects.exists())
+
+
+# ======================================================
+# INTERVIEW SESSION — F-EXPRESSION RUNNING AGGREGATES
+# ======================================================
+class InterviewSessionAggregateTests(TestCase):
+
+    scores = [60.0, 80.0, 70.0, 90.0]
+    times = [10.0, 20.0, 30.0, 40.0]
+    confidences = [50.0, 55.0, 65.0, 70.0]
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="x")
+        self.session = InterviewSession.objects.create(user=self.user, week_start=date(2026, 1, 5))
+
+    def _response(self, score, time_taken, confidence):
+        return InterviewResponse.objects.create(
+            session=self.session,
+            question_text="Q",
+            answer_text="A " * 10,
+            total_score=score,
+            time_taken_seconds=time_taken,
+            confidence_score=confidence,
+            answer_length=10,
+        )
+
+    def test_aggregates_match_the_response_history(self):
+        for args in zip(self.scores, self.times, self.confidences):
+            record_interview_response(self.session, self._response(*args))
+
+        s = self.session
+        self.assertEqual(s.total_questions, 4)
+        self.assertAlmostEqual(s.average_score, statistics.mean(self.scores))
+        self.assertAlmostEqual(pstdev_from(s.total_questions, s.score_m2), statistics.pstdev(self.scores))
+        self.assertAlmostEqual(s.avg_time_taken, statistics.mean(self.times))
+        self.assertAlmostEqual(pstdev_from(s.total_questions, s.time_m2), statistics.pstdev(self.times))
+        self.assertAlmostEqual(s.avg_answer_length, 10.0)
+        self.assertEqual(s.first_score, 60.0)
+
+        # Least-squares sums (answer index i = 0, 1, 2, ...)
+        self.assertAlmostEqual(s.score_index_sum, sum(i * x for i, x in enumerate(self.scores)))
+        self.assertAlmostEqual(s.confidence_sum, sum(self.confidences))
+        self.assertAlmostEqual(
+            s.confidence_index_sum, sum(i * x for i, x in enumerate(self.confidences))
+        )
+
+    def test_stale_instances_do_not_lose_answers(self):
+        # Two requests holding the same session row, as parallel answers would
+        first = InterviewSession.objects.get(pk=self.session.pk)
+        second = InterviewSession.objects.get(pk=self.session.pk)
+
+        record_interview_response(first, self._response(60.0, 10.0, 50.0))
+        record_interview_response(second, self._response(80.0, 20.0, 60.0))
+
+        self.assertEqual(second.total_questions, 2)
+        self.assertAlmostEqual(second.average_score, 70.0)
+        self.assertEqual(second.first_score, 60.0)
+
+    def test_completion_is_set_in_the_same_update(self):
+        for i, args in enumerate(zip(self.scores[:3], self.times, self.confidences)):
+            record_interview_response(self.session, self._response(*args), complete_at=3)
+            self.assertEqual(self.session.completed, i == 2)
+
+    def test_legacy_session_is_rebuilt_once(self):
+        # Counters from before running stats, with no first_score
+        for args in zip(self.scores[:3], self.times, self.confidences):
+            self._response(*args)
+        InterviewSession.objects.filter(pk=self.session.pk).update(total_questions=2, average_score=65.0)
+        self.session.refresh_from_db()
+
+        record_interview_response(self.session, InterviewResponse.objects.latest("id"))
+
+        self.assertEqual(self.session.total_questions, 3)
+        self.assertAlmostEqual(self.session.average_score, statistics.mean(self.scores[:3]))
+        self.assertEqual(self.session.first_score, 60.0)
+
+
+# ======================================================
+# DAILY STREAK — INCREMENTAL UPDATES, ROLLOVER, BACKFILL
+# ======================================================
+class StreakTests(TestCase):
+
+    today = date(2026, 3, 10)
+
+    def setUp(self):
+        self.user = User.objects.create_user("student", password="x")
+
+    def _attempt(self, days_ago, user=None):
+        DailyQuizAttempt.objects.create(
+            user=user or self.user, date=self.today - timedelta(days=days_ago)
+        )
+
+    def _profile(self, user=None):
+        return UserProfile.objects.get(user=user or self.user)
+
+    def test_consecutive_days_extend_the_run(self):
+        for days_ago in (2, 1, 0):
+            self._attempt(days_ago)
+
+        profile = self._profile()
+        self.assertEqual((profile.streak, profile.last_streak_date), (3, self.today))
+        self.assertEqual(stored_streak(profile, self.today), 3)
+
+    def test_gap_restarts_the_run(self):
+        for days_ago in (5, 4, 1, 0):
+            self._attempt(days_ago)
+
+        self.assertEqual(self._profile().streak, 2)
+
+    def test_run_lapses_at_rollover(self):
+        self._attempt(1)
+        self._attempt(0)
+
+        profile = self._profile()
+        self.assertEqual(stored_streak(profile, self.today), 2)
+        # Next day with no attempt yet
+        self.assertEqual(stored_streak(profile, self.today + timedelta(days=1)), 0)
+
+        DailyQuizAttempt.objects.create(user=self.user, date=self.today + timedelta(days=1))
+        self.assertEqual(stored_streak(self._profile(), self.today + timedelta(days=1)), 3)
+
+    def test_out_of_order_backfill_rebuilds(self):
+        self._attempt(2)
+        self._attempt(0)
+        self.assertEqual(self._profile().streak, 1)
+
+        # Filling the gap after the fact joins both days into one run
+        self._attempt(1)
+        self.assertEqual(self._profile().streak, 3)
+
+    def test_deleting_an_attempt_rebuilds(self):
+        for days_ago in (2, 1, 0):
+            self._attempt(days_ago)
+
+        DailyQuizAttempt.objects.get(user=self.user, date=self.today - timedelta(days=1)).delete()
+        self.assertEqual(self._profile().streak, 1)
+
+    def test_full_rebuild_and_migration_backfill_agree(self):
+        other = User.objects.create_user("other", password="x")
+        idle = User.objects.create_user("idle", password="x")
+        for days_ago in (6, 5, 3, 2, 1):
+            self._attempt(days_ago)
+        for days_ago in (0, 1):
+            self._attempt(days_ago, user=other)
+
+        # Stored values lost, as before the upgrade
+        UserProfile.objects.update(streak=7, last_streak_date=None)
+        rebuild_all_streaks()
+        rebuilt = {p.user_id: (p.streak, p.last_streak_date) for p in UserProfile.objects.all()}
+
+        self.assertEqual(rebuilt[self.user.pk], (3, self.today - timedelta(days=1)))
+        self.assertEqual(rebuilt[other.pk], (2, self.today))
+        self.assertEqual(rebuilt[idle.pk], (0, None))
+
+        UserProfile.objects.update(streak=7, last_streak_date=None)
+        migration = importlib.import_module("core.migrations.0016_userprofile_last_streak_date")
+        migration.rebuild_streaks(apps, None)
 
-# Create your tests here.
+        self.assertEqual(
+            {p.user_id: (p.streak, p.last_streak_date) for p in UserProfile.objects.all()},
+            rebuilt,
+        )
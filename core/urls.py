@@ -8,7 +8,7 @@ from core import views
 # ===============================
 from core.views.views_dashboard import dashboard
 from core.views.views_admin import admin_dashboard
-from core.views.views_admin import admin_dashboard, export_placement_report
+from core.views.views_admin import admin_dashboard, export_placement_report, export_report_status
 from core.views.views_super_admin import super_admin_dashboard
 from core.views.views_company import company_dashboard, student_profile_view
 from core.views.views_hiring import company_filter_students
@@ -70,6 +70,7 @@ from core.views.views_chat import (
 from core.views.views_quiz import (
     get_quiz,
     start_quiz,
+    quiz_page,
     submit_quiz,
     proctor_log,
     generate_daily_quiz,
@@ -104,6 +105,7 @@ urlpatterns = [
 
     path("college/dashboard/", admin_dashboard, name="admin_dashboard"),
     path("college/export-report/", export_placement_report, name="export_report"),
+    path("college/export-report/status/", export_report_status, name="export_report_status"),
     path("platform/dashboard/", super_admin_dashboard, name="super_admin_dashboard"),
 
     path("company/dashboard/", company_dashboard, name="company_dashboard"),
@@ -184,6 +186,7 @@ urlpatterns = [
 
     path("api/get-quiz/", get_quiz),
     path("api/start-quiz/", start_quiz),
+    path("api/quiz-page/", quiz_page),
     path("api/submit-quiz/", submit_quiz),
     path("api/proctor-log/", proctor_log),
     path("quiz/<int:quiz_id>/", topic_quiz_page, name="topic_quiz"),
@@ -228,19 +228,15 @@ def format_answer(question: str, content: str, detail_level: str = "auto") -> st
 
 
 from django.core.mail import send_mail
-from core.models import TopicStat
+from core.utils_spaced_repetition import due_topics
 
 def send_daily_study_email(user):
-    weak_topics = (
-        TopicStat.objects
-        .filter(user=user, mastery_score__lt=40)
-        .order_by("mastery_score")[:3]
-    )
+    review_due = due_topics(user, limit=3)
 
-    if not weak_topics:
+    if not review_due:
         plan = ["Revise current topics"]
     else:
-        plan = [f"Revise {t.topic} + 10 questions" for t in weak_topics]
+        plan = [f"Revise {t.topic} + 10 questions" for t in review_due]
 
     message = "📘 Your AI Study Plan Today:\n\n"
     message += "\n".join(plan)
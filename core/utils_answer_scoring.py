@@ -0,0 +1,259 @@
+# core/utils_answer_scoring.py
+
+import re
+import threading
+
+from django.conf import settings
+
+from core.models import InterviewResponse
+
+
+DEFAULT_SUBJECT = "java"
+
+# subject → {"base", "max", "terms": {term or n-gram: weight}}
+# Weight 1.0 per distinct term reproduces the original Java scoring;
+# n-grams add their weight on top of the words they contain.
+DEFAULT_RUBRICS = {
+    "java": {
+        "base": 3,
+        "max": 10,
+        "terms": {
+            "java": 1.0,
+            "jvm": 1.0,
+            "class": 1.0,
+            "object": 1.0,
+            "method": 1.0,
+            "memory": 1.0,
+            "runtime": 1.0,
+            "inheritance": 1.0,
+            "polymorphism": 1.0,
+            "garbage collection": 1.5,
+            "method overloading": 1.5,
+            "method overriding": 1.5,
+        },
+    },
+    "python": {
+        "base": 3,
+        "max": 10,
+        "terms": {
+            "python": 1.0,
+            "interpreter": 1.0,
+            "list": 1.0,
+            "dictionary": 1.0,
+            "tuple": 1.0,
+            "function": 1.0,
+            "decorator": 1.5,
+            "generator": 1.5,
+            "list comprehension": 1.5,
+            "garbage collection": 1.5,
+        },
+    },
+    "dbms": {
+        "base": 3,
+        "max": 10,
+        "terms": {
+            "table": 1.0,
+            "query": 1.0,
+            "index": 1.0,
+            "join": 1.0,
+            "transaction": 1.0,
+            "normalization": 1.5,
+            "primary key": 1.5,
+            "foreign key": 1.5,
+            "acid": 1.5,
+        },
+    },
+    "dsa": {
+        "base": 3,
+        "max": 10,
+        "terms": {
+            "array": 1.0,
+            "stack": 1.0,
+            "queue": 1.0,
+            "tree": 1.0,
+            "graph": 1.0,
+            "recursion": 1.0,
+            "time complexity": 1.5,
+            "binary search": 1.5,
+            "dynamic programming": 1.5,
+            "hash map": 1.5,
+        },
+    },
+}
+
+# Optional override / extension: settings.INTERVIEW_RUBRICS (same shape)
+RUBRICS = {**DEFAULT_RUBRICS, **getattr(settings, "INTERVIEW_RUBRICS", {})}
+
+_lock = threading.Lock()
+_compiled = {}   # subject → CompiledRubric
+
+
+# Keywords of the original hr_interviewer loop (one point each)
+LEGACY_JAVA_KEYWORDS = [
+    "java", "jvm", "class", "object",
+    "method", "memory", "runtime",
+    "inheritance", "polymorphism",
+]
+
+_WORD = re.compile(r"\w+")
+
+
+# ======================================================
+# COMPILED RUBRIC
+# ======================================================
+class CompiledRubric:
+    """
+    Terms are normalised to lowercase words and indexed by length.
+    An answer is tokenised once and every n-gram length is looked up
+    in the index, so terms match independently — "method overloading"
+    also counts "method", exactly like the old per-keyword search.
+    """
+
+    def __init__(self, subject, rubric):
+        self.subject = subject
+        self.base = rubric.get("base", 3)
+        self.max = rubric.get("max", 10)
+        self.weights = {
+            " ".join(_WORD.findall(term.lower())): float(weight)
+            for term, weight in rubric["terms"].items()
+        }
+        self.lengths = sorted({len(term.split()) for term in self.weights})
+
+    def matched_terms(self, text):
+        """Distinct rubric terms found in `text`."""
+        words = _WORD.findall((text or "").lower())
+        found = set()
+
+        for n in self.lengths:
+            grams = zip(*(words[i:] for i in range(n)))
+            found.update(g for g in map(" ".join, grams) if g in self.weights)
+
+        return found
+
+    def technical_score(self, text):
+        hits = sum(self.weights[t] for t in self.matched_terms(text))
+        return min(self.max, round(self.base + hits, 1))
+
+
+def get_rubric(subject=None):
+    """Compiled rubric for `subject` (unknown subjects use the default), built once per process."""
+    subject = (subject or DEFAULT_SUBJECT).lower()
+    if subject not in RUBRICS:
+        subject = DEFAULT_SUBJECT
+
+    rubric = _compiled.get(subject)
+    if rubric is None:
+        with _lock:
+            rubric = _compiled.get(subject)
+            if rubric is None:
+                rubric = _compiled[subject] = CompiledRubric(subject, RUBRICS[subject])
+    return rubric
+
+
+# ======================================================
+# SCORING
+# ======================================================
+def score_answer(answer, subject=None, rubric=None):
+    """All interview scores for one answer (0–10 scale)."""
+    rubric = rubric or get_rubric(subject)
+    word_count = len(answer.split())
+
+    technical_score = rubric.technical_score(answer)
+    clarity_score = 8 if word_count > 60 else 5
+    communication_score = 7 if "." in answer else 5
+    confidence_score = 7 if word_count > 40 else 5
+
+    total_score = round(
+        (technical_score + clarity_score + communication_score + confidence_score) / 4,
+        1
+    )
+
+    return {
+        "subject": rubric.subject,
+        "word_count": word_count,
+        "technical_score": technical_score,
+        "clarity_score": clarity_score,
+        "communication_score": communication_score,
+        "confidence_score": confidence_score,
+        "total_score": total_score,
+    }
+
+
+def score_answers(answers, subject=None):
+    """Batch scoring: one compiled rubric reused across every answer."""
+    rubric = get_rubric(subject)
+    return [score_answer(a or "", rubric=rubric) for a in answers]
+
+
+# ======================================================
+# LEGACY PARITY
+# ======================================================
+def legacy_keyword_hits(text):
+    """The original per-keyword loop, kept as the parity reference."""
+    answer = (text or "").lower()
+    return {k for k in LEGACY_JAVA_KEYWORDS if re.search(rf"\b{k}\b", answer)}
+
+
+def parity_mismatches(texts):
+    """
+    Texts where the default Java rubric does not find exactly the
+    legacy keywords the old loop found. Empty means parity holds.
+    """
+    rubric = CompiledRubric(DEFAULT_SUBJECT, DEFAULT_RUBRICS[DEFAULT_SUBJECT])
+    legacy = set(LEGACY_JAVA_KEYWORDS)
+
+    return [
+        text for text in texts
+        if rubric.matched_terms(text) & legacy != legacy_keyword_hits(text)
+    ]
+
+
+# ======================================================
+# RE-GRADING (management command: regrade_interviews)
+# ======================================================
+REGRADED_FIELDS = [
+    "technical_score",
+    "clarity_score",
+    "communication_score",
+    "confidence_score",
+    "total_score",
+    "answer_length",
+]
+
+
+def regrade_responses(responses, batch_size=1000):
+    """
+    Re-scores InterviewResponse rows with their subject's current
+    rubric and bulk-updates the ones whose scores changed.
+    Returns (scanned, changed_session_ids).
+    """
+    scanned = 0
+    changed_sessions = set()
+    pending = []
+
+    def flush():
+        InterviewResponse.objects.bulk_update(pending, REGRADED_FIELDS)
+        pending.clear()
+
+    qs = responses.order_by("id").only("id", "session_id", "subject", "answer_text", *REGRADED_FIELDS)
+
+    for response in qs.iterator(chunk_size=batch_size):
+        scanned += 1
+        scores = score_answer(response.answer_text or "", response.subject)
+        scores["answer_length"] = scores.pop("word_count")
+
+        if all(getattr(response, f) == scores[f] for f in REGRADED_FIELDS):
+            continue
+
+        for f in REGRADED_FIELDS:
+            setattr(response, f, scores[f])
+        pending.append(response)
+        changed_sessions.add(response.session_id)
+
+        if len(pending) >= batch_size:
+            flush()
+
+    if pending:
+        flush()
+
+    return scanned, changed_sessions
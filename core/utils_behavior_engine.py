@@ -1,84 +1,229 @@
-from statistics import pstdev
-from core.models import SkillProfile
-
-
-def analyze_session_behavior(session):
+import numpy as np
+from django.utils import timezone
+
+from core.models import InterviewResponse, InterviewSession, SkillProfile
+from core.utils_running_stats import (
+    pstdev_from,
+    rebuild_session_stats,
+    session_stats_ready,
+)
+
+
+SESSION_FIELDS = [
+    "performance_slope",
+    "consistency_score",
+    "confidence_trend",
+    "risk_flag",
+]
+
+
+# -----------------------------------
+# Metrics — same least-squares fit on both paths
+# -----------------------------------
+def _fitted_change(n, sx, sxx, sy, sxy):
+    """
+    Ordinary least squares of y over answer index from the sums
+    Σi, Σi², Σy, Σi·y, reported as the fitted change across the
+    session (slope × (n − 1)) so the scale matches last-minus-first.
+    """
+    denom = n * sxx - sx * sx
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = np.where(denom > 0, (n * sxy - sx * sy) / denom, 0.0)
+    return slope * (n - 1)
+
+
+def _grouped_metrics(session_ids, scores, confidences, times):
+    """
+    Batch path. Rows must be ordered by (session, created_at). Every
+    metric is computed for all sessions at once with bincount-weighted
+    sums.
+    """
+    uniq, start, counts = np.unique(session_ids, return_index=True, return_counts=True)
+    group = np.repeat(np.arange(len(uniq)), counts)
+    idx = np.arange(len(session_ids)) - np.repeat(start, counts)
+    n = counts.astype(float)
+
+    def gsum(w):
+        return np.bincount(group, weights=w, minlength=len(uniq))
+
+    sx = gsum(idx)
+    sxx = gsum(idx * idx)
+
+    def pstdev(y):
+        mean = gsum(y) / n
+        return np.sqrt(gsum((y - mean[group]) ** 2) / n)
+
+    return {
+        "session_ids": uniq,
+        "counts": counts,
+        "performance_slope": _fitted_change(n, sx, sxx, gsum(scores), gsum(idx * scores)),
+        "score_deviation": pstdev(scores),
+        "confidence_trend": _fitted_change(n, sx, sxx, gsum(confidences), gsum(idx * confidences)),
+        "time_deviation": pstdev(times),
+    }
+
+
+def _running_metrics(sessions):
+    """
+    Request path, O(1) per session: reads the Welford state and the
+    least-squares sums kept by core.utils_running_stats — no response scan.
+    """
+    def col(f):
+        return np.array([float(f(s) or 0.0) for s in sessions])
+
+    n = col(lambda s: s.total_questions)
+    sx = n * (n - 1) / 2
+    sxx = (n - 1) * n * (2 * n - 1) / 6
+
+    return {
+        "session_ids": np.array([s.pk for s in sessions]),
+        "counts": np.array([s.total_questions for s in sessions]),
+        "performance_slope": _fitted_change(
+            n, sx, sxx, n * col(lambda s: s.average_score), col(lambda s: s.score_index_sum)
+        ),
+        "score_deviation": col(lambda s: pstdev_from(s.total_questions, s.score_m2)),
+        "confidence_trend": _fitted_change(
+            n, sx, sxx, col(lambda s: s.confidence_sum), col(lambda s: s.confidence_index_sum)
+        ),
+        "time_deviation": col(lambda s: pstdev_from(s.total_questions, s.time_m2)),
+    }
+
+
+def _behavior_scores(m):
+    consistency = np.maximum(0, 100 - m["score_deviation"] * 10)
+    time_stability = np.maximum(0, 100 - m["time_deviation"] * 5)
+
+    behavior = (
+        0.3 * consistency +
+        0.3 * np.maximum(0, m["confidence_trend"] * 10) +
+        0.2 * np.maximum(0, m["performance_slope"] * 10) +
+        0.2 * time_stability
+    )
 
-    responses = session.responses.order_by("created_at")
+    risk_flag = (m["performance_slope"] < -2) | (consistency < 40)
+    return consistency, behavior, risk_flag
+
+
+def _risk_level(readiness, behavior, slope):
+    if readiness < 40 and behavior < 50 and slope < 0:
+        return "high"
+    if behavior < 60:
+        return "medium"
+    return "low"
+
+
+# -----------------------------------
+# Public API
+# -----------------------------------
+def analyze_sessions(sessions):
+    """
+    Batch path (analyze_behavior / regrade_interviews): one values_list
+    query for all their responses, vectorized metrics, two bulk_updates.
+    Sessions are updated in place. Returns the number analysed.
+    """
+    sessions = {s.pk: s for s in sessions}
+    if not sessions:
+        return 0
+
+    rows = list(
+        InterviewResponse.objects
+        .filter(session_id__in=list(sessions))
+        .order_by("session_id", "created_at", "id")
+        .values_list("session_id", "total_score", "confidence_score", "time_taken_seconds")
+    )
+    if not rows:
+        return 0
+
+    data = np.array(rows, dtype=float)
+    m = _grouped_metrics(
+        data[:, 0].astype(np.int64),
+        np.nan_to_num(data[:, 1]),
+        np.nan_to_num(data[:, 2]),
+        np.nan_to_num(data[:, 3]),
+    )
+    return _store(sessions, m)
+
+
+def analyze_session_behavior(session, profile_updates=None):
+    """
+    Per-answer path: metrics come from the session's running state, so
+    the cost does not grow with the number of answers. Extra SkillProfile
+    fields in `profile_updates` go out in the same profile write.
+    """
+    if not session_stats_ready(session):
+        rebuild_session_stats(session)
+
+    return _store(
+        {session.pk: session},
+        _running_metrics([session]),
+        {session.user_id: profile_updates} if profile_updates else None,
+    )
 
-    if responses.count() < 2:
-        return
 
-    scores = [r.total_score for r in responses]
-    lengths = [r.answer_length for r in responses]
-    confidence_values = [r.confidence_score for r in responses]
-    times = [r.time_taken_seconds for r in responses]
+def _store(sessions, m, profile_updates=None):
+    consistency, behavior, risk_flag = _behavior_scores(m)
+    profile_updates = profile_updates or {}
 
     # -----------------------------------
-    # 1️⃣ Performance Slope
+    # Store in sessions (need ≥ 2 answers)
     # -----------------------------------
-    performance_slope = scores[-1] - scores[0]
+    analysed = []
+    latest = {}
 
-    # -----------------------------------
-    # 2️⃣ Score Consistency
-    # -----------------------------------
-    deviation = pstdev(scores)
-    consistency_score = max(0, 100 - (deviation * 10))
+    for i, session_id in enumerate(m["session_ids"].tolist()):
+        if m["counts"][i] < 2:
+            continue
 
-    # -----------------------------------
-    # 3️⃣ Confidence Trend
-    # -----------------------------------
-    confidence_trend = confidence_values[-1] - confidence_values[0]
+        session = sessions[session_id]
+        session.performance_slope = round(float(m["performance_slope"][i]), 2)
+        session.consistency_score = round(float(consistency[i]), 2)
+        session.confidence_trend = round(float(m["confidence_trend"][i]), 2)
 
-    # -----------------------------------
-    # 4️⃣ Time Stability
-    # -----------------------------------
-    time_deviation = pstdev(times)
-    time_stability = max(0, 100 - (time_deviation * 5))
+        # Optional legacy flag
+        session.risk_flag = bool(risk_flag[i])
+        analysed.append(session)
 
-    # -----------------------------------
-    # 5️⃣ Final Behavior Score
-    # -----------------------------------
-    behavior_score = (
-        0.3 * consistency_score +
-        0.3 * max(0, confidence_trend * 10) +
-        0.2 * max(0, performance_slope * 10) +
-        0.2 * time_stability
-    )
+        prev = latest.get(session.user_id)
+        if prev is None or (session.created_at, session.pk) > (prev[0].created_at, prev[0].pk):
+            latest[session.user_id] = (session, i)
+
+    if analysed:
+        InterviewSession.objects.bulk_update(analysed, SESSION_FIELDS)
 
     # -----------------------------------
-    # Store in session
+    # Update Skill Profiles (latest session per student) — one write
     # -----------------------------------
-    session.performance_slope = round(performance_slope, 2)
-    session.consistency_score = round(consistency_score, 2)
-    session.confidence_trend = round(confidence_trend, 2)
+    user_ids = set(latest) | set(profile_updates)
+    if not user_ids:
+        return 0
 
-    # Optional legacy flag
-    session.risk_flag = (
-        performance_slope < -2 or consistency_score < 40
-    )
+    profiles = SkillProfile.objects.in_bulk(list(user_ids), field_name="user_id")
+    missing = [SkillProfile(user_id=uid) for uid in user_ids if uid not in profiles]
+    if missing:
+        SkillProfile.objects.bulk_create(missing, ignore_conflicts=True)
+        profiles = SkillProfile.objects.in_bulk(list(user_ids), field_name="user_id")
 
-    session.save()
+    now = timezone.now()
+    fields = {"last_updated"}
 
-    # -----------------------------------
-    # Update Skill Profile
-    # -----------------------------------
-    profile, _ = SkillProfile.objects.get_or_create(user=session.user)
+    for user_id, updates in profile_updates.items():
+        for field, value in updates.items():
+            setattr(profiles[user_id], field, value)
+        fields.update(updates)
 
-    profile.behavior_score = round(behavior_score, 2)
+    for user_id, (session, i) in latest.items():
+        profile = profiles[user_id]
+        profile.behavior_score = round(float(behavior[i]), 2)
 
-    # -----------------------------------
-    # Risk Escalation Logic (FINAL)
-    # -----------------------------------
-    if (
-        profile.readiness_score < 40 and
-        profile.behavior_score < 50 and
-        performance_slope < 0
-    ):
-        profile.risk_level = "high"
-    elif profile.behavior_score < 60:
-        profile.risk_level = "medium"
-    else:
-        profile.risk_level = "low"
-
-    profile.save()
+        # Risk Escalation Logic (FINAL)
+        profile.risk_level = _risk_level(
+            profile.readiness_score, profile.behavior_score, session.performance_slope
+        )
+        fields.update(("behavior_score", "risk_level"))
+
+    for profile in profiles.values():
+        profile.last_updated = now
+
+    SkillProfile.objects.bulk_update(list(profiles.values()), sorted(fields))
+
+    return len(analysed)
@@ -0,0 +1,284 @@
+# core/utils_candidate_search.py
+
+from django.conf import settings
+from django.core import signing
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import CandidateProfile, InstitutionMembership, SkillProfile
+from core.utils_company_plan import is_company_feature_allowed
+
+
+PAGE_SIZE = getattr(settings, "CANDIDATE_SEARCH_PAGE_SIZE", 50)
+
+CURSOR_SALT = "candidate-search"
+
+# ?sort=<key> → column; always descending, user id breaks ties
+SORT_FIELDS = {
+    "readiness": "readiness_score",
+    "probability": "hire_probability",
+    "behavior": "behavior_score",
+}
+DEFAULT_SORT = "readiness"
+
+# ?<param>=<value> → lookup
+RANGE_FILTERS = {
+    "min_readiness": "readiness_score__gte",
+    "min_behavior": "behavior_score__gte",
+    "min_probability": "hire_probability__gte",
+}
+# Applied by the company dashboard and filter API when the param is absent
+API_DEFAULT_FILTERS = {
+    "min_readiness": 50.0,
+    "min_probability": 0.4,
+}
+EXACT_FILTERS = {
+    "branch": "branch",
+    "batch": "batch",
+    "institution": "institution_id",
+}
+
+ROW_FIELDS = [
+    "user_id", "username", "institution_id", "branch", "batch",
+    "readiness_score", "behavior_score", "risk_level", "category", "hire_probability",
+]
+UPDATE_FIELDS = [
+    "username", "institution", "branch", "batch", "readiness_score",
+    "behavior_score", "risk_level", "category", "hire_probability", "updated_at",
+]
+
+
+class SearchLimitError(Exception):
+    """The request exceeds what the company's plan allows."""
+
+
+class ModelUnavailableError(Exception):
+    """Probability sort / filter asked for while no hiring model is active."""
+
+
+# ======================================================
+# INDEX MAINTENANCE
+# ======================================================
+def _memberships(user_ids):
+    """user_id → (institution_id, branch, batch) of the earliest student membership."""
+    found = {}
+    for user_id, institution_id, branch, batch in (
+        InstitutionMembership.objects
+        .filter(user_id__in=user_ids, role="student")
+        .order_by("id")
+        .values_list("user_id", "institution_id", "branch", "batch")
+    ):
+        found.setdefault(user_id, (institution_id, branch or "", batch or ""))
+    return found
+
+
+def _refresh_chunk(user_ids):
+    now = timezone.now()
+    memberships = _memberships(user_ids)
+
+    rows = []
+    for user_id, username, readiness, behavior, risk, category, probability in (
+        SkillProfile.objects
+        .filter(user_id__in=user_ids)
+        .values_list(
+            "user_id",
+            "user__username",
+            "readiness_score",
+            "behavior_score",
+            "risk_level",
+            "user__placement_prediction__category",
+            "user__placement_prediction__hire_probability",
+        )
+    ):
+        institution_id, branch, batch = memberships.get(user_id, (None, "", ""))
+        rows.append(CandidateProfile(
+            user_id=user_id,
+            username=username,
+            institution_id=institution_id,
+            branch=branch,
+            batch=batch,
+            readiness_score=readiness,
+            behavior_score=behavior,
+            risk_level=risk,
+            category=category or "",
+            hire_probability=probability,
+            updated_at=now,
+        ))
+
+    CandidateProfile.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=UPDATE_FIELDS,
+    )
+
+    # Users that no longer have a SkillProfile drop out of the search
+    CandidateProfile.objects.filter(user_id__in=user_ids).exclude(
+        user_id__in=[r.user_id for r in rows]
+    ).delete()
+
+    return len(rows)
+
+
+def refresh_candidates(user_ids=None, batch_size=1000):
+    """
+    Rebuilds the CandidateProfile rows of the given users (everyone with
+    None) from SkillProfile, PlacementPrediction and memberships.
+    Returns rows written.
+    """
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        return sum(
+            _refresh_chunk(user_ids[i:i + batch_size])
+            for i in range(0, len(user_ids), batch_size)
+        )
+
+    written, last_id = 0, 0
+    while True:
+        chunk = list(
+            SkillProfile.objects
+            .filter(user_id__gt=last_id)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)[:batch_size]
+        )
+        if not chunk:
+            break
+        written += _refresh_chunk(chunk)
+        last_id = chunk[-1]
+
+    CandidateProfile.objects.exclude(
+        user_id__in=SkillProfile.objects.values("user_id")
+    ).delete()
+    return written
+
+
+# ======================================================
+# SEARCH
+# ======================================================
+def parse_filters(params):
+    """
+    Query params → {param: value} for the filters actually set.
+    Raises ValueError on malformed numbers.
+    """
+    filters = {}
+
+    for param in RANGE_FILTERS:
+        value = params.get(param)
+        if value not in (None, ""):
+            filters[param] = float(value)
+
+    for param in EXACT_FILTERS:
+        value = params.get(param)
+        if value:
+            filters[param] = value
+
+    risk = params.get("risk")
+    if risk and risk != "all":
+        filters["risk"] = [r for r in risk.split(",") if r]
+
+    return filters
+
+
+def search_params(params, model_loaded=True):
+    """
+    Query params → (filters, defaults, sort), shared by the company
+    dashboard and the filter API so page one and "Load more" walk the
+    same result set. Without an active hiring model the probability
+    default is dropped and only an explicit probability sort / filter
+    is refused (ModelUnavailableError).
+    """
+    filters = parse_filters(params)
+    sort = params.get("sort") or ("probability" if model_loaded else DEFAULT_SORT)
+
+    defaults = dict(API_DEFAULT_FILTERS)
+    if not model_loaded:
+        if sort == "probability" or "min_probability" in filters:
+            raise ModelUnavailableError("Hiring model not available")
+        defaults.pop("min_probability")
+
+    return filters, defaults, sort
+
+
+def _encode_cursor(sort, row, served):
+    return signing.dumps(
+        [sort, row[SORT_FIELDS[sort]], row["user_id"], served], salt=CURSOR_SALT
+    )
+
+
+def _decode_cursor(cursor, sort):
+    try:
+        cursor_sort, value, user_id, served = signing.loads(cursor, salt=CURSOR_SALT)
+    except (signing.BadSignature, ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if cursor_sort != sort:
+        raise ValueError("Cursor does not match sort")
+    return value, user_id, served
+
+
+def search_candidates(company, filters, sort=DEFAULT_SORT, cursor=None, per_page=PAGE_SIZE, defaults=None):
+    """
+    One keyset page of candidates, best first:
+        {"results": [...], "count": int, "next_cursor": str | None, "limit_reached": bool}
+    Filters come from parse_filters; `defaults` fill in the ones not
+    given and do not count against the plan. The plan caps how many
+    filters a search may combine (max_filters) and how far it may page
+    (max_results).
+    """
+    if sort not in SORT_FIELDS:
+        sort = DEFAULT_SORT
+    field = SORT_FIELDS[sort]
+
+    max_filters = is_company_feature_allowed(company, "max_filters") or 0
+    if len(filters) > max_filters:
+        raise SearchLimitError(f"Your plan allows up to {max_filters} filters per search")
+
+    filters = {**(defaults or {}), **filters}
+
+    qs = CandidateProfile.objects.all()
+    for param, lookup in {**RANGE_FILTERS, **EXACT_FILTERS}.items():
+        if param in filters:
+            qs = qs.filter(**{lookup: filters[param]})
+    if "risk" in filters:
+        qs = qs.filter(risk_level__in=filters["risk"])
+    if sort == "probability":
+        qs = qs.filter(hire_probability__isnull=False)
+
+    count = qs.count()
+
+    served = 0
+    page = qs
+    if cursor:
+        value, user_id, served = _decode_cursor(cursor, sort)
+        page = qs.filter(
+            Q(**{f"{field}__lt": value}) | Q(**{field: value, "user_id__gt": user_id})
+        )
+
+    max_results = is_company_feature_allowed(company, "max_results") or 0
+    take = max(0, min(per_page, max_results - served))
+
+    # One extra row tells whether another page exists
+    rows = list(page.order_by(f"-{field}", "user_id").values(*ROW_FIELDS)[:take + 1]) if take else []
+    more = len(rows) > take
+    rows = rows[:take]
+    served += len(rows)
+    limit_reached = more and served >= max_results
+
+    return {
+        "results": [
+            {
+                "username": r["username"],
+                "readiness": r["readiness_score"],
+                "behavior_score": r["behavior_score"],
+                "risk_level": r["risk_level"],
+                "probability": r["hire_probability"],
+                "category": r["category"],
+                "branch": r["branch"],
+                "batch": r["batch"],
+            }
+            for r in rows
+        ],
+        "count": count,
+        "next_cursor": _encode_cursor(sort, rows[-1], served) if more and not limit_reached else None,
+        "limit_reached": limit_reached,
+    }
@@ -0,0 +1,31 @@
+# core/utils_checkpoint.py
+
+from core.models import AggregationCheckpoint
+
+
+# ======================================================
+# HIGH-WATER MARK HELPERS FOR INCREMENTAL JOBS
+# ======================================================
+def get_checkpoint(name, lock=False):
+    """
+    Returns the checkpoint row for `name` (created at 0 if missing).
+    Pass lock=True inside a transaction so two workers never
+    process the same id range twice.
+    """
+    AggregationCheckpoint.objects.get_or_create(name=name)
+
+    qs = AggregationCheckpoint.objects.filter(name=name)
+    if lock:
+        qs = qs.select_for_update()
+
+    return qs.get()
+
+
+def advance_checkpoint(checkpoint, last_id):
+    if last_id and last_id > checkpoint.last_id:
+        checkpoint.last_id = last_id
+        checkpoint.save(update_fields=["last_id", "updated_at"])
+
+
+def reset_checkpoint(name):
+    AggregationCheckpoint.objects.filter(name=name).update(last_id=0)
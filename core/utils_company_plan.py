@@ -3,14 +3,17 @@ def is_company_feature_allowed(company, feature):
     limits = {
         "free": {
             "max_filters": 5,
+            "max_results": 50,
             "view_transcripts": False
         },
         "pro": {
             "max_filters": 50,
+            "max_results": 1000,
             "view_transcripts": True
         },
         "enterprise": {
             "max_filters": 9999,
+            "max_results": 9999,
             "view_transcripts": True
         }
     }
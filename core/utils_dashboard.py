@@ -0,0 +1,266 @@
+# core/utils_dashboard.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Q
+from django.utils import timezone
+
+from core.models import (
+    Chapter,
+    InterviewSession,
+    QuizAttempt,
+    SkillProfile,
+    TopicStat,
+    UsageLog,
+    UserChapterProgress,
+    WeeklyQuiz,
+)
+from core.utils_ranking import percentile_of
+from core.utils_readiness_series import readiness_average
+from core.utils_spaced_repetition import due_topics
+from core.utils_streak import get_streak_summary
+
+
+# A snapshot younger than this (and not invalidated) is served as is
+DASHBOARD_FRESH_SECONDS = getattr(settings, "DASHBOARD_FRESH_SECONDS", 60)
+
+# Hard expiry: past this a request always rebuilds synchronously
+DASHBOARD_CACHE_TIMEOUT = getattr(settings, "DASHBOARD_CACHE_TIMEOUT", 60 * 60)
+
+# Serve stale snapshots while a background rebuild runs. Limit it to
+# peak hours with DASHBOARD_PEAK_HOURS = (start_hour, end_hour), local time.
+DASHBOARD_STALE_WHILE_REVALIDATE = getattr(settings, "DASHBOARD_STALE_WHILE_REVALIDATE", True)
+DASHBOARD_PEAK_HOURS = getattr(settings, "DASHBOARD_PEAK_HOURS", None)
+
+STRONG_MASTERY = 70
+WEAK_MASTERY = 40
+TOPICS_SHOWN = 5
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="dashboard")
+
+
+# ======================================================
+# KEYS
+# ======================================================
+def snapshot_key(user_id):
+    return f"dashboard:snapshot:{user_id}"
+
+
+def dirty_key(user_id):
+    return f"dashboard:dirty:{user_id}"
+
+
+def _rebuild_lock_key(user_id):
+    return f"dashboard:rebuild:{user_id}"
+
+
+# ======================================================
+# SNAPSHOT BUILDER
+# ======================================================
+def _topics(user):
+    """Strong and weak topics from one query (a student has few topics)."""
+    rows = list(
+        TopicStat.objects
+        .filter(Q(mastery_score__gte=STRONG_MASTERY) | Q(mastery_score__lt=WEAK_MASTERY), user=user)
+        .values("topic", "mastery_score")
+    )
+    strong = sorted(
+        (r for r in rows if r["mastery_score"] >= STRONG_MASTERY),
+        key=lambda r: -r["mastery_score"],
+    )[:TOPICS_SHOWN]
+    weak = sorted(
+        (r for r in rows if r["mastery_score"] < WEAK_MASTERY),
+        key=lambda r: r["mastery_score"],
+    )[:TOPICS_SHOWN]
+    return strong, weak
+
+
+def _study_plan(user):
+    # 1️⃣ Priority: Topics due for spaced-repetition review
+    review_due = due_topics(user, limit=2)
+    if review_due:
+        return [f"Revise {t.topic} (Mastery: {int(t.mastery_score)}%)" for t in review_due]
+
+    # 2️⃣ Next incomplete lesson
+    completed = UserChapterProgress.objects.filter(user=user, completed=True).values("chapter_id")
+    next_chapter = (
+        Chapter.objects
+        .exclude(id__in=completed)
+        .order_by("order")
+        .values_list("title", flat=True)
+        .first()
+    )
+    if next_chapter:
+        return [f"Next Lesson: {next_chapter}"]
+    return ["You're ahead! Try weekly challenge."]
+
+
+def build_dashboard_snapshot(user):
+    """
+    Everything on the student dashboard that depends on the student,
+    as plain picklable values.
+    """
+    now = timezone.now()
+
+    avg_score = (
+        QuizAttempt.objects
+        .filter(user=user, score__isnull=False)
+        .aggregate(avg=Avg("score"))["avg"] or 0
+    )
+
+    today_attempt = (
+        QuizAttempt.objects
+        .filter(user=user, submitted_at__date=now.date())
+        .order_by("-submitted_at")
+        .values_list("score", flat=True)
+        .first()
+    )
+
+    progress = UserChapterProgress.objects.filter(user=user, completed=True).aggregate(
+        completed=Count("id"),
+        books=Count("chapter__book", distinct=True),
+    )
+    total_chapters = Chapter.objects.count()
+
+    strong_topics, weak_topics = _topics(user)
+
+    weekly = list(
+        WeeklyQuiz.objects
+        .filter(user=user)
+        .order_by("week_start")
+        .values_list("week_start", "score")
+    )
+
+    streak = get_streak_summary(user)
+
+    skill_profile, _ = SkillProfile.objects.get_or_create(user=user)
+
+    # Weekly growth: this week vs last week, from the daily readiness rollups
+    today = timezone.localdate()
+    last_avg = readiness_average(today - timedelta(days=6), today, user=user) or 0
+    prev_avg = readiness_average(today - timedelta(days=13), today - timedelta(days=7), user=user) or 0
+    weekly_growth = ((last_avg - prev_avg) / prev_avg) * 100 if prev_avg > 0 else 0
+
+    latest_session = (
+        InterviewSession.objects
+        .filter(user=user)
+        .order_by("-created_at")
+        .values("performance_slope", "consistency_score", "confidence_trend", "risk_flag")
+        .first()
+    )
+
+    total_interviews = UsageLog.objects.filter(user=user, action="interview").count()
+
+    return {
+        "avg_score": round(avg_score, 2),
+        "percentile": percentile_of(avg_score),
+        "completed_count": progress["completed"],
+        "books_started": progress["books"],
+        "overall_course_percent": (
+            int((progress["completed"] / total_chapters) * 100) if total_chapters else 0
+        ),
+        "strong_topics": strong_topics,
+        "weak_topics": weak_topics,
+        "weekly_labels": [w.strftime("%b %d") for w, _ in weekly],
+        "weekly_scores": [s if s is not None else 0 for _, s in weekly],
+        "streak": streak["streak"],
+        "streak_labels": [d["date"][-5:] for d in streak["histogram"]],
+        "streak_values": [d["attempted"] for d in streak["histogram"]],
+        "study_plan": _study_plan(user),
+        "today_score": today_attempt or 0,
+        "skill_profile": {"readiness_score": skill_profile.readiness_score},
+        "total_interviews": total_interviews,
+        "latest_session": latest_session,
+        "weekly_growth": round(weekly_growth, 2),
+        "skill": {
+            "technical_score": skill_profile.technical_score,
+            "communication_score": skill_profile.communication_score,
+            "confidence_score": skill_profile.confidence_score,
+            "accuracy_score": skill_profile.accuracy_score,
+            "consistency_score": skill_profile.consistency_score,
+            "weekly_growth": round(weekly_growth, 2),
+        },
+    }
+
+
+# ======================================================
+# CACHE (STALE-WHILE-REVALIDATE)
+# ======================================================
+def _build_and_store(user):
+    # built_at is taken *before* reading, so an invalidation that lands
+    # mid-build still marks the result stale
+    built_at = time.time()
+    context = build_dashboard_snapshot(user)
+    cache.set(
+        snapshot_key(user.pk),
+        {"context": context, "built_at": built_at},
+        DASHBOARD_CACHE_TIMEOUT,
+    )
+    return context
+
+
+def _serve_stale():
+    if not DASHBOARD_STALE_WHILE_REVALIDATE:
+        return False
+    if not DASHBOARD_PEAK_HOURS:
+        return True
+
+    start, end = DASHBOARD_PEAK_HOURS
+    hour = timezone.localtime().hour
+    return start <= hour < end if start <= end else (hour >= start or hour < end)
+
+
+def _revalidate(user):
+    try:
+        _build_and_store(user)
+    except Exception as e:
+        print("⚠️ Dashboard snapshot rebuild failed:", e)
+    finally:
+        cache.delete(_rebuild_lock_key(user.pk))
+        connection.close()
+
+
+def get_dashboard_snapshot(user):
+    """
+    Cached snapshot for `user`. A fresh one is returned as is. A
+    stale one (invalidated or older than DASHBOARD_FRESH_SECONDS) is
+    returned immediately while one background rebuild refreshes it,
+    or rebuilt inline outside peak hours. A missing one is built inline.
+    """
+    found = cache.get_many([snapshot_key(user.pk), dirty_key(user.pk)])
+    entry = found.get(snapshot_key(user.pk))
+
+    if entry is not None:
+        dirty_at = found.get(dirty_key(user.pk), 0)
+        stale = (
+            dirty_at >= entry["built_at"]
+            or time.time() - entry["built_at"] > DASHBOARD_FRESH_SECONDS
+        )
+        if not stale:
+            return entry["context"]
+
+        if _serve_stale():
+            # cache.add is atomic: only one request schedules the rebuild
+            if cache.add(_rebuild_lock_key(user.pk), 1, 60):
+                _executor.submit(_revalidate, user)
+            return entry["context"]
+
+    return _build_and_store(user)
+
+
+def invalidate_dashboard(user_id):
+    """
+    Marks the snapshot stale once the current transaction commits, so
+    a rebuild can never capture pre-commit data and still look fresh.
+    """
+    if user_id is None:
+        return
+
+    transaction.on_commit(
+        lambda: cache.set(dirty_key(user_id), time.time(), DASHBOARD_CACHE_TIMEOUT)
+    )
@@ -1,6 +1,6 @@
 from django.core.mail import send_mail
 from django.contrib.auth import get_user_model
-from core.models import TopicStat
+from core.utils_spaced_repetition import due_topics
 
 User = get_user_model()
 
@@ -11,18 +11,14 @@ def send_daily_study_plan_emails():
         if not user.email:
             continue
 
-        weak_topics = (
-            TopicStat.objects
-            .filter(user=user, mastery_score__lt=40)
-            .order_by("mastery_score")[:2]
-        )
+        review_due = due_topics(user, limit=2)
 
-        if not weak_topics.exists():
+        if not review_due:
             continue
 
         study_plan = [
             f"Revise {t.topic} + practice 10 questions"
-            for t in weak_topics
+            for t in review_due
         ]
 
         send_mail(
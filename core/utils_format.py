@@ -73,23 +73,61 @@ _COMMENTS_REMOVE = [
     r"^topic\s*:\s*.*",
 ]
 
+# Compiled once at import — the sanitizers run on every quiz/answer request
+_READ_ABOVE_RE = re.compile("|".join(_READ_ABOVE_PATTERNS), re.IGNORECASE)
+_COMMENTS_REMOVE_RE = re.compile("|".join(_COMMENTS_REMOVE), re.IGNORECASE)
+
+_EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_RE = re.compile(r"(\+?\d[\d\s\-]{8,}\d)")
+_URL_RE = re.compile(r"https?://[^\s]+")
+
+_CONTACT_KEYWORDS = (
+    "linkedin.com", "github.com", "instagram.com", "facebook.com",
+    "twitter.com", "whatsapp", "phone:", "mobile:", "contact:", "email:"
+)
+
+_HEADING_PATTERNS = [
+    r"\bcurriculum vitae\b",
+    r"\bresume\b",
+    r"\bcareer objective\b",
+    r"\bpersonal details\b",
+    r"\bdeclaration\b",
+    r"\bstrengths\b",
+    r"\bhobbies\b",
+    r"\binterests\b",
+    r"\bcontact details\b",
+    r"\bprofile\b",
+    r"\babout me\b"
+]
+_HEADING_PATTERNS_RE = re.compile("|".join(_HEADING_PATTERNS))
+
+_PII_KEYWORDS = (
+    "college", "university", "hyderabad", "telangana",
+    "bangalore", "india", "b.tech", "btech",
+    "father's name", "mother's name", "dob", "date of birth",
+    # names
+    "naveen", "roman", "pravalika",
+)
+
+_MULTI_NEWLINE_RE = re.compile(r"\n{2,}")
+_INLINE_SPACE_RE = re.compile(r"[ \t]+")
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[\.\?\!])\s+')
+_SEE_REFER_RE = re.compile(r'^(see|refer|read)\b', re.IGNORECASE)
+
 def _strip_contact_info(text: str) -> str:
     """Remove or mask emails, phone numbers, URLs."""
     if not text:
         return ""
 
     t = text
-    t = re.sub(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}", "[email removed]", t)
-    t = re.sub(r"(\+?\d[\d\s\-]{8,}\d)", "[phone removed]", t)
-    t = re.sub(r"https?://[^\s]+", "", t)
+    t = _EMAIL_RE.sub("[email removed]", t)
+    t = _PHONE_RE.sub("[phone removed]", t)
+    t = _URL_RE.sub("", t)
 
     cleaned = []
     for ln in t.splitlines():
         low = ln.lower()
-        if any(k in low for k in [
-            "linkedin.com", "github.com", "instagram.com", "facebook.com",
-            "twitter.com", "whatsapp", "phone:", "mobile:", "contact:", "email:"
-        ]):
+        if any(k in low for k in _CONTACT_KEYWORDS):
             continue
         cleaned.append(ln)
 
@@ -100,28 +138,6 @@ def _remove_personal_data(text: str) -> str:
     if not text:
         return ""
 
-    heading_patterns = [
-        r"\bcurriculum vitae\b",
-        r"\bresume\b",
-        r"\bcareer objective\b",
-        r"\bpersonal details\b",
-        r"\bdeclaration\b",
-        r"\bstrengths\b",
-        r"\bhobbies\b",
-        r"\binterests\b",
-        r"\bcontact details\b",
-        r"\bprofile\b",
-        r"\babout me\b"
-    ]
-
-    pii_keywords = [
-        "college", "university", "hyderabad", "telangana",
-        "bangalore", "india", "b.tech", "btech",
-        "father's name", "mother's name", "dob", "date of birth"
-    ]
-
-    name_keywords = ["naveen", "roman", "pravalika"]
-
     cleaned = []
     for ln in text.splitlines():
         lstrip = ln.strip()
@@ -129,9 +145,9 @@ def _remove_personal_data(text: str) -> str:
 
         if lstrip in ("•", "-", "—"):
             continue
-        if any(re.search(p, low) for p in heading_patterns):
+        if _HEADING_PATTERNS_RE.search(low):
             continue
-        if any(k in low for k in pii_keywords + name_keywords):
+        if any(k in low for k in _PII_KEYWORDS):
             continue
 
         cleaned.append(ln)
@@ -172,18 +188,17 @@ def _sanitize_content(text: str) -> str:
     lines = []
     for ln in t.splitlines():
         l = ln.strip()
-        if any(re.match(p, l, flags=re.IGNORECASE) for p in _COMMENTS_REMOVE):
+        if _COMMENTS_REMOVE_RE.match(l):
             continue
         lines.append(l)
     t = "\n".join(lines)
 
     # remove "see above"
-    for pat in _READ_ABOVE_PATTERNS:
-        t = re.sub(pat, "", t, flags=re.IGNORECASE)
+    t = _READ_ABOVE_RE.sub("", t)
 
     # collapse whitespace
-    t = re.sub(r"\n{2,}", "\n\n", t)
-    t = re.sub(r"[ \t]+", " ", t).strip()
+    t = _MULTI_NEWLINE_RE.sub("\n\n", t)
+    t = _INLINE_SPACE_RE.sub(" ", t).strip()
 
     # remove trivial noise lines
     t = "\n".join([ln for ln in t.splitlines() if ln.strip() not in ("-", "—", "•")])
@@ -195,13 +210,13 @@ def _meaningful_sentences(text: str) -> List[str]:
     """Heuristic sentence splitter."""
     if not text:
         return []
-    segs = re.split(r'(?<=[\.\?\!])\s+', text)
+    segs = _SENTENCE_SPLIT_RE.split(text)
     out = []
     for s in segs:
         s = s.strip()
         if len(s) < 6:
             continue
-        if re.match(r'^(see|refer|read)\b', s, flags=re.IGNORECASE):
+        if _SEE_REFER_RE.match(s):
             continue
         out.append(s)
     return out
@@ -0,0 +1,251 @@
+# core/utils_institution_analytics.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Q, Window
+from django.db.models.functions import RowNumber, TruncWeek
+from django.utils import timezone
+
+from core.models import (
+    InstitutionMembership,
+    InterviewSession,
+    PlacementPrediction,
+    SkillProfile,
+    TopicStat,
+)
+from core.utils_prediction_store import ensure_fresh_predictions
+from core.utils_readiness_series import readiness_series
+
+
+# Panels are cached per (institution, branch, batch) for this long
+INSTITUTION_ANALYTICS_CACHE_SECONDS = getattr(settings, "INSTITUTION_ANALYTICS_CACHE_SECONDS", 300)
+
+# Rows listed per risk panel (counts always cover every student)
+RISK_LIST_LIMIT = 50
+TOP_STUDENTS = 10
+WEAK_TOPICS = 5
+GROWTH_WEEKS = 8
+READINESS_TREND_DAYS = 30
+
+READINESS_BANDS = {
+    "not_ready": Q(readiness_score__lt=40),
+    "moderate": Q(readiness_score__gte=40, readiness_score__lt=70),
+    "ready": Q(readiness_score__gte=70),
+}
+
+
+# ======================================================
+# SCOPE
+# ======================================================
+def student_ids_for(institution, branch=None, batch=None):
+    """Student user ids as a lazy subquery (never materialized in Python)."""
+    memberships = InstitutionMembership.objects.filter(institution=institution, role="student")
+    if branch:
+        memberships = memberships.filter(branch=branch)
+    if batch:
+        memberships = memberships.filter(batch=batch)
+    return memberships.values("user_id")
+
+
+def analytics_key(institution, branch=None, batch=None):
+    return f"institution_analytics:{getattr(institution, 'pk', institution)}:{branch or ''}:{batch or ''}"
+
+
+# ======================================================
+# PANELS (ONE GROUPED / CONDITIONAL QUERY EACH)
+# ======================================================
+def _readiness_panel(profiles):
+    """Average, readiness bands and risk-level counts in one aggregate."""
+    totals = profiles.aggregate(
+        avg=Avg("readiness_score"),
+        **{band: Count("id", filter=q) for band, q in READINESS_BANDS.items()},
+        high_risk_count=Count("id", filter=Q(risk_level="high")),
+        medium_risk_count=Count("id", filter=Q(risk_level="medium")),
+        low_risk_count=Count("id", filter=Q(risk_level="low")),
+    )
+    totals["avg_readiness"] = round(totals.pop("avg") or 0, 2)
+    return totals
+
+
+def _student_row(username, readiness, behavior=None):
+    row = {"user": {"username": username}, "readiness_score": readiness}
+    if behavior is not None:
+        row["behavior_score"] = behavior
+    return row
+
+
+def _risk_lists(profiles):
+    """High/medium risk students, lowest readiness first — one query."""
+    rows = (
+        profiles
+        .filter(risk_level__in=["high", "medium"])
+        .annotate(rn=Window(
+            RowNumber(),
+            partition_by=[F("risk_level")],
+            order_by=F("readiness_score").asc(),
+        ))
+        .filter(rn__lte=RISK_LIST_LIMIT)
+        .order_by("risk_level", "readiness_score")
+        .values_list("risk_level", "user__username", "readiness_score", "behavior_score")
+    )
+
+    lists = {"high": [], "medium": []}
+    for level, username, readiness, behavior in rows:
+        lists[level].append(_student_row(username, readiness, behavior))
+    return lists["high"], lists["medium"]
+
+
+def _top_students(profiles):
+    return [
+        _student_row(username, readiness)
+        for username, readiness in (
+            profiles
+            .order_by("-readiness_score")
+            .values_list("user__username", "readiness_score")[:TOP_STUDENTS]
+        )
+    ]
+
+
+def _weak_topics(student_ids):
+    return list(
+        TopicStat.objects
+        .filter(user_id__in=student_ids, mastery_score__lt=40)
+        .values("topic")
+        .annotate(student_count=Count("user", distinct=True))
+        .order_by("-student_count")[:WEAK_TOPICS]
+    )
+
+
+def _flagged_latest_sessions(student_ids):
+    """Students whose latest interview session is risk-flagged (window query)."""
+    latest = (
+        InterviewSession.objects
+        .filter(user_id__in=student_ids)
+        .annotate(rn=Window(
+            RowNumber(),
+            partition_by=[F("user_id")],
+            order_by=[F("created_at").desc(), F("id").desc()],
+        ))
+        .filter(rn=1)
+        .values("id")
+    )
+
+    # risk_flag must be tested *after* picking the latest session
+    rows = (
+        InterviewSession.objects
+        .filter(id__in=latest, risk_flag=True)
+        .values_list(
+            "user__username",
+            "user__skillprofile__readiness_score",
+            "performance_slope",
+            "confidence_trend",
+        )
+    )
+
+    students = [
+        {
+            "user": {"username": username, "skillprofile": {"readiness_score": readiness}},
+            "performance_slope": slope,
+            "confidence_trend": trend,
+        }
+        for username, readiness, slope, trend in rows
+    ]
+    students.sort(key=lambda s: s["user"]["skillprofile"]["readiness_score"] or 0)
+    return students
+
+
+def _weekly_growth(student_ids):
+    since = timezone.now() - timedelta(weeks=GROWTH_WEEKS)
+    return [
+        {"week": w["week"].strftime("%b %d"), "avg_score": round(w["avg_score"] or 0, 2)}
+        for w in (
+            InterviewSession.objects
+            .filter(user_id__in=student_ids, created_at__gte=since)
+            .annotate(week=TruncWeek("created_at"))
+            .values("week")
+            .annotate(avg_score=Avg("average_score"))
+            .order_by("week")
+        )
+    ]
+
+
+def _readiness_trend(institution, student_ids, scoped):
+    """Institution rollup when unfiltered; the scoped students' own rollups otherwise."""
+    if scoped:
+        series = readiness_series(user_ids=student_ids, days=READINESS_TREND_DAYS)
+    else:
+        series = readiness_series(institution=institution, days=READINESS_TREND_DAYS)
+
+    return [
+        {"day": p["start"].strftime("%b %d"), "avg_readiness": p["avg_readiness"]}
+        for p in series
+    ]
+
+
+def _prediction_distribution(student_ids):
+    ensure_fresh_predictions(student_ids)
+
+    distribution = dict(
+        PlacementPrediction.objects
+        .filter(user_id__in=student_ids)
+        .values_list("category")
+        .annotate(n=Count("id"))
+    )
+    return {
+        "tier1_ready": distribution.pop("Tier-1 Ready", 0),
+        "service_ready": distribution.pop("Service Ready", 0),
+        "high_risk": distribution.pop("High Risk", 0),
+        "needs_improvement": sum(distribution.values()),
+    }
+
+
+def _filter_options(institution):
+    pairs = list(
+        InstitutionMembership.objects
+        .filter(institution=institution, role="student")
+        .values_list("branch", "batch")
+        .distinct()
+    )
+    return {
+        "departments": sorted({b for b, _ in pairs if b}),
+        "batches": sorted({b for _, b in pairs if b}),
+    }
+
+
+# ======================================================
+# PUBLIC API
+# ======================================================
+def compute_institution_analytics(institution, branch=None, batch=None):
+    """Every admin dashboard panel as plain (cacheable) values."""
+    student_ids = student_ids_for(institution, branch, batch)
+    profiles = SkillProfile.objects.filter(user_id__in=student_ids)
+
+    high_risk_students, medium_risk_students = _risk_lists(profiles)
+
+    return {
+        **_readiness_panel(profiles),
+        "high_risk_students": high_risk_students,
+        "medium_risk_students": medium_risk_students,
+        "top_students": _top_students(profiles),
+        "weak_topics": _weak_topics(student_ids),
+        "risk_students": _flagged_latest_sessions(student_ids),
+        "growth_data": _weekly_growth(student_ids),
+        "readiness_trend": _readiness_trend(institution, student_ids, bool(branch or batch)),
+        **_prediction_distribution(student_ids),
+        **_filter_options(institution),
+    }
+
+
+def get_institution_analytics(institution, branch=None, batch=None, refresh=False):
+    key = analytics_key(institution, branch, batch)
+
+    if not refresh:
+        data = cache.get(key)
+        if data is not None:
+            return data
+
+    data = compute_institution_analytics(institution, branch, batch)
+    cache.set(key, data, INSTITUTION_ANALYTICS_CACHE_SECONDS)
+    return data
@@ -57,29 +57,30 @@ def get_user_next_difficulty(user):
 # ======================================================
 # ADAPTIVE DIFFICULTY ENGINE
 # ======================================================
-def update_adaptive_difficulty(user):
-
+def adaptive_difficulty(user):
+    """Next difficulty from the last 3 completed sessions (None if there are none)."""
     recent_sessions = (
         InterviewSession.objects
         .filter(user=user, completed=True)
         .order_by("-created_at")[:3]
     )
 
-    if recent_sessions.count() == 0:
-        return
-
-    avg_score = (
-        recent_sessions.aggregate(avg=Avg("average_score"))["avg"] or 0
-    )
-
-    profile, _ = SkillProfile.objects.get_or_create(user=user)
+    avg_score = recent_sessions.aggregate(avg=Avg("average_score"))["avg"]
+    if avg_score is None:
+        return None
 
     if avg_score >= 75:
-        profile.next_difficulty = "hard"
-    elif avg_score <= 40:
-        profile.next_difficulty = "easy"
-    else:
-        profile.next_difficulty = "medium"
+        return "hard"
+    if avg_score <= 40:
+        return "easy"
+    return "medium"
 
-    profile.save()
 
+def update_adaptive_difficulty(user):
+    difficulty = adaptive_difficulty(user)
+    if difficulty is None:
+        return
+
+    profile, _ = SkillProfile.objects.get_or_create(user=user)
+    profile.next_difficulty = difficulty
+    profile.save(update_fields=["next_difficulty"])
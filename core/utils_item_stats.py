@@ -0,0 +1,427 @@
+# core/utils_item_stats.py
+
+import hashlib
+import random
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import (
+    QuizAttempt,
+    QuizChapter,
+    ItemResponse,
+    ItemStat,
+    DailyQuizQuestion,
+    SkillProfile,
+)
+from core.utils_checkpoint import get_checkpoint, advance_checkpoint
+
+
+CHECKPOINT_NAME = "item_stats"
+RESPONSES_CHECKPOINT_NAME = "item_responses"
+
+# Only these sections have a single exact answer
+GRADED_SECTIONS = ("mcq", "fill")
+
+# Calibration thresholds
+MIN_ATTEMPTS_FOR_CALIBRATION = 20
+EASY_RATE = 0.75
+HARD_RATE = 0.40
+
+
+# ======================================================
+# ITEM IDENTITY + GRADING HELPERS
+# ======================================================
+def make_item_key(subject, question_text):
+    norm = " ".join(str(question_text or "").lower().split())
+    return hashlib.sha1(f"{subject}|{norm}".encode("utf-8")).hexdigest()
+
+
+def calibrated_difficulty(correct_rate, attempts, default="medium"):
+    if attempts < MIN_ATTEMPTS_FOR_CALIBRATION:
+        return default
+    if correct_rate >= EASY_RATE:
+        return "easy"
+    if correct_rate < HARD_RATE:
+        return "hard"
+    return "medium"
+
+
+def is_correct(given, expected):
+    return str(given).strip().lower() == str(expected).strip().lower()
+
+
+def _split_given(given):
+    """Answers are plain values or {"answer": ..., "time_taken": seconds}."""
+    if isinstance(given, dict):
+        return given.get("answer"), given.get("time_taken")
+    return given, None
+
+
+def iter_graded_items(questions, answers):
+    """
+    Yields (section, position, question, given_answer, time_taken)
+    for every auto-gradable item of a quiz.
+
+    - questions: flat list, or {"mcq": [...], "fill": [...], ...}
+    - answers:   flat list (aligned with the graded questions in order),
+                 or a dict of per-section lists
+    """
+    if isinstance(questions, list):
+        sections = [("", questions)]
+    elif isinstance(questions, dict):
+        sections = [(name, questions.get(name) or []) for name in GRADED_SECTIONS]
+    else:
+        return
+
+    answers = answers if answers is not None else []
+    flat_idx = 0
+
+    for section, items in sections:
+        section_answers = answers.get(section, []) if isinstance(answers, dict) else None
+
+        for position, q in enumerate(items):
+            if not isinstance(q, dict) or not q.get("answer"):
+                continue
+
+            if section_answers is not None:
+                raw = section_answers[position] if position < len(section_answers) else None
+            else:
+                raw = answers[flat_idx] if flat_idx < len(answers) else None
+                flat_idx += 1
+
+            given, time_taken = _split_given(raw)
+            yield section, position, q, given, time_taken
+
+
+# ======================================================
+# RESPONSE LOG (DAILY / WEEKLY QUIZZES)
+# ======================================================
+def record_item_responses(user, quiz_key, subject, questions, answers):
+    """
+    Logs one graded answer per item of a quiz that has no QuizAttempt
+    row (daily / weekly), in a single bulk INSERT. aggregate_item_stats
+    folds them into ItemStat. Only signed-in students count, and only
+    their first submit of a quiz — resubmits (even concurrent ones hit
+    the unique key) add nothing. Returns rows written.
+    """
+    if not getattr(user, "is_authenticated", False):
+        return 0
+
+    if ItemResponse.objects.filter(user=user, quiz_key=quiz_key).exists():
+        return 0
+
+    items = list(iter_graded_items(questions, answers))
+    if not items:
+        return 0
+
+    bank_ids = {q.get("bank_id") for _, _, q, _, _ in items if isinstance(q.get("bank_id"), int)}
+    live = set(
+        DailyQuizQuestion.objects.filter(id__in=bank_ids).values_list("id", flat=True)
+    ) if bank_ids else set()
+
+    rows = []
+    for section, position, q, given, time_taken in items:
+        bank_id = q.get("bank_id")
+        rows.append(ItemResponse(
+            user=user,
+            quiz_key=quiz_key,
+            item_key=make_item_key(subject, q.get("question")),
+            subject=subject,
+            section=section,
+            position=position,
+            bank_question_id=bank_id if bank_id in live else None,
+            correct=is_correct(given, q.get("answer")),
+            time_taken=float(time_taken) if isinstance(time_taken, (int, float)) else None,
+        ))
+
+    ItemResponse.objects.bulk_create(rows, ignore_conflicts=True)
+    return len(rows)
+
+
+# ======================================================
+# INCREMENTAL AGGREGATION (QuizAttempt / ItemResponse → ItemStat)
+# ======================================================
+def aggregate_item_stats(batch_size=500):
+    """
+    Folds every QuizAttempt and ItemResponse newer than its checkpoint
+    into ItemStat. Each batch is one transaction: deltas are summed in
+    memory, existing rows are bulk-updated, new rows bulk-created, and
+    the checkpoint advanced — so nothing is ever counted twice.
+    Returns the number of attempts + responses processed.
+    """
+    return (
+        _aggregate(CHECKPOINT_NAME, _attempt_batch, _apply_batch, batch_size)
+        + _aggregate(RESPONSES_CHECKPOINT_NAME, _response_batch, _apply_responses, batch_size)
+    )
+
+
+def _aggregate(checkpoint_name, fetch, apply, batch_size):
+    processed = 0
+
+    while True:
+        with transaction.atomic():
+            checkpoint = get_checkpoint(checkpoint_name, lock=True)
+
+            batch = fetch(checkpoint.last_id, batch_size)
+            if not batch:
+                break
+
+            apply(batch)
+            advance_checkpoint(checkpoint, batch[-1]["id"])
+
+        processed += len(batch)
+
+        if len(batch) < batch_size:
+            break
+
+    return processed
+
+
+def _attempt_batch(last_id, batch_size):
+    return list(
+        QuizAttempt.objects
+        .filter(id__gt=last_id)
+        .order_by("id")
+        .values("id", "quiz_id", "answers_json", "duration_seconds", "submitted_at")
+        [:batch_size]
+    )
+
+
+def _response_batch(last_id, batch_size):
+    return list(
+        ItemResponse.objects
+        .filter(id__gt=last_id)
+        .order_by("id")
+        .values("id", "item_key", "subject", "section", "position",
+                "bank_question_id", "correct", "time_taken")
+        [:batch_size]
+    )
+
+
+def _new_deltas():
+    return defaultdict(lambda: {
+        "attempts": 0, "correct": 0, "timed": 0, "time": 0.0,
+    })
+
+
+def _count(d, correct, time_taken):
+    d["attempts"] += 1
+    d["correct"] += 1 if correct else 0
+
+    if time_taken is not None:
+        d["timed"] += 1
+        d["time"] += float(time_taken)
+
+
+def _apply_batch(batch):
+    quiz_ids = {a["quiz_id"] for a in batch if a["quiz_id"] and a["submitted_at"]}
+    quizzes = QuizChapter.objects.only("id", "subject", "questions_json").in_bulk(quiz_ids)
+
+    deltas = _new_deltas()
+    meta = {}
+
+    for attempt in batch:
+        quiz = quizzes.get(attempt["quiz_id"])
+        if not quiz or not attempt["submitted_at"]:
+            continue
+
+        items = list(iter_graded_items(quiz.questions_json, attempt["answers_json"]))
+        if not items:
+            continue
+
+        # No per-item timing from the client → spread the attempt duration
+        per_item_time = (
+            attempt["duration_seconds"] / len(items)
+            if attempt["duration_seconds"] else None
+        )
+
+        for section, position, q, given, time_taken in items:
+            key = make_item_key(quiz.subject, q.get("question"))
+
+            _count(
+                deltas[key],
+                is_correct(given, q.get("answer")),
+                time_taken if time_taken is not None else per_item_time,
+            )
+
+            meta.setdefault(key, {
+                "subject": quiz.subject,
+                "quiz_id": quiz.id,
+                "section": section,
+                "position": position,
+                "bank_question_id": q.get("bank_id"),
+            })
+
+    _fold(deltas, meta)
+
+
+def _apply_responses(batch):
+    deltas = _new_deltas()
+    meta = {}
+
+    for r in batch:
+        key = r["item_key"]
+        _count(deltas[key], r["correct"], r["time_taken"])
+
+        meta.setdefault(key, {
+            "subject": r["subject"],
+            "quiz_id": None,
+            "section": r["section"],
+            "position": r["position"],
+            "bank_question_id": r["bank_question_id"],
+        })
+
+    _fold(deltas, meta)
+
+
+def _fold(deltas, meta):
+    if not deltas:
+        return
+
+    # Drop links to bank questions that no longer exist
+    bank_ids = {m["bank_question_id"] for m in meta.values() if m["bank_question_id"]}
+    if bank_ids:
+        live = set(
+            DailyQuizQuestion.objects
+            .filter(id__in=bank_ids)
+            .values_list("id", flat=True)
+        )
+        for m in meta.values():
+            if m["bank_question_id"] not in live:
+                m["bank_question_id"] = None
+
+    existing = (
+        ItemStat.objects
+        .select_for_update()
+        .in_bulk(list(deltas.keys()), field_name="item_key")
+    )
+
+    to_update = []
+    to_create = []
+    now = timezone.now()
+
+    for key, d in deltas.items():
+        stat = existing.get(key)
+        if stat is None:
+            stat = ItemStat(item_key=key, **meta[key])
+            to_create.append(stat)
+        else:
+            to_update.append(stat)
+
+        stat.updated_at = now
+        stat.attempts += d["attempts"]
+        stat.correct += d["correct"]
+        stat.timed_attempts += d["timed"]
+        stat.total_time_seconds += d["time"]
+
+        stat.correct_rate = round(stat.correct / stat.attempts, 4) if stat.attempts else 0
+        stat.avg_time_seconds = (
+            round(stat.total_time_seconds / stat.timed_attempts, 2)
+            if stat.timed_attempts else 0
+        )
+        stat.difficulty = calibrated_difficulty(
+            stat.correct_rate, stat.attempts, default=stat.difficulty
+        )
+
+    if to_update:
+        ItemStat.objects.bulk_update(to_update, [
+            "attempts", "correct", "timed_attempts", "total_time_seconds",
+            "correct_rate", "avg_time_seconds", "difficulty", "updated_at",
+        ])
+    if to_create:
+        ItemStat.objects.bulk_create(to_create)
+
+    # Push calibrated difficulty back onto the question bank
+    bank_updates = {
+        s.bank_question_id: s.difficulty
+        for s in to_update + to_create
+        if s.bank_question_id and s.attempts >= MIN_ATTEMPTS_FOR_CALIBRATION
+    }
+    if bank_updates:
+        bank = DailyQuizQuestion.objects.in_bulk(list(bank_updates.keys()))
+        for qid, q in bank.items():
+            q.difficulty = bank_updates[qid]
+        DailyQuizQuestion.objects.bulk_update(list(bank.values()), ["difficulty"])
+
+
+# ======================================================
+# SELECTION ENGINE (MATCH STUDENT'S NEXT DIFFICULTY)
+# ======================================================
+def get_target_difficulty(user):
+    return (
+        SkillProfile.objects
+        .filter(user=user)
+        .values_list("next_difficulty", flat=True)
+        .first()
+    ) or "medium"
+
+
+def bank_item_payload(q):
+    options = [q.option_a, q.option_b, q.option_c, q.option_d]
+    answer = dict(zip("ABCD", options)).get(q.correct_option)
+
+    return {
+        "question": q.question,
+        "options": options,
+        "answer": answer,
+        "difficulty": q.difficulty,
+        "bank_id": q.id,
+    }
+
+
+def _stat_item_payload(stat):
+    section = stat.quiz.questions_json
+    if stat.section:
+        section = section.get(stat.section) or []
+
+    if not isinstance(section, list) or stat.position >= len(section):
+        return None
+
+    item = dict(section[stat.position])
+    item["difficulty"] = stat.difficulty
+    return item
+
+
+def select_items(user, subject, count=10, difficulty=None, pool_factor=5):
+    """
+    Picks `count` items at the student's next_difficulty.
+    1. Question bank rows — (subject, difficulty) index
+    2. Top-up from calibrated generated items — (subject, difficulty, attempts) index
+    """
+    difficulty = difficulty or get_target_difficulty(user)
+
+    pool = list(
+        DailyQuizQuestion.objects
+        .filter(subject=subject, difficulty=difficulty)
+        .values_list("id", flat=True)[:count * pool_factor]
+    )
+    picked = random.sample(pool, min(count, len(pool)))
+
+    items = [
+        bank_item_payload(q)
+        for q in DailyQuizQuestion.objects.filter(id__in=picked)
+    ]
+
+    if len(items) < count:
+        stats = (
+            ItemStat.objects
+            .filter(
+                subject=subject,
+                difficulty=difficulty,
+                attempts__gte=MIN_ATTEMPTS_FOR_CALIBRATION,
+                bank_question__isnull=True,
+                quiz__isnull=False,
+            )
+            .select_related("quiz")
+            .order_by("-attempts")[:count - len(items)]
+        )
+
+        for stat in stats:
+            payload = _stat_item_payload(stat)
+            if payload:
+                items.append(payload)
+
+    random.shuffle(items)
+    return items
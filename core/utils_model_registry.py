@@ -0,0 +1,194 @@
+# core/utils_model_registry.py
+
+import json
+import os
+import threading
+import time
+
+import joblib
+from django.conf import settings
+
+
+# <REGISTRY_DIR>/<name>/<version>/model.joblib + meta.json
+# <REGISTRY_DIR>/<name>/CURRENT  → active version
+REGISTRY_DIR = getattr(
+    settings, "MODEL_REGISTRY_DIR",
+    os.path.join(settings.BASE_DIR, "core", "ml", "registry"),
+)
+
+# How often a process re-checks CURRENT for a version published elsewhere
+REGISTRY_CHECK_INTERVAL = getattr(settings, "MODEL_REGISTRY_CHECK_INTERVAL", 10)
+
+# Pre-registry artifact locations, used only until a version is registered
+LEGACY_PATHS = {
+    "placement": ["placement_model.pkl", os.path.join("core", "ml", "placement_model.pkl")],
+    "hiring": [os.path.join("core", "ml_models", "placement_model.pkl")],
+}
+
+MODEL_FILE = "model.joblib"
+META_FILE = "meta.json"
+
+_lock = threading.Lock()
+_active = {}   # name → {"version", "model", "meta", "checked_at"}
+
+
+# ======================================================
+# PATHS
+# ======================================================
+def _model_dir(name):
+    return os.path.join(REGISTRY_DIR, name)
+
+
+def _version_dir(name, version):
+    return os.path.join(_model_dir(name), version)
+
+
+def _current_file(name):
+    return os.path.join(_model_dir(name), "CURRENT")
+
+
+def _write_atomic(path, text):
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ======================================================
+# PUBLISH
+# ======================================================
+def save_model(name, model, features, training_size, metrics=None, activate=True, extra=None):
+    """
+    Stores a new immutable version and (by default) makes it active.
+    Dumped uncompressed so numpy arrays can be mmap'd on load.
+    Returns the version string.
+    """
+    version = time.strftime("%Y%m%d-%H%M%S")
+    path = _version_dir(name, version)
+
+    suffix = 1
+    while os.path.exists(path):
+        suffix += 1
+        path = _version_dir(name, f"{version}-{suffix}")
+    version = os.path.basename(path)
+
+    os.makedirs(path)
+    joblib.dump(model, os.path.join(path, MODEL_FILE))
+
+    meta = {
+        "name": name,
+        "version": version,
+        "features": list(features),
+        "training_size": int(training_size),
+        "metrics": metrics or {},
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        **(extra or {}),
+    }
+    _write_atomic(os.path.join(path, META_FILE), json.dumps(meta, indent=2))
+
+    if activate:
+        activate_version(name, version)
+
+    return version
+
+
+def activate_version(name, version):
+    """Points CURRENT at `version`; every process swaps on its next check."""
+    if not os.path.exists(os.path.join(_version_dir(name, version), MODEL_FILE)):
+        raise ValueError(f"Unknown {name} model version: {version}")
+
+    _write_atomic(_current_file(name), version)
+
+    with _lock:
+        _active.pop(name, None)
+
+
+# ======================================================
+# DISCOVERY
+# ======================================================
+def current_version(name):
+    try:
+        with open(_current_file(name)) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def read_meta(name, version):
+    with open(os.path.join(_version_dir(name, version), META_FILE)) as f:
+        return json.load(f)
+
+
+def list_versions(name):
+    try:
+        versions = sorted(
+            v for v in os.listdir(_model_dir(name))
+            if os.path.isfile(os.path.join(_version_dir(name, v), META_FILE))
+        )
+    except OSError:
+        return []
+
+    return [read_meta(name, v) for v in versions]
+
+
+# ======================================================
+# LOAD (ONCE PER PROCESS, HOT-SWAPPED)
+# ======================================================
+def _load_legacy(name):
+    for path in LEGACY_PATHS.get(name, []):
+        if os.path.exists(path):
+            meta = {"name": name, "version": f"legacy@{int(os.path.getmtime(path))}"}
+            return meta["version"], joblib.load(path), meta
+    return None, None, None
+
+
+def _load(name):
+    version = current_version(name)
+
+    if version is None:
+        return _load_legacy(name)
+
+    path = os.path.join(_version_dir(name, version), MODEL_FILE)
+    model = joblib.load(path, mmap_mode="r")
+    return version, model, read_meta(name, version)
+
+
+def get_model(name):
+    """
+    Returns (model, meta) for the active version, or (None, None).
+    The artifact is loaded once per process; CURRENT is re-read at
+    most every REGISTRY_CHECK_INTERVAL seconds, so activating a new
+    version swaps it in without a restart.
+    """
+    now = time.monotonic()
+    entry = _active.get(name)
+
+    if entry and now - entry["checked_at"] < REGISTRY_CHECK_INTERVAL:
+        return entry["model"], entry["meta"]
+
+    with _lock:
+        entry = _active.get(name)
+
+        if entry and entry["version"] == (current_version(name) or entry["version"]):
+            entry["checked_at"] = now
+            return entry["model"], entry["meta"]
+
+        try:
+            version, model, meta = _load(name)
+        except Exception as e:
+            print(f"⚠️ Could not load {name} model:", e)
+            version, model, meta = None, None, None
+
+        _active[name] = {
+            "version": version,
+            "model": model,
+            "meta": meta,
+            "checked_at": now,
+        }
+        return model, meta
+
+
+def model_version(name):
+    """Active version string for `name`, or None when nothing is deployed."""
+    model, meta = get_model(name)
+    return meta["version"] if model is not None else None
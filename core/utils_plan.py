@@ -18,6 +18,7 @@ def is_feature_allowed(institution, feature_name):
         "admin_dashboard": ["pro", "enterprise"],
         "weak_topics": ["pro", "enterprise"],
         "pdf_export": ["pro", "enterprise"],
+        "data_export": ["pro", "enterprise"],
         "batch_filtering": ["enterprise"],
         "placement_prediction": ["enterprise"],
     }
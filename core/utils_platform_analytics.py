@@ -0,0 +1,97 @@
+# core/utils_platform_analytics.py
+
+from django.core.paginator import Paginator
+from django.db.models import Avg, Case, Count, F, FloatField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, Round
+
+from core.models import Institution, SkillProfile
+
+
+PAGE_SIZE = 50
+
+# ?sort=<key> (prefix "-" for descending) → annotated column
+SORT_FIELDS = {
+    "name": "name",
+    "students": "students",
+    "readiness": "avg_readiness",
+    "plan": "plan",
+    "revenue": "revenue",
+}
+DEFAULT_SORT = "name"
+
+STUDENT = Q(institutionmembership__role="student")
+
+
+# ======================================================
+# PER-INSTITUTION ROWS (ONE GROUPED QUERY)
+# ======================================================
+def institution_rows():
+    """
+    Every institution with its student count, average readiness and
+    monthly revenue, computed in a single GROUP BY. A membership joins
+    to at most one SkillProfile, so counts are not inflated.
+    """
+    return (
+        Institution.objects
+        .annotate(
+            students=Count("institutionmembership", filter=STUDENT),
+            avg_readiness=Coalesce(
+                Round(Avg("institutionmembership__user__skillprofile__readiness_score", filter=STUDENT), 2),
+                Value(0.0),
+            ),
+            revenue=Case(
+                When(is_active=True, then=F("monthly_price")),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
+        )
+        .values("id", "name", "city", "plan", "is_active", "students", "avg_readiness", "revenue")
+    )
+
+
+def parse_sort(sort):
+    """Returns (sort param, order_by list); unknown keys fall back to name."""
+    sort = sort or DEFAULT_SORT
+    key = sort.lstrip("-")
+    if key not in SORT_FIELDS:
+        sort, key = DEFAULT_SORT, DEFAULT_SORT
+
+    field = SORT_FIELDS[key]
+    if sort.startswith("-"):
+        return sort, [F(field).desc(nulls_last=True), "id"]
+    return sort, [F(field).asc(nulls_last=True), "id"]
+
+
+def institutions_page(page=1, sort=None, per_page=PAGE_SIZE):
+    """One sorted page of institution rows (LIMIT/OFFSET) plus its paginator."""
+    sort, order_by = parse_sort(sort)
+    paginator = Paginator(institution_rows().order_by(*order_by), per_page)
+    return paginator.get_page(page), sort
+
+
+# ======================================================
+# PLATFORM TOTALS
+# ======================================================
+def platform_totals():
+    """College count, revenue and plan mix in one aggregate; students in another."""
+    totals = Institution.objects.aggregate(
+        total_colleges=Count("id"),
+        total_revenue=Sum("monthly_price", filter=Q(is_active=True)),
+        **{
+            f"plan_{plan}": Count("id", filter=Q(plan=plan))
+            for plan, _ in Institution.PLAN_CHOICES
+        },
+    )
+
+    students = SkillProfile.objects.aggregate(n=Count("id"), avg=Avg("readiness_score"))
+
+    return {
+        "total_colleges": totals["total_colleges"],
+        "total_revenue": totals["total_revenue"] or 0,
+        "plan_mix": {
+            label: totals[f"plan_{plan}"]
+            for plan, label in Institution.PLAN_CHOICES
+        },
+        "total_students": students["n"],
+        "avg_readiness": round(students["avg"] or 0, 2),
+    }
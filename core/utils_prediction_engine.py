@@ -1,104 +1,186 @@
 # core/utils_prediction_engine.py
 
-import joblib
 import numpy as np
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
 from core.models import SkillProfile, InterviewSession
+from core.utils_model_registry import get_model
+
+MODEL_NAME = "placement"
+
+
+# Default column order (a registered model's metadata overrides it)
+FEATURES = (
+    "readiness_score",
+    "technical_score",
+    "communication_score",
+    "confidence_score",
+    "consistency_score",
+    "behavior_score",
+)
+
+CLASS_MAP = {
+    2: "Tier-1 Ready",
+    1: "Service Ready",
+    0: "High Risk"
+}
+
+# Heuristic uses the average of the last N completed interviews
+RECENT_INTERVIEWS = 3
+
+
+# =====================================================
+# COHORT FEATURE MATRIX (ONE QUERY)
+# =====================================================
+def _cohort_profiles(users, features=FEATURES):
+    """
+    `users` may be user ids, User objects, or a SkillProfile queryset.
+    Returns (user_ids, X) with X shaped (n, len(features)).
+    """
+    if hasattr(users, "model") and users.model is SkillProfile:
+        qs = users
+    else:
+        ids = [getattr(u, "pk", u) for u in users]
+        qs = SkillProfile.objects.filter(user_id__in=ids)
 
-MODEL_PATH = "placement_model.pkl"
+    rows = list(qs.order_by().values_list("user_id", *features))
+    if not rows:
+        return [], np.empty((0, len(features)))
 
-try:
-    model = joblib.load(MODEL_PATH)
-except:
-    model = None
+    user_ids = [r[0] for r in rows]
+    X = np.array([r[1:] for r in rows], dtype=float)
+    return user_ids, np.nan_to_num(X)
 
 
-def calculate_placement_prediction(user):
+def _recent_interview_average(user_ids):
+    """Average of each user's last 3 completed interviews — one windowed query."""
+    if not user_ids:
+        return {}
 
-    profile = SkillProfile.objects.filter(user=user).first()
-    if not profile:
-        return None
-
-    # =====================================================
-    # 🔥 IF ML MODEL EXISTS → USE ML
-    # =====================================================
-    if model:
-        features = np.array([[
-            profile.readiness_score,
-            profile.technical_score,
-            profile.communication_score,
-            profile.confidence_score,
-            profile.consistency_score,
-            getattr(profile, "behavior_score", 0),
-        ]])
-
-        probabilities = model.predict_proba(features)[0]
-        predicted_class = model.predict(features)[0]
-
-        class_map = {
-            2: "Tier-1 Ready",
-            1: "Service Ready",
-            0: "High Risk"
-        }
+    rows = (
+        InterviewSession.objects
+        .filter(user_id__in=user_ids, completed=True)
+        .annotate(rn=Window(
+            RowNumber(),
+            partition_by=[F("user_id")],
+            order_by=F("created_at").desc(),
+        ))
+        .filter(rn__lte=RECENT_INTERVIEWS)
+        .values_list("user_id", "average_score")
+    )
 
-        return {
-            "category": class_map[predicted_class],
-            "tier1_probability": round(probabilities[2] * 100, 2),
-            "service_probability": round(probabilities[1] * 100, 2),
-            "failure_risk": round(probabilities[0] * 100, 2),
-        }
+    sums, counts = {}, {}
+    for user_id, score in rows:
+        sums[user_id] = sums.get(user_id, 0) + score
+        counts[user_id] = counts.get(user_id, 0) + 1
 
-    # =====================================================
-    # 🧠 FALLBACK HEURISTIC LOGIC (SAFE MODE)
-    # =====================================================
+    return {uid: sums[uid] / counts[uid] for uid in sums}
 
-    readiness = profile.readiness_score
-    behavior = getattr(profile, "behavior_score", 0)
-    consistency = profile.consistency_score
 
-    last_sessions = (
-        InterviewSession.objects
-        .filter(user=user, completed=True)
-        .order_by("-created_at")[:3]
-    )
+# =====================================================
+# 🔥 ML SCORING (ONE predict_proba CALL)
+# =====================================================
+def _score_with_model(model, user_ids, X):
+    probabilities = model.predict_proba(X)
+    classes = list(model.classes_)
+    col = {c: classes.index(c) for c in CLASS_MAP if c in classes}
+    predicted = np.asarray(classes)[probabilities.argmax(axis=1)]
+
+    def pct(row, cls):
+        return round(row[col[cls]] * 100, 2) if cls in col else 0.0
+
+    return {
+        uid: {
+            "category": CLASS_MAP[int(cls)],
+            "tier1_probability": pct(row, 2),
+            "service_probability": pct(row, 1),
+            "failure_risk": pct(row, 0),
+        }
+        for uid, row, cls in zip(user_ids, probabilities.tolist(), predicted)
+    }
 
-    if last_sessions:
-        avg_interview = sum(s.average_score for s in last_sessions) / len(last_sessions)
-    else:
-        avg_interview = 0
 
-    tier1_prob = (
+# =====================================================
+# 🧠 FALLBACK HEURISTIC (VECTORIZED)
+# =====================================================
+def _score_with_heuristic(user_ids, X):
+    readiness = X[:, FEATURES.index("readiness_score")]
+    behavior = X[:, FEATURES.index("behavior_score")]
+    consistency = X[:, FEATURES.index("consistency_score")]
+
+    interviews = _recent_interview_average(user_ids)
+    avg_interview = np.array([interviews.get(uid, 0) for uid in user_ids], dtype=float)
+
+    tier1 = (
         0.4 * readiness +
         0.3 * behavior +
         0.2 * consistency +
         0.1 * (avg_interview * 10)
     )
 
-    tier1_prob = min(100, round(tier1_prob, 2))
-
-    service_prob = (
+    service = (
         0.5 * readiness +
         0.2 * consistency +
         0.2 * (avg_interview * 10) +
         0.1 * behavior
     )
 
-    service_prob = min(100, round(service_prob, 2))
+    failure = np.maximum(0, 100 - readiness)
+
+    results = {}
+
+    for uid, t1, sv, fr, rd in zip(
+        user_ids, tier1.tolist(), service.tolist(), failure.tolist(), readiness.tolist()
+    ):
+        tier1_prob = min(100, round(t1, 2))
+        service_prob = min(100, round(sv, 2))
+
+        if tier1_prob >= 75:
+            category = "Tier-1 Ready"
+        elif service_prob >= 65:
+            category = "Service Ready"
+        elif rd < 40:
+            category = "High Risk"
+        else:
+            category = "Needs Improvement"
+
+        results[uid] = {
+            "tier1_probability": tier1_prob,
+            "service_probability": service_prob,
+            "failure_risk": round(fr, 2),
+            "category": category,
+        }
 
-    failure_risk = max(0, 100 - readiness)
-    failure_risk = round(failure_risk, 2)
+    return results
 
-    if tier1_prob >= 75:
-        category = "Tier-1 Ready"
-    elif service_prob >= 65:
-        category = "Service Ready"
-    elif readiness < 40:
-        category = "High Risk"
-    else:
-        category = "Needs Improvement"
 
-    return {
-        "tier1_probability": tier1_prob,
-        "service_probability": service_prob,
-        "failure_risk": failure_risk,
-        "category": category,
-    }
+# =====================================================
+# PUBLIC API
+# =====================================================
+def model_version():
+    """Identifies what produced a prediction (stored with it)."""
+    model, meta = get_model(MODEL_NAME)
+    if model is None:
+        return "heuristic"
+    return f"{MODEL_NAME}@{meta['version']}"
+
+
+def predict_cohort(users):
+    """
+    Batch placement prediction: one profile query, one feature matrix,
+    one predict_proba call. Returns {user_id: prediction}; users
+    without a SkillProfile are omitted.
+    """
+    model, meta = get_model(MODEL_NAME)
+
+    if model is not None:
+        user_ids, X = _cohort_profiles(users, meta.get("features") or FEATURES)
+        return _score_with_model(model, user_ids, X) if user_ids else {}
+
+    user_ids, X = _cohort_profiles(users)
+    return _score_with_heuristic(user_ids, X) if user_ids else {}
+
+
+def calculate_placement_prediction(user):
+    return predict_cohort([user]).get(getattr(user, "pk", user))
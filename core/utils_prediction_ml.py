@@ -1,22 +1,60 @@
-import joblib
-import os
 import numpy as np
 
-MODEL_PATH = os.path.join("core", "ml_models", "placement_model.pkl")
+from core.utils_model_registry import get_model
+
+MODEL_NAME = "hiring"
+
+# Default column order (a registered model's metadata overrides it)
+FEATURES = (
+    "readiness_score",
+    "behavior_score",
+    "technical_score",
+    "communication_score",
+    "confidence_score",
+)
+
 
 def load_model():
-    return joblib.load(MODEL_PATH)
+    """Active hiring model from the registry (cached per process)."""
+    model, meta = get_model(MODEL_NAME)
+    if model is None:
+        raise FileNotFoundError("No hiring model registered")
+    return model, meta.get("features") or FEATURES
+
+
+def model_version():
+    """Active hiring model version, or None if it isn't deployed."""
+    model, meta = get_model(MODEL_NAME)
+    return f"{MODEL_NAME}@{meta['version']}" if model is not None else None
+
+
+def predict_probabilities(profiles):
+    """
+    Batch version of predict_probability: one feature matrix, one
+    predict_proba call. Accepts a SkillProfile queryset or list and
+    returns {user_id: probability}.
+    """
+    model, features = load_model()
+
+    if hasattr(profiles, "values_list"):
+        rows = list(profiles.order_by().values_list("user_id", *features))
+    else:
+        rows = [
+            (p.user_id, *(getattr(p, f) for f in features))
+            for p in profiles
+        ]
+
+    if not rows:
+        return {}
+
+    X = np.array([r[1:] for r in rows], dtype=float)
+    probs = model.predict_proba(X)[:, 1]
+
+    return {
+        r[0]: round(float(p), 4)
+        for r, p in zip(rows, probs)
+    }
+
 
 def predict_probability(profile):
-    model = load_model()
-
-    features = np.array([[
-        profile.readiness_score,
-        profile.behavior_score,
-        profile.technical_score,
-        profile.communication_score,
-        profile.confidence_score,
-    ]])
-
-    prob = model.predict_proba(features)[0][1]
-    return round(float(prob), 4)
+    return predict_probabilities([profile])[profile.user_id]
@@ -0,0 +1,118 @@
+# core/utils_prediction_store.py
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core.models import PlacementPrediction, SkillProfile
+from core import utils_prediction_engine, utils_prediction_ml
+from core.utils_candidate_search import refresh_candidates
+
+
+STORED_FIELDS = [
+    "category",
+    "tier1_probability",
+    "service_probability",
+    "failure_risk",
+    "hire_probability",
+    "model_version",
+    "updated_at",
+]
+
+
+# ======================================================
+# VERSIONING
+# ======================================================
+def current_model_version():
+    """Changes whenever either model artifact is replaced."""
+    return "|".join([
+        utils_prediction_engine.model_version(),
+        utils_prediction_ml.model_version() or "no-hiring-model",
+    ])
+
+
+# ======================================================
+# REFRESH
+# ======================================================
+def _hire_probabilities(user_ids):
+    if utils_prediction_ml.model_version() is None:
+        return {}
+    return utils_prediction_ml.predict_probabilities(
+        SkillProfile.objects.filter(user_id__in=user_ids)
+    )
+
+
+def refresh_predictions(user_ids, batch_size=500):
+    """
+    Re-scores the given users with the batch engines and upserts
+    their PlacementPrediction rows. Returns rows written.
+    """
+    user_ids = list(user_ids)
+    version = current_model_version()
+    written = 0
+
+    for i in range(0, len(user_ids), batch_size):
+        chunk = user_ids[i:i + batch_size]
+
+        predictions = utils_prediction_engine.predict_cohort(chunk)
+        hire = _hire_probabilities(list(predictions))
+        now = timezone.now()
+
+        rows = [
+            PlacementPrediction(
+                user_id=uid,
+                hire_probability=hire.get(uid),
+                model_version=version,
+                updated_at=now,
+                **pred,
+            )
+            for uid, pred in predictions.items()
+        ]
+
+        PlacementPrediction.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=STORED_FIELDS,
+        )
+        # Candidate search rows denormalize the prediction
+        refresh_candidates(chunk)
+        written += len(rows)
+
+    return written
+
+
+def refresh_after_promote(batch_size=500):
+    """
+    Re-scores every stored prediction made by another model version,
+    which also rewrites their candidate search rows. Run whenever a
+    model version is activated. Returns rows written.
+    """
+    return refresh_predictions(stale_user_ids(), batch_size=batch_size)
+
+
+def stale_user_ids(user_ids=None):
+    """
+    Users whose stored prediction is missing, older than their
+    SkillProfile, or produced by a different model version.
+    One query; pass a cohort to scope it.
+    """
+    qs = SkillProfile.objects.all()
+    if user_ids is not None:
+        qs = qs.filter(user_id__in=user_ids)
+
+    return list(
+        qs.filter(
+            Q(user__placement_prediction__isnull=True) |
+            ~Q(user__placement_prediction__model_version=current_model_version()) |
+            Q(last_updated__gt=F("user__placement_prediction__updated_at"))
+        )
+        .values_list("user_id", flat=True)
+    )
+
+
+def ensure_fresh_predictions(user_ids=None):
+    """Cheap guard for dashboards: refresh only what is stale."""
+    stale = stale_user_ids(user_ids)
+    if stale:
+        refresh_predictions(stale)
+    return len(stale)
@@ -0,0 +1,203 @@
+# core/utils_profile_queue.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import ProfileUpdateQueue
+
+
+# Triggers for the same user inside this window collapse into one recompute
+PROFILE_QUEUE_WINDOW = getattr(settings, "PROFILE_QUEUE_WINDOW_SECONDS", 30)
+
+# Off: triggers recompute inline
+PROFILE_QUEUE_ENABLED = getattr(settings, "PROFILE_QUEUE_ENABLED", False)
+
+# The web process drains its own queue (one background thread per cache)
+# unless a dedicated `manage.py process_profile_queue --loop` worker runs
+PROFILE_QUEUE_INLINE_WORKER = getattr(settings, "PROFILE_QUEUE_INLINE_WORKER", True)
+
+# A claim older than this belongs to a dead worker and is taken over
+PROFILE_QUEUE_CLAIM_TIMEOUT = getattr(settings, "PROFILE_QUEUE_CLAIM_TIMEOUT_SECONDS", 300)
+
+DRAINER_LOCK_KEY = "profile_queue:drainer"
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="profile-queue")
+
+
+# ======================================================
+# ENQUEUE (REQUEST PATH — ONE UPSERT, NO AGGREGATES)
+# ======================================================
+def enqueue_profile_recompute(user, delay=None):
+    """
+    Marks the user's SkillProfile dirty. If a pending row already
+    exists only its requested_at moves, so its original due_at stands
+    and a burst of triggers costs one recompute — and a trigger that
+    lands while the row is being recomputed keeps it queued.
+    """
+    if not PROFILE_QUEUE_ENABLED:
+        from core.utils_skill_engine import recompute_skill_profile
+        return recompute_skill_profile(user)
+
+    delay = PROFILE_QUEUE_WINDOW if delay is None else delay
+
+    ProfileUpdateQueue.objects.bulk_create(
+        [ProfileUpdateQueue(
+            user_id=getattr(user, "pk", user),
+            due_at=timezone.now() + timedelta(seconds=delay),
+        )],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=["requested_at"],
+    )
+
+    if PROFILE_QUEUE_INLINE_WORKER:
+        # The drainer must see the row, so start it once it is committed
+        transaction.on_commit(start_inline_drainer)
+
+
+def start_inline_drainer():
+    # cache.add is atomic: only one drainer runs per cache
+    if cache.add(DRAINER_LOCK_KEY, 1, PROFILE_QUEUE_WINDOW * 4):
+        _executor.submit(_drain_until_empty)
+
+
+def _drain_until_empty():
+    try:
+        while True:
+            cache.set(DRAINER_LOCK_KEY, 1, PROFILE_QUEUE_WINDOW * 4)
+            process_profile_queue(workers=1)
+
+            next_due = (
+                ProfileUpdateQueue.objects
+                .order_by("due_at")
+                .values_list("due_at", flat=True)
+                .first()
+            )
+            if next_due is None:
+                cache.delete(DRAINER_LOCK_KEY)
+                # A trigger may have landed between the check and the delete
+                if not ProfileUpdateQueue.objects.exists() or not cache.add(
+                    DRAINER_LOCK_KEY, 1, PROFILE_QUEUE_WINDOW * 4
+                ):
+                    return
+                continue
+
+            wait = (next_due - timezone.now()).total_seconds()
+            time.sleep(min(max(wait, 1.0), PROFILE_QUEUE_WINDOW))
+
+    except Exception as e:
+        print("⚠️ Profile queue drainer stopped:", e)
+        cache.delete(DRAINER_LOCK_KEY)
+    finally:
+        connection.close()
+
+
+# ======================================================
+# WORKER SIDE
+# ======================================================
+def claim_due_users(batch_size=200, now=None):
+    """
+    Atomically marks up to batch_size due, unclaimed (or stale-claimed)
+    rows as claimed and returns (user ids, claimed_at). Rows are only
+    deleted by finish_claim after a successful recompute, so a worker
+    dying mid-batch loses nothing — its claims go stale and are retaken.
+    """
+    now = now or timezone.now()
+    claimed_at = timezone.now()
+    stale = claimed_at - timedelta(seconds=PROFILE_QUEUE_CLAIM_TIMEOUT)
+
+    with transaction.atomic():
+        ids = list(
+            ProfileUpdateQueue.objects
+            .select_for_update(skip_locked=True)
+            .filter(due_at__lte=now)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale))
+            .order_by("due_at")
+            .values_list("user_id", flat=True)[:batch_size]
+        )
+
+        if ids:
+            ProfileUpdateQueue.objects.filter(user_id__in=ids).update(claimed_at=claimed_at)
+
+    return ids, claimed_at
+
+
+def finish_claim(done_ids, failed_ids, claimed_at):
+    """
+    Recomputed rows are deleted unless re-triggered after the claim
+    (those stay queued, released for the next pass). Failed rows are
+    released and retried one window later.
+    """
+    if done_ids:
+        ProfileUpdateQueue.objects.filter(
+            user_id__in=done_ids, requested_at__lte=claimed_at
+        ).delete()
+        ProfileUpdateQueue.objects.filter(user_id__in=done_ids).update(claimed_at=None)
+
+    if failed_ids:
+        ProfileUpdateQueue.objects.filter(user_id__in=failed_ids).update(
+            claimed_at=None,
+            due_at=timezone.now() + timedelta(seconds=PROFILE_QUEUE_WINDOW),
+        )
+
+
+def _recompute_chunk(user_ids, claimed_at):
+    from core.utils_skill_engine import recompute_skill_profile
+
+    User = get_user_model()
+    done, failed = [], []
+
+    try:
+        for user in User.objects.filter(pk__in=user_ids):
+            try:
+                recompute_skill_profile(user)
+                done.append(user.pk)
+            except Exception as e:
+                print(f"⚠️ Profile recompute failed for user {user.pk}:", e)
+                failed.append(user.pk)
+
+        # Users deleted since the trigger have nothing left to recompute
+        finish_claim(
+            [uid for uid in user_ids if uid not in failed],
+            failed,
+            claimed_at,
+        )
+    finally:
+        # Worker threads own their own DB connection
+        connection.close()
+
+    return len(done)
+
+
+def process_profile_queue(workers=2, batch_size=200, now=None):
+    """
+    Drains every due row, fanning each claimed batch out across a
+    thread pool. Returns the number of profiles recomputed.
+    """
+    total = 0
+    workers = max(1, workers)
+
+    while True:
+        user_ids, claimed_at = claim_due_users(batch_size, now=now)
+        if not user_ids:
+            break
+
+        if workers == 1:
+            total += _recompute_chunk(user_ids, claimed_at)
+        else:
+            chunks = [c for c in (user_ids[i::workers] for i in range(workers)) if c]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                total += sum(pool.map(_recompute_chunk, chunks, [claimed_at] * len(chunks)))
+
+        if len(user_ids) < batch_size:
+            break
+
+    return total
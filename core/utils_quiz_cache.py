@@ -0,0 +1,170 @@
+# core/utils_quiz_cache.py
+
+import gzip
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from core.models import QuizChapter, DailyQuiz
+
+
+QUIZ_CACHE_TIMEOUT = getattr(settings, "QUIZ_CACHE_TIMEOUT", 60 * 60)
+QUIZ_CLIENT_MAX_AGE = getattr(settings, "QUIZ_CLIENT_MAX_AGE", 60)
+
+# Never sent to students — grading happens server-side
+HIDDEN_KEYS = ("answer",)
+
+LATEST_CHAPTER_KEY = "quiz:chapter:latest"
+
+
+# ======================================================
+# CACHE KEYS
+# ======================================================
+def chapter_key(quiz_id):
+    return f"quiz:chapter:{int(quiz_id)}"
+
+
+def daily_key(day):
+    return f"quiz:daily:{day.isoformat()}"
+
+
+# ======================================================
+# PAYLOAD HELPERS
+# ======================================================
+def _strip_item(q):
+    if isinstance(q, dict):
+        return {k: v for k, v in q.items() if k not in HIDDEN_KEYS}
+    return q
+
+
+def strip_answers(questions):
+    """Remove answers from a flat question list or a {section: [...]} dict."""
+    if isinstance(questions, list):
+        return [_strip_item(q) for q in questions]
+
+    if isinstance(questions, dict):
+        return {
+            name: [_strip_item(q) for q in items] if isinstance(items, list) else items
+            for name, items in questions.items()
+        }
+
+    return questions
+
+
+def build_entry(payload, last_modified):
+    """
+    Serialize once, compress once. Every cache hit after this is a
+    byte copy — no JSON encoding, no gzip, no DB.
+    """
+    body = json.dumps(
+        payload, cls=DjangoJSONEncoder, separators=(",", ":")
+    ).encode("utf-8")
+
+    return {
+        "body": body,
+        "gzip": gzip.compress(body, compresslevel=6),
+        "etag": '"%s"' % hashlib.sha1(body).hexdigest(),
+        "last_modified": int(last_modified.timestamp()) if last_modified else None,
+    }
+
+
+def read_through(key, builder):
+    entry = cache.get(key)
+
+    if entry is None:
+        entry = builder()
+        if entry is not None:
+            cache.set(key, entry, QUIZ_CACHE_TIMEOUT)
+
+    return entry
+
+
+# ======================================================
+# CHAPTER QUIZ
+# ======================================================
+def _chapter_entry(qc):
+    if not qc:
+        return None
+
+    return build_entry(
+        {"quiz_id": qc.id, "questions": strip_answers(qc.questions_json)},
+        qc.updated_at or qc.created_at,
+    )
+
+
+def get_chapter_quiz_entry(quiz_id):
+    return read_through(
+        chapter_key(quiz_id),
+        lambda: _chapter_entry(QuizChapter.objects.filter(pk=quiz_id).first()),
+    )
+
+
+def get_latest_chapter_quiz_entry():
+    return read_through(
+        LATEST_CHAPTER_KEY,
+        lambda: _chapter_entry(QuizChapter.objects.order_by("-created_at").first()),
+    )
+
+
+# ======================================================
+# DAILY QUIZ
+# ======================================================
+def get_daily_quiz_entry(day):
+    def build():
+        dq = DailyQuiz.objects.filter(date=day).first()
+        if not dq:
+            return None
+
+        return build_entry(
+            {"date": str(day), "quiz": strip_answers(dq.questions_json), "new": False},
+            dq.updated_at or dq.created_at,
+        )
+
+    return read_through(daily_key(day), build)
+
+
+# ======================================================
+# INVALIDATION (called from core.signals)
+# ======================================================
+def invalidate_chapter_quiz(quiz_id):
+    cache.delete_many([chapter_key(quiz_id), LATEST_CHAPTER_KEY])
+
+
+def invalidate_daily_quiz(day):
+    cache.delete(daily_key(day))
+
+
+# ======================================================
+# HTTP RESPONSE (ETag / Last-Modified / gzip)
+# ======================================================
+def cached_json_response(request, entry):
+    response = get_conditional_response(
+        request,
+        etag=entry["etag"],
+        last_modified=entry["last_modified"],
+    )
+
+    if response is None:
+        use_gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+
+        response = HttpResponse(
+            entry["gzip"] if use_gzip else entry["body"],
+            content_type="application/json",
+        )
+
+        if use_gzip:
+            response["Content-Encoding"] = "gzip"
+
+    response["ETag"] = entry["etag"]
+    if entry["last_modified"]:
+        response["Last-Modified"] = http_date(entry["last_modified"])
+    response["Cache-Control"] = f"private, max-age={QUIZ_CLIENT_MAX_AGE}"
+    patch_vary_headers(response, ("Accept-Encoding",))
+
+    return response
@@ -0,0 +1,125 @@
+# core/utils_quiz_paging.py
+
+from django.core.cache import cache
+
+from core.models import QuizChapter, DailyQuiz, WeeklyQuiz
+from core.utils_quiz_cache import read_through, strip_answers
+
+
+# Sections are served in this order; unknown sections follow
+SECTION_ORDER = ("mcq", "fill", "short", "long", "program")
+
+# Name used when a quiz is stored as a flat question list
+FLAT_SECTION = "questions"
+
+DEFAULT_PAGE_SIZE = 5
+MAX_PAGE_SIZE = 25
+
+SOURCE_MODELS = {
+    "chapter": QuizChapter,
+    "daily": DailyQuiz,
+    "weekly": WeeklyQuiz,
+}
+
+
+# ======================================================
+# CACHE KEYS
+# ======================================================
+def sections_key(source, quiz_id):
+    return f"quiz:sections:{source}:{int(quiz_id)}"
+
+
+def invalidate_quiz_sections(source, quiz_id):
+    cache.delete(sections_key(source, quiz_id))
+
+
+# ======================================================
+# SECTION INDEX (answers stripped, built once per quiz)
+# ======================================================
+def split_sections(questions):
+    """Normalizes a quiz into an ordered {section: [questions]} dict."""
+    if isinstance(questions, list):
+        return {FLAT_SECTION: questions} if questions else {}
+
+    if not isinstance(questions, dict):
+        return {}
+
+    names = [n for n in SECTION_ORDER if n in questions]
+    names += [n for n in questions if n not in SECTION_ORDER]
+
+    return {
+        name: questions[name]
+        for name in names
+        if isinstance(questions[name], list) and questions[name]
+    }
+
+
+def _build_sections(source, quiz_id):
+    model = SOURCE_MODELS[source]
+    obj = model.objects.filter(pk=quiz_id).first()
+    if not obj:
+        return None
+
+    return {
+        "owner_id": getattr(obj, "user_id", None),
+        "sections": split_sections(strip_answers(obj.questions_json)),
+        "last_modified": getattr(obj, "updated_at", None) or obj.created_at,
+    }
+
+
+def get_quiz_sections(source, quiz_id):
+    if source not in SOURCE_MODELS:
+        return None
+
+    return read_through(
+        sections_key(source, quiz_id),
+        lambda: _build_sections(source, quiz_id),
+    )
+
+
+# ======================================================
+# PAGING
+# ======================================================
+def first_cursor(sections):
+    for name in sections:
+        return {"section": name, "offset": 0}
+    return None
+
+
+def next_cursor(sections, section, offset):
+    """Position after `offset` in `section`, rolling into the next section."""
+    if offset < len(sections.get(section, [])):
+        return {"section": section, "offset": offset}
+
+    names = list(sections)
+    idx = names.index(section) + 1 if section in names else len(names)
+
+    if idx < len(names):
+        return {"section": names[idx], "offset": 0}
+    return None
+
+
+def get_page(data, section, offset, limit=DEFAULT_PAGE_SIZE):
+    """
+    Slice one page out of the cached section index.
+    Returns the payload dict, or None if `section` does not exist.
+    """
+    sections = data["sections"]
+    if section not in sections:
+        return None
+
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    offset = max(0, int(offset))
+
+    items = sections[section]
+    page = items[offset:offset + limit]
+
+    return {
+        "section": section,
+        "offset": offset,
+        "limit": limit,
+        "total": len(items),
+        "sections": {name: len(qs) for name, qs in sections.items()},
+        "questions": page,
+        "next": next_cursor(sections, section, offset + len(page)),
+    }
@@ -0,0 +1,99 @@
+# core/utils_ranking.py
+
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db.models import Avg
+
+from core.models import QuizAttempt
+
+
+# Seconds a score distribution is served before it is rebuilt
+RANKING_REFRESH_INTERVAL = getattr(settings, "RANKING_REFRESH_INTERVAL", 300)
+
+_lock = threading.Lock()
+_distributions = {}   # scope → {"scores", "total", "built_at"}
+
+
+# ======================================================
+# SCOPES
+# ======================================================
+def scope_key(institution=None, batch=None):
+    """("all",) · ("institution", id) · ("institution", id, batch)"""
+    if institution is None:
+        return ("all",)
+
+    institution_id = getattr(institution, "pk", institution)
+    if batch:
+        return ("institution", institution_id, batch)
+    return ("institution", institution_id)
+
+
+def _scoped_attempts(scope):
+    qs = QuizAttempt.objects.all()
+
+    if scope[0] == "institution":
+        qs = qs.filter(
+            user__institutionmembership__institution_id=scope[1],
+            user__institutionmembership__role="student",
+        )
+        if len(scope) > 2:
+            qs = qs.filter(user__institutionmembership__batch=scope[2])
+
+    return qs
+
+
+# ======================================================
+# DISTRIBUTION (ONE GROUP BY PER SCOPE PER INTERVAL)
+# ======================================================
+def _build(scope):
+    averages = list(
+        _scoped_attempts(scope)
+        .values("user")
+        .annotate(avg=Avg("score"))
+        .values_list("avg", flat=True)
+    )
+
+    return {
+        # Users without a scored attempt count towards the total only
+        "scores": sorted(a for a in averages if a),
+        "total": len(averages),
+        "built_at": time.monotonic(),
+    }
+
+
+def get_distribution(institution=None, batch=None):
+    """
+    Sorted per-user average scores for the scope. Built once per
+    process and rebuilt after RANKING_REFRESH_INTERVAL seconds.
+    """
+    scope = scope_key(institution, batch)
+    entry = _distributions.get(scope)
+
+    if entry and time.monotonic() - entry["built_at"] < RANKING_REFRESH_INTERVAL:
+        return entry
+
+    with _lock:
+        entry = _distributions.get(scope)
+        if entry and time.monotonic() - entry["built_at"] < RANKING_REFRESH_INTERVAL:
+            return entry
+
+        entry = _distributions[scope] = _build(scope)
+        return entry
+
+
+def invalidate_rankings():
+    with _lock:
+        _distributions.clear()
+
+
+# ======================================================
+# QUERIES (O(log n))
+# ======================================================
+def percentile_of(score, institution=None, batch=None):
+    """Share of students in the scope averaging strictly below `score` (0–100)."""
+    dist = get_distribution(institution, batch)
+    below = bisect_left(dist["scores"], score or 0)
+    return int((below / max(dist["total"], 1)) * 100)
@@ -0,0 +1,273 @@
+# core/utils_readiness_series.py
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from core.models import InstitutionMembership, ReadinessHistory, ReadinessRollup, SkillProfile
+from core.utils_checkpoint import advance_checkpoint, get_checkpoint
+
+
+CHECKPOINT_NAME = "readiness_rollups"
+
+PERIODS = ("day", "week", "month")
+
+# Downsampling: raw rows are dropped once folded and older than this;
+# daily rollups after READINESS_DAILY_RETENTION_DAYS. Weekly and monthly
+# rollups are kept for good. None disables a step.
+READINESS_RAW_RETENTION_DAYS = getattr(settings, "READINESS_RAW_RETENTION_DAYS", 90)
+READINESS_DAILY_RETENTION_DAYS = getattr(settings, "READINESS_DAILY_RETENTION_DAYS", 400)
+
+# Chart windows up to this many days use daily points, then weekly, then monthly
+DAILY_SERIES_MAX_DAYS = 62
+WEEKLY_SERIES_MAX_DAYS = 366
+
+
+# ======================================================
+# PERIODS
+# ======================================================
+def period_start(day, period):
+    if period == "week":
+        return day - timedelta(days=day.weekday())
+    if period == "month":
+        return day.replace(day=1)
+    return day
+
+
+def pick_period(days):
+    if days <= DAILY_SERIES_MAX_DAYS:
+        return "day"
+    if days <= WEEKLY_SERIES_MAX_DAYS:
+        return "week"
+    return "month"
+
+
+# ======================================================
+# DAILY SNAPSHOT (BATCH JOB)
+# ======================================================
+def snapshot_readiness(day=None, batch_size=5000):
+    """
+    Records every user's current SkillProfile readiness as their
+    ReadinessHistory row for `day` (today by default), in one keyset
+    pass with bulk INSERTs. The unique (user, day) constraint makes a
+    rerun a no-op. Returns rows inserted.
+    """
+    day = day or timezone.localdate()
+    before = ReadinessHistory.objects.filter(day=day).count()
+    last_id = 0
+
+    while True:
+        batch = list(
+            SkillProfile.objects
+            .filter(user_id__gt=last_id)
+            .order_by("user_id")
+            .values_list("user_id", "readiness_score")[:batch_size]
+        )
+        if not batch:
+            break
+
+        ReadinessHistory.objects.bulk_create(
+            [ReadinessHistory(user_id=uid, readiness_score=score, day=day) for uid, score in batch],
+            ignore_conflicts=True,
+        )
+        last_id = batch[-1][0]
+
+    return ReadinessHistory.objects.filter(day=day).count() - before
+
+
+# ======================================================
+# RAW HISTORY → ROLLUPS
+# ======================================================
+def aggregate_readiness(batch_size=5000):
+    """
+    Folds every ReadinessHistory row newer than the checkpoint into the
+    day/week/month rollups of its user and of the user's institutions,
+    then applies retention. Each batch commits with the checkpoint, so
+    no row is counted twice. Returns the number of raw rows processed.
+    """
+    processed = 0
+
+    while True:
+        with transaction.atomic():
+            checkpoint = get_checkpoint(CHECKPOINT_NAME, lock=True)
+
+            batch = list(
+                ReadinessHistory.objects
+                .filter(id__gt=checkpoint.last_id)
+                .order_by("id")
+                .values_list("id", "user_id", "readiness_score", "day")
+                [:batch_size]
+            )
+
+            if not batch:
+                break
+
+            _apply_batch(batch)
+            advance_checkpoint(checkpoint, batch[-1][0])
+
+        processed += len(batch)
+
+        if len(batch) < batch_size:
+            break
+
+    prune_readiness_history()
+    return processed
+
+
+def _apply_batch(batch):
+    user_ids = {user_id for _, user_id, _, _ in batch}
+
+    institutions = defaultdict(list)
+    for user_id, institution_id in (
+        InstitutionMembership.objects
+        .filter(user_id__in=user_ids, role="student")
+        .values_list("user_id", "institution_id")
+    ):
+        institutions[user_id].append(institution_id)
+
+    # (user_id, institution_id, period, period_start) → [samples, sum, min, max]
+    deltas = {}
+    for _, user_id, score, day in batch:
+        scopes = [(user_id, None)] + [(None, i) for i in institutions[user_id]]
+
+        for period in PERIODS:
+            start = period_start(day, period)
+            for scope_user, scope_institution in scopes:
+                key = (scope_user, scope_institution, period, start)
+                d = deltas.get(key)
+                if d is None:
+                    deltas[key] = [1, score, score, score]
+                else:
+                    d[0] += 1
+                    d[1] += score
+                    d[2] = min(d[2], score)
+                    d[3] = max(d[3], score)
+
+    starts = {key[3] for key in deltas}
+    institution_ids = {i for ids in institutions.values() for i in ids}
+
+    existing = {
+        (r.user_id, r.institution_id, r.period, r.period_start): r
+        for r in (
+            ReadinessRollup.objects
+            .select_for_update()
+            .filter(
+                Q(user_id__in=user_ids) | Q(institution_id__in=institution_ids),
+                period_start__in=starts,
+            )
+        )
+    }
+
+    to_update, to_create = [], []
+    now = timezone.now()
+
+    for key, (samples, total, low, high) in deltas.items():
+        rollup = existing.get(key)
+        if rollup is None:
+            user_id, institution_id, period, start = key
+            to_create.append(ReadinessRollup(
+                user_id=user_id,
+                institution_id=institution_id,
+                period=period,
+                period_start=start,
+                samples=samples,
+                score_sum=total,
+                score_min=low,
+                score_max=high,
+            ))
+        else:
+            rollup.samples += samples
+            rollup.score_sum += total
+            rollup.score_min = low if rollup.score_min is None else min(rollup.score_min, low)
+            rollup.score_max = high if rollup.score_max is None else max(rollup.score_max, high)
+            rollup.updated_at = now
+            to_update.append(rollup)
+
+    if to_update:
+        ReadinessRollup.objects.bulk_update(
+            to_update, ["samples", "score_sum", "score_min", "score_max", "updated_at"], batch_size=1000
+        )
+    if to_create:
+        ReadinessRollup.objects.bulk_create(to_create, batch_size=1000)
+
+
+def prune_readiness_history(today=None):
+    """
+    Downsampling: drops raw rows already folded into rollups and older
+    than the raw retention, then daily rollups past theirs.
+    Returns (raw rows deleted, daily rollups deleted).
+    """
+    today = today or timezone.localdate()
+    raw = daily = 0
+
+    if READINESS_RAW_RETENTION_DAYS is not None:
+        checkpoint = get_checkpoint(CHECKPOINT_NAME)
+        raw, _ = ReadinessHistory.objects.filter(
+            id__lte=checkpoint.last_id,
+            day__lt=today - timedelta(days=READINESS_RAW_RETENTION_DAYS),
+        ).delete()
+
+    if READINESS_DAILY_RETENTION_DAYS is not None:
+        daily, _ = ReadinessRollup.objects.filter(
+            period="day",
+            period_start__lt=today - timedelta(days=READINESS_DAILY_RETENTION_DAYS),
+        ).delete()
+
+    return raw, daily
+
+
+# ======================================================
+# READ API (CHARTS)
+# ======================================================
+def readiness_series(user=None, institution=None, days=30, period=None, today=None, user_ids=None):
+    """
+    Average readiness per period for the last `days` days, oldest first:
+        [{"start": date, "avg_readiness": float, "samples": int}]
+    The period (day / week / month) follows the window unless given.
+    With `user_ids` (a list or subquery) the users' own rollups are
+    summed per period — used for cohorts narrower than an institution.
+    """
+    today = today or timezone.localdate()
+    period = period or pick_period(days)
+    since = period_start(today - timedelta(days=days - 1), period)
+
+    rollups = ReadinessRollup.objects.filter(period=period, period_start__gte=since)
+    if user_ids is not None:
+        rows = (
+            rollups
+            .filter(user_id__in=user_ids, institution__isnull=True)
+            .values("period_start")
+            .annotate(n=Sum("samples"), total=Sum("score_sum"))
+            .order_by("period_start")
+            .values_list("period_start", "n", "total")
+        )
+    else:
+        rows = (
+            rollups
+            .filter(user=user, institution=institution)
+            .order_by("period_start")
+            .values_list("period_start", "samples", "score_sum")
+        )
+
+    return [
+        {"start": start, "avg_readiness": round(total / samples, 2), "samples": samples}
+        for start, samples, total in rows
+        if samples
+    ]
+
+
+def readiness_average(start, end, user=None, institution=None):
+    """Sample-weighted average readiness over the days [start, end] (None if no data)."""
+    totals = ReadinessRollup.objects.filter(
+        user=user,
+        institution=institution,
+        period="day",
+        period_start__gte=start,
+        period_start__lte=end,
+    ).aggregate(total=Sum("score_sum"), n=Sum("samples"))
+
+    return totals["total"] / totals["n"] if totals["n"] else None
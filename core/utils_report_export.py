@@ -0,0 +1,333 @@
+# core/utils_report_export.py
+
+import hashlib
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import polars as pl
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from core.models import InstitutionMembership
+from core.utils_institution_analytics import get_institution_analytics
+
+
+# Bump when the report layout / columns change so stored files are rebuilt
+REPORT_LAYOUT_VERSION = 1
+
+# A queued/running job older than this is considered dead and restarted
+REPORT_JOB_TIMEOUT = getattr(settings, "REPORT_JOB_TIMEOUT", 60 * 60)
+
+# Rows fetched per DB round trip (and per progress update)
+REPORT_CHUNK_SIZE = 1000
+
+# Rows per PDF table; platypus splits long tables quadratically
+PDF_TABLE_ROWS = 40
+
+FORMATS = {
+    "pdf": "application/pdf",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# (column, header, source field)
+COLUMNS = [
+    ("username", "Student", "user__username"),
+    ("branch", "Branch", "branch"),
+    ("batch", "Batch", "batch"),
+    ("readiness_score", "Readiness", "user__skillprofile__readiness_score"),
+    ("technical_score", "Technical", "user__skillprofile__technical_score"),
+    ("communication_score", "Communication", "user__skillprofile__communication_score"),
+    ("behavior_score", "Behavior", "user__skillprofile__behavior_score"),
+    ("risk_level", "Risk", "user__skillprofile__risk_level"),
+    ("category", "Prediction", "user__placement_prediction__category"),
+    ("hire_probability", "Hire Prob.", "user__placement_prediction__hire_probability"),
+]
+
+SCHEMA = {
+    "username": pl.Utf8,
+    "branch": pl.Utf8,
+    "batch": pl.Utf8,
+    "readiness_score": pl.Float64,
+    "technical_score": pl.Float64,
+    "communication_score": pl.Float64,
+    "behavior_score": pl.Float64,
+    "risk_level": pl.Utf8,
+    "category": pl.Utf8,
+    "hire_probability": pl.Float64,
+}
+
+# Columns printed in the PDF student tables
+PDF_COLUMNS = ["username", "batch", "readiness_score", "behavior_score", "risk_level", "category"]
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="report")
+
+
+# ======================================================
+# DATA VERSION / KEYS
+# ======================================================
+def _memberships(institution):
+    return InstitutionMembership.objects.filter(institution=institution, role="student")
+
+
+def report_version(institution):
+    """
+    Changes whenever a student joins/leaves or any student's profile or
+    prediction is updated — one aggregate query.
+    """
+    v = _memberships(institution).aggregate(
+        students=Count("id"),
+        last_member=Max("id"),
+        profiles=Max("user__skillprofile__last_updated"),
+        predictions=Max("user__placement_prediction__updated_at"),
+    )
+    raw = f"{REPORT_LAYOUT_VERSION}:{v['students']}:{v['last_member']}:{v['profiles']}:{v['predictions']}"
+    return hashlib.md5(raw.encode()).hexdigest()[:12], v["students"]
+
+
+def report_path(institution, fmt, version):
+    return f"reports/{institution.pk}/placement_{version}.{fmt}"
+
+
+def _job_key(institution, fmt, version):
+    return f"report:{institution.pk}:{fmt}:{version}"
+
+
+# ======================================================
+# ROW STREAM
+# ======================================================
+def iter_student_rows(institution):
+    """
+    Every student of the institution, branch by branch, best first.
+    One joined query streamed with iterator() — no per-row lookups.
+    """
+    return (
+        _memberships(institution)
+        .order_by("branch", "-user__skillprofile__readiness_score", "user_id")
+        .values_list(*[source for _, _, source in COLUMNS])
+        .iterator(chunk_size=REPORT_CHUNK_SIZE)
+    )
+
+
+def branch_breakdown(institution):
+    """Per-branch counts, average readiness and bands — one grouped query."""
+    readiness = "user__skillprofile__readiness_score"
+    return list(
+        _memberships(institution)
+        .values("branch")
+        .annotate(
+            students=Count("id"),
+            avg_readiness=Avg(readiness),
+            not_ready=Count("id", filter=Q(**{f"{readiness}__lt": 40})),
+            moderate=Count("id", filter=Q(**{f"{readiness}__gte": 40, f"{readiness}__lt": 70})),
+            ready=Count("id", filter=Q(**{f"{readiness}__gte": 70})),
+        )
+        .order_by("branch")
+    )
+
+
+def _chunks(rows, on_progress):
+    chunk, done = [], 0
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == REPORT_CHUNK_SIZE:
+            done += len(chunk)
+            yield chunk
+            on_progress(done)
+            chunk = []
+    if chunk:
+        yield chunk
+        on_progress(done + len(chunk))
+
+
+# ======================================================
+# WRITERS
+# ======================================================
+def _dataframe(institution, on_progress):
+    frames = [
+        pl.DataFrame(chunk, schema=SCHEMA, orient="row")
+        for chunk in _chunks(iter_student_rows(institution), on_progress)
+    ]
+    return pl.concat(frames) if frames else pl.DataFrame(schema=SCHEMA)
+
+
+def write_csv(institution, on_progress):
+    buffer = io.BytesIO()
+    _dataframe(institution, on_progress).write_csv(buffer)
+    return buffer.getvalue()
+
+
+def write_parquet(institution, on_progress):
+    buffer = io.BytesIO()
+    _dataframe(institution, on_progress).write_parquet(buffer)
+    return buffer.getvalue()
+
+
+def _fmt(value):
+    if value is None:
+        return "—"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return value
+
+
+def _table(data, widths=None):
+    table = Table(data, colWidths=widths, repeatRows=1)
+    table.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("ALIGN", (1, 1), (-1, -1), "CENTER"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+    ]))
+    return table
+
+
+def write_pdf(institution, on_progress):
+    styles = getSampleStyleSheet()
+    analytics = get_institution_analytics(institution, refresh=True)
+    branches = branch_breakdown(institution)
+
+    elements = [
+        Paragraph(f"<b>{institution.name} - Placement Analytics Report</b>", styles["Title"]),
+        Spacer(1, 0.3 * inch),
+        Paragraph(f"Generated on: {timezone.now().strftime('%d %b %Y')}", styles["Normal"]),
+        Spacer(1, 0.3 * inch),
+        Paragraph(f"<b>Average Readiness:</b> {round(analytics['avg_readiness'], 2)}%", styles["Heading2"]),
+        Spacer(1, 0.2 * inch),
+        _table([
+            ["Category", "Student Count"],
+            ["0–40% (Not Ready)", analytics["not_ready"]],
+            ["40–70% (Moderate)", analytics["moderate"]],
+            ["70–100% (Placement Ready)", analytics["ready"]],
+        ], widths=[3 * inch, 2 * inch]),
+        Spacer(1, 0.4 * inch),
+        Paragraph("<b>Branch Breakdown</b>", styles["Heading2"]),
+        Spacer(1, 0.2 * inch),
+        _table(
+            [["Branch", "Students", "Avg Readiness", "Not Ready", "Moderate", "Ready"]]
+            + [
+                [b["branch"] or "—", b["students"], _fmt(b["avg_readiness"]),
+                 b["not_ready"], b["moderate"], b["ready"]]
+                for b in branches
+            ]
+        ),
+        Spacer(1, 0.4 * inch),
+        Paragraph("<b>Weak Topic Clusters</b>", styles["Heading2"]),
+        Spacer(1, 0.2 * inch),
+    ]
+
+    for t in analytics["weak_topics"]:
+        elements.append(Paragraph(f"{t['topic']} — {t['student_count']} students weak", styles["Normal"]))
+
+    # -----------------------------
+    # Every student, one section per branch, in short tables
+    # -----------------------------
+    index = {name: i for i, (name, _, _) in enumerate(COLUMNS)}
+    header = [h for name, h, _ in COLUMNS if name in PDF_COLUMNS]
+    current_branch, rows = object(), []
+
+    def flush():
+        if rows:
+            elements.append(_table([header] + rows))
+            elements.append(Spacer(1, 0.1 * inch))
+            rows.clear()
+
+    for chunk in _chunks(iter_student_rows(institution), on_progress):
+        for row in chunk:
+            branch = row[index["branch"]]
+            if branch != current_branch:
+                flush()
+                current_branch = branch
+                elements.append(PageBreak())
+                elements.append(Paragraph(f"<b>Branch: {branch or '—'}</b>", styles["Heading2"]))
+
+            rows.append([_fmt(row[index[name]]) for name in PDF_COLUMNS])
+            if len(rows) == PDF_TABLE_ROWS:
+                flush()
+    flush()
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4).build(elements)
+    return buffer.getvalue()
+
+
+WRITERS = {
+    "pdf": write_pdf,
+    "csv": write_csv,
+    "parquet": write_parquet,
+}
+
+
+# ======================================================
+# BACKGROUND JOB
+# ======================================================
+def _run(institution, fmt, version, total):
+    key = _job_key(institution, fmt, version)
+    path = report_path(institution, fmt, version)
+
+    def on_progress(done):
+        # The last few percent are the document build / upload
+        percent = int(90 * done / total) if total else 90
+        cache.set(key, {"status": "running", "progress": percent}, REPORT_JOB_TIMEOUT)
+
+    try:
+        content = WRITERS[fmt](institution, on_progress)
+        if not default_storage.exists(path):
+            default_storage.save(path, ContentFile(content))
+        _prune(institution, fmt, keep=path)
+        cache.set(key, {"status": "done", "progress": 100, "file": path}, REPORT_JOB_TIMEOUT)
+    except Exception as e:
+        print("⚠️ Report export failed:", e)
+        cache.set(key, {"status": "failed", "progress": 0, "error": str(e)}, REPORT_JOB_TIMEOUT)
+    finally:
+        connection.close()
+
+
+def _prune(institution, fmt, keep):
+    """Drops this institution's older exports of the same format."""
+    folder = f"reports/{institution.pk}"
+    try:
+        _, files = default_storage.listdir(folder)
+    except FileNotFoundError:
+        return
+    for name in files:
+        path = f"{folder}/{name}"
+        if path != keep and name.endswith(f".{fmt}"):
+            default_storage.delete(path)
+
+
+def start_report(institution, fmt, retry=False):
+    """
+    Current export state for (institution, format), starting a build if
+    the data changed since the stored file:
+        {"status": "done" | "queued" | "running" | "failed", "progress": 0–100, ...}
+    A failed build is only restarted with retry=True.
+    """
+    version, total = report_version(institution)
+    path = report_path(institution, fmt, version)
+
+    if default_storage.exists(path):
+        return {"status": "done", "progress": 100, "file": path}
+
+    key = _job_key(institution, fmt, version)
+    job = cache.get(key)
+    if retry and job and job["status"] == "failed":
+        cache.delete(key)
+
+    # cache.add is atomic: only one request schedules the build
+    queued = {"status": "queued", "progress": 0}
+    if cache.add(key, queued, REPORT_JOB_TIMEOUT):
+        _executor.submit(_run, institution, fmt, version, total)
+        return queued
+
+    return cache.get(key) or queued
@@ -0,0 +1,250 @@
+# core/utils_rollups.py
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Sum
+from django.utils import timezone
+
+from core.models import (
+    DailyUsageRollup,
+    InstitutionMembership,
+    TopicImprovementRollup,
+    TopicStat,
+    UsageLog,
+    UserDailyActivity,
+)
+from core.utils_checkpoint import get_checkpoint, advance_checkpoint
+
+
+CHECKPOINT_NAME = "usage_rollups"
+
+# (user, day, action) rows are only needed while a day can still receive
+# events; older ones are pruned after each run
+ACTIVITY_RETENTION_DAYS = 2
+
+ALL = DailyUsageRollup.ALL_ACTIONS
+
+
+# ======================================================
+# USAGE LOG → DAILY USAGE ROLLUPS
+# ======================================================
+def aggregate_usage(batch_size=2000):
+    """
+    Folds every UsageLog row newer than the checkpoint into
+    DailyUsageRollup (platform + each of the user's institutions,
+    per action and for all actions). Each batch is one transaction
+    with the checkpoint, so no event is counted twice.
+    Returns the number of log rows processed.
+    """
+    processed = 0
+    latest_day = None
+
+    while True:
+        with transaction.atomic():
+            checkpoint = get_checkpoint(CHECKPOINT_NAME, lock=True)
+
+            batch = list(
+                UsageLog.objects
+                .filter(id__gt=checkpoint.last_id)
+                .order_by("id")
+                .values_list("id", "user_id", "action", "created_at")
+                [:batch_size]
+            )
+
+            if not batch:
+                break
+
+            day = _apply_usage_batch(batch)
+            latest_day = max(latest_day, day) if latest_day else day
+            advance_checkpoint(checkpoint, batch[-1][0])
+
+        processed += len(batch)
+
+        if len(batch) < batch_size:
+            break
+
+    if latest_day:
+        UserDailyActivity.objects.filter(
+            day__lt=latest_day - timedelta(days=ACTIVITY_RETENTION_DAYS)
+        ).delete()
+
+    return processed
+
+
+def _apply_usage_batch(batch):
+    """Returns the newest day seen in the batch."""
+    rows = [
+        (user_id, action, timezone.localdate(created_at))
+        for _, user_id, action, created_at in batch
+    ]
+    user_ids = {r[0] for r in rows}
+    days = {r[2] for r in rows}
+
+    institutions = defaultdict(list)
+    for user_id, institution_id in (
+        InstitutionMembership.objects
+        .filter(user_id__in=user_ids)
+        .values_list("user_id", "institution_id")
+    ):
+        institutions[user_id].append(institution_id)
+
+    # -----------------------------
+    # Distinct users: only first sightings count
+    # -----------------------------
+    seen = set(
+        UserDailyActivity.objects
+        .filter(user_id__in=user_ids, day__in=days)
+        .values_list("user_id", "day", "action")
+    )
+
+    events = defaultdict(int)
+    active = defaultdict(int)
+    first_seen = []
+
+    for user_id, action, day in rows:
+        scopes = [None, *institutions[user_id]]
+
+        for key_action in (action, ALL):
+            for scope in scopes:
+                events[(day, scope, key_action)] += 1
+
+            activity = (user_id, day, key_action)
+            if activity not in seen:
+                seen.add(activity)
+                first_seen.append(UserDailyActivity(user_id=user_id, day=day, action=key_action))
+                for scope in scopes:
+                    active[(day, scope, key_action)] += 1
+
+    UserDailyActivity.objects.bulk_create(first_seen, ignore_conflicts=True)
+
+    # -----------------------------
+    # Apply deltas to the rollup rows
+    # -----------------------------
+    existing = {
+        (r.day, r.institution_id, r.action): r
+        for r in DailyUsageRollup.objects.select_for_update().filter(day__in=days)
+    }
+
+    to_update, to_create = [], []
+    now = timezone.now()
+
+    for key, n_events in events.items():
+        rollup = existing.get(key)
+        if rollup is None:
+            day, institution_id, action = key
+            to_create.append(DailyUsageRollup(
+                day=day,
+                institution_id=institution_id,
+                action=action,
+                events=n_events,
+                active_users=active[key],
+            ))
+        else:
+            rollup.events += n_events
+            rollup.active_users += active[key]
+            rollup.updated_at = now
+            to_update.append(rollup)
+
+    if to_update:
+        DailyUsageRollup.objects.bulk_update(to_update, ["events", "active_users", "updated_at"])
+    if to_create:
+        DailyUsageRollup.objects.bulk_create(to_create)
+
+    return max(days)
+
+
+# ======================================================
+# TOPIC STAT → TOPIC IMPROVEMENT ROLLUPS
+# ======================================================
+def aggregate_topic_improvement(full=False):
+    """
+    Re-aggregates only the topics with a TopicStat attempted since the
+    previous run (all topics with full=True). TopicStat is bounded by
+    users × topics, and each run touches just the active topics.
+    Returns the number of topic rollups written.
+    """
+    started = timezone.now()
+    stats = TopicStat.objects.all()
+
+    if not full:
+        since = TopicImprovementRollup.objects.aggregate(t=Max("updated_at"))["t"]
+        if since is not None:
+            touched = (
+                TopicStat.objects
+                .filter(last_attempted__gte=since)
+                .values_list("book_id", "topic")
+                .distinct()
+            )
+            touched = list(touched)
+            if not touched:
+                return 0
+            # Superset of the touched (book, topic) pairs — every group is still exact
+            stats = stats.filter(
+                book_id__in={b for b, _ in touched},
+                topic__in={t for _, t in touched},
+            )
+
+    groups = (
+        stats
+        .values("book_id", "topic")
+        .annotate(n=Count("id"), total=Sum("improvement_rate"), avg=Avg("improvement_rate"))
+    )
+
+    rows = [
+        TopicImprovementRollup(
+            book_id=g["book_id"],
+            topic=g["topic"],
+            students=g["n"],
+            improvement_sum=g["total"] or 0.0,
+            avg_improvement=g["avg"] or 0.0,
+            updated_at=started,
+        )
+        for g in groups
+    ]
+
+    TopicImprovementRollup.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["book", "topic"],
+        update_fields=["students", "improvement_sum", "avg_improvement", "updated_at"],
+        batch_size=1000,
+    )
+    return len(rows)
+
+
+# ======================================================
+# READ API (DASHBOARDS)
+# ======================================================
+def daily_active_users(day=None, institution=None, action=ALL):
+    row = (
+        DailyUsageRollup.objects
+        .filter(
+            day=day or timezone.localdate(),
+            institution=institution,
+            action=action,
+        )
+        .values_list("active_users", flat=True)
+        .first()
+    )
+    return row or 0
+
+
+def usage_by_day(institution=None, days=30, action=ALL):
+    """[(day, events, active_users)] oldest → newest for the last `days` days."""
+    since = timezone.localdate() - timedelta(days=days - 1)
+    return list(
+        DailyUsageRollup.objects
+        .filter(institution=institution, action=action, day__gte=since)
+        .order_by("day")
+        .values_list("day", "events", "active_users")
+    )
+
+
+def platform_avg_improvement():
+    """Same value as Avg(TopicStat.improvement_rate), read from the rollups."""
+    totals = TopicImprovementRollup.objects.aggregate(
+        total=Sum("improvement_sum"), n=Sum("students")
+    )
+    return (totals["total"] or 0) / totals["n"] if totals["n"] else 0
@@ -0,0 +1,348 @@
+# core/utils_running_stats.py
+
+import math
+from collections import deque
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from core.models import (
+    InterviewResponse,
+    InterviewSession,
+    QuizAttempt,
+    TopicStat,
+    UserRunningStats,
+)
+
+
+# SkillProfile consistency looks at this many latest quiz scores
+RECENT_WINDOW = 5
+
+USER_STATS_FIELDS = [
+    "quiz_count",
+    "quiz_score_mean",
+    "recent_scores",
+    "topic_count",
+    "mastery_sum",
+]
+
+SESSION_STATS_FIELDS = [
+    "total_questions",
+    "average_score",
+    "score_m2",
+    "avg_answer_length",
+    "avg_time_taken",
+    "time_m2",
+    "first_score",
+    "score_index_sum",
+    "confidence_sum",
+    "confidence_index_sum",
+]
+
+
+# ======================================================
+# WELFORD PRIMITIVES
+# ======================================================
+def welford_push(count, mean, m2, x):
+    """Add one observation. Returns (count, mean, m2)."""
+    count += 1
+    delta = x - mean
+    mean += delta / count
+    m2 += delta * (x - mean)
+    return count, mean, m2
+
+
+def mean_push(count, mean, x):
+    """Add one observation to a running mean. Returns (count, mean)."""
+    count += 1
+    return count, mean + (x - mean) / count
+
+
+def pstdev_from(count, m2):
+    """Population standard deviation from Welford state."""
+    return math.sqrt(m2 / count) if count else 0.0
+
+
+# ======================================================
+# PER-USER STATS (QUIZ SCORES + TOPIC MASTERY)
+# ======================================================
+def _user_stats_from_history(user_id):
+    stats = UserRunningStats(user_id=user_id)
+    recent = deque(maxlen=RECENT_WINDOW)
+
+    scores = (
+        QuizAttempt.objects
+        .filter(user_id=user_id, score__isnull=False)
+        .order_by("submitted_at", "id")
+        .values_list("score", flat=True)
+    )
+    for score in scores.iterator():
+        stats.quiz_count, stats.quiz_score_mean = mean_push(
+            stats.quiz_count, stats.quiz_score_mean, score
+        )
+        recent.append(score)
+
+    topics = TopicStat.objects.filter(user_id=user_id).aggregate(
+        n=Count("id"), total=Sum("mastery_score")
+    )
+    stats.recent_scores = list(recent)
+    stats.topic_count = topics["n"] or 0
+    stats.mastery_sum = topics["total"] or 0.0
+    return stats
+
+
+def _upsert_user_stats(rows):
+    UserRunningStats.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=USER_STATS_FIELDS,
+    )
+
+
+def rebuild_user_stats(user_id):
+    """Full rebuild for one user from QuizAttempt / TopicStat history."""
+    _upsert_user_stats([_user_stats_from_history(user_id)])
+    return UserRunningStats.objects.get(user_id=user_id)
+
+
+def get_user_stats(user, lock=False):
+    """
+    Returns (stats, rebuilt). A missing row is rebuilt from history,
+    which already includes the event the caller is about to record.
+    """
+    qs = UserRunningStats.objects.filter(user_id=getattr(user, "pk", user))
+    if lock:
+        qs = qs.select_for_update()
+
+    stats = qs.first()
+    if stats is not None:
+        return stats, False
+
+    return rebuild_user_stats(getattr(user, "pk", user)), True
+
+
+def record_quiz_result(user, score, mastery_delta=0.0, new_topic=False):
+    """
+    O(1) update after a quiz submission. Call inside the submission
+    transaction, after the QuizAttempt / TopicStat writes.
+    """
+    stats, rebuilt = get_user_stats(user, lock=True)
+    if rebuilt:
+        return stats
+
+    stats.quiz_count, stats.quiz_score_mean = mean_push(
+        stats.quiz_count, stats.quiz_score_mean, score
+    )
+    stats.recent_scores = (list(stats.recent_scores or []) + [score])[-RECENT_WINDOW:]
+
+    if new_topic:
+        stats.topic_count += 1
+    stats.mastery_sum += mastery_delta
+
+    stats.save(update_fields=USER_STATS_FIELDS + ["updated_at"])
+    return stats
+
+
+# ======================================================
+# PER-SESSION STATS (INTERVIEW RESPONSES)
+# ======================================================
+def _reset_session(session):
+    session.total_questions = 0
+    session.average_score = 0.0
+    session.score_m2 = 0.0
+    session.avg_answer_length = 0.0
+    session.avg_time_taken = 0.0
+    session.time_m2 = 0.0
+    session.first_score = None
+    session.score_index_sum = 0.0
+    session.confidence_sum = 0.0
+    session.confidence_index_sum = 0.0
+
+
+def _push_response(session, total_score, answer_length, time_taken, confidence):
+    n = session.total_questions
+    time_taken = float(time_taken or 0.0)
+    total_score = float(total_score or 0.0)
+    confidence = float(confidence or 0.0)
+
+    _, session.average_score, session.score_m2 = welford_push(
+        n, session.average_score, session.score_m2, total_score
+    )
+    _, session.avg_time_taken, session.time_m2 = welford_push(
+        n, session.avg_time_taken, session.time_m2, time_taken
+    )
+    session.avg_answer_length += (answer_length - session.avg_answer_length) / (n + 1)
+
+    if session.first_score is None:
+        session.first_score = total_score
+
+    # Answer index i = n (0-based)
+    session.score_index_sum += n * total_score
+    session.confidence_sum += confidence
+    session.confidence_index_sum += n * confidence
+
+    session.total_questions = n + 1
+
+
+def rebuild_session_stats(session):
+    """Recompute running state from the session's responses (caller saves)."""
+    _reset_session(session)
+
+    rows = (
+        InterviewResponse.objects
+        .filter(session=session)
+        .order_by("created_at", "id")
+        .values_list("total_score", "answer_length", "time_taken_seconds", "confidence_score")
+    )
+    for row in rows.iterator():
+        _push_response(session, *row)
+
+    return session
+
+
+def session_stats_ready(session):
+    return session.total_questions == 0 or session.first_score is not None
+
+
+def _session_update(total_score, answer_length, time_taken, confidence, complete_at=None):
+    """
+    UPDATE kwargs that push one response into the session's running
+    state. Every right-hand side reads the row's pre-update values, so
+    the whole step is one atomic statement — no read-modify-write.
+    """
+    n = F("total_questions")
+    score_delta = total_score - F("average_score")
+    time_delta = time_taken - F("avg_time_taken")
+
+    update = {
+        "total_questions": n + 1,
+        "average_score": F("average_score") + score_delta / (n + 1.0),
+        "score_m2": F("score_m2") + score_delta * score_delta * n / (n + 1.0),
+        "avg_time_taken": F("avg_time_taken") + time_delta / (n + 1.0),
+        "time_m2": F("time_m2") + time_delta * time_delta * n / (n + 1.0),
+        "avg_answer_length": F("avg_answer_length") + (answer_length - F("avg_answer_length")) / (n + 1.0),
+        "first_score": Coalesce(F("first_score"), Value(total_score)),
+        "score_index_sum": F("score_index_sum") + n * total_score,
+        "confidence_sum": F("confidence_sum") + confidence,
+        "confidence_index_sum": F("confidence_index_sum") + n * confidence,
+    }
+
+    if complete_at is not None:
+        update["completed"] = Case(
+            When(total_questions__gte=complete_at - 1, then=Value(True)),
+            default=F("completed"),
+        )
+
+    return update
+
+
+def record_interview_response(session, response, complete_at=None):
+    """
+    Folds one new response into the session aggregates with a single
+    F-expression UPDATE, so parallel answers never overwrite each
+    other. With `complete_at`, the same statement marks the session
+    completed once it reaches that many answers. Sessions predating
+    running stats are rebuilt once under a row lock. The passed
+    session is refreshed with the stored values.
+    """
+    if not session_stats_ready(session):
+        with transaction.atomic():
+            locked = InterviewSession.objects.select_for_update().get(pk=session.pk)
+            rebuild_session_stats(locked)
+            if complete_at is not None and locked.total_questions >= complete_at:
+                locked.completed = True
+            locked.save(update_fields=SESSION_STATS_FIELDS + ["completed"])
+    else:
+        InterviewSession.objects.filter(pk=session.pk).update(
+            **_session_update(
+                float(response.total_score or 0.0),
+                float(response.answer_length or 0),
+                float(response.time_taken_seconds or 0.0),
+                float(response.confidence_score or 0.0),
+                complete_at=complete_at,
+            )
+        )
+
+    session.refresh_from_db(fields=SESSION_STATS_FIELDS + ["completed"])
+    return session
+
+
+# ======================================================
+# BACKFILL (management command: rebuild_running_stats)
+# ======================================================
+def backfill_user_stats(batch_size=500):
+    """Single ordered pass over QuizAttempt; returns rows written."""
+    mastery = {
+        row["user_id"]: row
+        for row in (
+            TopicStat.objects
+            .values("user_id")
+            .annotate(n=Count("id"), total=Sum("mastery_score"))
+        )
+    }
+
+    states = {}
+    scores = (
+        QuizAttempt.objects
+        .filter(user__isnull=False, score__isnull=False)
+        .order_by("user_id", "submitted_at", "id")
+        .values_list("user_id", "score")
+    )
+    for user_id, score in scores.iterator(chunk_size=2000):
+        st = states.get(user_id)
+        if st is None:
+            st = states[user_id] = [0, 0.0, deque(maxlen=RECENT_WINDOW)]
+        st[0], st[1] = mean_push(st[0], st[1], score)
+        st[2].append(score)
+
+    rows = []
+    written = 0
+
+    for user_id in set(states) | set(mastery):
+        count, mean, recent = states.get(user_id, (0, 0.0, ()))
+        topic = mastery.get(user_id, {})
+
+        rows.append(UserRunningStats(
+            user_id=user_id,
+            quiz_count=count,
+            quiz_score_mean=mean,
+            recent_scores=list(recent),
+            topic_count=topic.get("n") or 0,
+            mastery_sum=topic.get("total") or 0.0,
+        ))
+
+        if len(rows) >= batch_size:
+            _upsert_user_stats(rows)
+            written += len(rows)
+            rows = []
+
+    if rows:
+        _upsert_user_stats(rows)
+        written += len(rows)
+
+    return written
+
+
+def backfill_session_stats(batch_size=500):
+    """Single ordered pass over InterviewResponse; returns sessions written."""
+    sessions = InterviewSession.objects.in_bulk()
+    for session in sessions.values():
+        _reset_session(session)
+
+    responses = (
+        InterviewResponse.objects
+        .order_by("session_id", "created_at", "id")
+        .values_list(
+            "session_id", "total_score", "answer_length",
+            "time_taken_seconds", "confidence_score",
+        )
+    )
+    for session_id, *row in responses.iterator(chunk_size=2000):
+        _push_response(sessions[session_id], *row)
+
+    InterviewSession.objects.bulk_update(
+        list(sessions.values()), SESSION_STATS_FIELDS, batch_size=batch_size
+    )
+    return len(sessions)
@@ -1,14 +1,10 @@
 # core/utils_skill_engine.py
 
-from django.db.models import Avg
 from django.utils import timezone
 from statistics import pstdev
 
-from .models import (
-    TopicStat,
-    QuizAttempt,
-    SkillProfile,
-)
+from .models import SkillProfile
+from .utils_running_stats import get_user_stats
 
 
 # =========================================================
@@ -16,26 +12,21 @@ from .models import (
 # =========================================================
 def recompute_skill_profile(user):
 
+    # Running aggregates — O(1), no history scan
+    stats, _ = get_user_stats(user)
+
     # ----------------------------
     # 1️⃣ TECHNICAL SCORE
     # ----------------------------
     technical = (
-        TopicStat.objects
-        .filter(user=user)
-        .aggregate(avg=Avg("mastery_score"))["avg"] or 0
+        stats.mastery_sum / stats.topic_count
+        if stats.topic_count else 0
     )
 
     # ----------------------------
     # 2️⃣ ACCURACY SCORE
     # ----------------------------
-    attempts = QuizAttempt.objects.filter(
-        user=user,
-        score__isnull=False
-    )
-
-    accuracy = (
-        attempts.aggregate(avg=Avg("score"))["avg"] or 0
-    ) if attempts.exists() else 0
+    accuracy = stats.quiz_score_mean if stats.quiz_count else 0
 
     # ----------------------------
     # Fetch existing profile first
@@ -51,10 +42,7 @@ def recompute_skill_profile(user):
     # ----------------------------
     # 4️⃣ CONSISTENCY SCORE
     # ----------------------------
-    last_five = list(
-        attempts.order_by("-submitted_at")
-        .values_list("score", flat=True)[:5]
-    )
+    last_five = stats.recent_scores or []
 
     if len(last_five) >= 2:
         deviation = pstdev(last_five)
@@ -90,24 +78,7 @@ def recompute_skill_profile(user):
     profile.last_updated = timezone.now()
     profile.save()
 
-
-
-    from core.models import ReadinessHistory
-
-# Only create one entry per day
-    today = timezone.now().date()
-
-    already_logged = ReadinessHistory.objects.filter(
-    user=user,
-    recorded_at__date=today).exists()
-
-    if not already_logged:
-        ReadinessHistory.objects.create(
-        user=user,
-        readiness_score=profile.readiness_score
-    )
-
-
-
+    # Readiness history is snapshotted by the daily batch job
+    # (snapshot_readiness), never on the request path
     return profile
 
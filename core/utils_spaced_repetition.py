@@ -0,0 +1,152 @@
+# core/utils_spaced_repetition.py
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.models import TopicStat
+
+
+MIN_EASE = 1.3
+DEFAULT_EASE = 2.5
+
+
+# ======================================================
+# SM-2 CORE
+# ======================================================
+def score_to_quality(percent):
+    """Map a quiz score (0–100) to an SM-2 recall grade (0–5)."""
+    if percent is None:
+        return 3
+    if percent >= 90:
+        return 5
+    if percent >= 75:
+        return 4
+    if percent >= 60:
+        return 3
+    if percent >= 40:
+        return 2
+    if percent >= 20:
+        return 1
+    return 0
+
+
+def sm2(ease, interval, repetitions, quality):
+    """
+    One SM-2 step. Returns (ease, interval_days, repetitions).
+    Failed recall (quality < 3) restarts the ladder at 1 day.
+    """
+    if quality < 3:
+        repetitions = 0
+        interval = 1
+    else:
+        repetitions += 1
+        if repetitions == 1:
+            interval = 1
+        elif repetitions == 2:
+            interval = 6
+        else:
+            interval = max(1, round(interval * ease))
+
+    ease = ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02)
+    ease = max(MIN_EASE, ease)
+
+    return round(ease, 3), interval, repetitions
+
+
+def schedule_topic(stat):
+    """Apply one review to a TopicStat in memory (caller saves)."""
+    score = stat.last_review_score
+    if score is None:
+        score = stat.mastery_score
+
+    quality = score_to_quality(score)
+
+    stat.ease_factor, stat.interval_days, stat.repetitions = sm2(
+        stat.ease_factor or DEFAULT_EASE,
+        stat.interval_days,
+        stat.repetitions,
+        quality,
+    )
+
+    reviewed_on = (
+        timezone.localdate(stat.last_attempted)
+        if stat.last_attempted else timezone.localdate()
+    )
+
+    stat.due_at = reviewed_on + timedelta(days=stat.interval_days)
+    stat.review_pending = False
+    return stat
+
+
+# ======================================================
+# NIGHTLY INCREMENTAL JOB
+# ======================================================
+SCHEDULE_FIELDS = [
+    "ease_factor",
+    "interval_days",
+    "repetitions",
+    "due_at",
+    "review_pending",
+]
+
+
+def schedule_pending_reviews(batch_size=1000):
+    """
+    Reschedules only TopicStat rows touched since the last run
+    (review_pending=True), plus attempted rows that were never
+    scheduled. Returns the number of rows updated.
+    """
+    updated = 0
+
+    pending = (
+        Q(review_pending=True) |
+        Q(due_at__isnull=True, attempts__gt=0)
+    )
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                TopicStat.objects
+                .select_for_update()
+                .filter(pending)
+                .only(
+                    "id", "mastery_score", "last_attempted",
+                    "last_review_score", *SCHEDULE_FIELDS
+                )
+                .order_by("id")[:batch_size]
+            )
+
+            if not batch:
+                break
+
+            for stat in batch:
+                schedule_topic(stat)
+
+            TopicStat.objects.bulk_update(batch, SCHEDULE_FIELDS)
+
+        updated += len(batch)
+
+        if len(batch) < batch_size:
+            break
+
+    return updated
+
+
+# ======================================================
+# "DUE TODAY" QUERY
+# ======================================================
+def due_topics(user, limit=3, today=None):
+    """
+    Topics due for review, most overdue first.
+    Served by the (user, due_at) index.
+    """
+    today = today or timezone.localdate()
+
+    return list(
+        TopicStat.objects
+        .filter(user=user, due_at__lte=today)
+        .order_by("due_at", "mastery_score")[:limit]
+    )
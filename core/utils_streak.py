@@ -0,0 +1,175 @@
+# core/utils_streak.py
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, F, Q, Value, When
+from django.utils import timezone
+
+from core.models import DailyQuizAttempt, UserProfile
+
+
+# Longest streak the on-the-fly computation looks back for
+STREAK_LOOKBACK_DAYS = 365
+
+# Days shown in the dashboard bar chart
+HISTOGRAM_DAYS = 7
+
+# Maintain UserProfile.streak on every attempt (dashboard reads one column)
+STREAK_INCREMENTAL = getattr(settings, "STREAK_INCREMENTAL", True)
+
+
+# ======================================================
+# IN-MEMORY COMPUTATION
+# ======================================================
+def attempt_dates(user, since):
+    """Distinct attempt dates in [since, today] — one ranged query."""
+    return set(
+        DailyQuizAttempt.objects
+        .filter(user_id=getattr(user, "pk", user), date__gte=since)
+        .values_list("date", flat=True)
+    )
+
+
+def count_streak(dates, today):
+    """Consecutive days ending today (0 if today has no attempt)."""
+    streak = 0
+    day = today
+    while day in dates:
+        streak += 1
+        day -= timedelta(days=1)
+    return streak
+
+
+def streak_histogram(dates, today, days=HISTOGRAM_DAYS):
+    """Oldest → newest [{date, attempted}] for the bar chart."""
+    return [
+        {"date": str(day), "attempted": 1 if day in dates else 0}
+        for day in (today - timedelta(days=i) for i in range(days - 1, -1, -1))
+    ]
+
+
+# ======================================================
+# DASHBOARD
+# ======================================================
+def get_streak_summary(user, today=None):
+    """
+    {"streak", "histogram"} with a single DailyQuizAttempt query.
+    With STREAK_INCREMENTAL the streak comes from UserProfile and the
+    query only spans the histogram window.
+    """
+    today = today or timezone.now().date()
+
+    if STREAK_INCREMENTAL:
+        dates = attempt_dates(user, today - timedelta(days=HISTOGRAM_DAYS - 1))
+        profile = getattr(user, "profile", None)
+        streak = stored_streak(profile, today)
+    else:
+        dates = attempt_dates(user, today - timedelta(days=STREAK_LOOKBACK_DAYS - 1))
+        streak = count_streak(dates, today)
+
+    return {
+        "streak": streak,
+        "histogram": streak_histogram(dates, today),
+    }
+
+
+def stored_streak(profile, today=None):
+    """UserProfile.streak, or 0 once the run has lapsed (no attempt today)."""
+    today = today or timezone.now().date()
+    if profile is None or profile.last_streak_date != today:
+        return 0
+    return profile.streak
+
+
+# ======================================================
+# INCREMENTAL MAINTENANCE (DailyQuizAttempt post_save)
+# ======================================================
+def record_daily_attempt(user_id, day):
+    """
+    One conditional UPDATE: extends the run if the previous attempt was
+    the day before, otherwise restarts it at 1. Attempts recorded out of
+    order (backfills) fall back to a rebuild.
+    """
+    updated = (
+        UserProfile.objects
+        .filter(user_id=user_id)
+        .filter(Q(last_streak_date__isnull=True) | Q(last_streak_date__lt=day))
+        .update(
+            streak=Case(
+                When(last_streak_date=day - timedelta(days=1), then=F("streak") + 1),
+                default=Value(1),
+            ),
+            last_streak_date=day,
+        )
+    )
+
+    if not updated and UserProfile.objects.filter(
+        user_id=user_id, last_streak_date__gt=day
+    ).exists():
+        rebuild_streak(user_id)
+
+
+def _run_ending_at_latest(dates):
+    """(length, last_date) of the run ending at the newest of `dates` (newest first)."""
+    last = prev = None
+    streak = 0
+
+    for day in dates:
+        if prev is None:
+            last = day
+        elif day != prev - timedelta(days=1):
+            break
+        streak += 1
+        prev = day
+
+    return streak, last
+
+
+def rebuild_streak(user_id):
+    """Recompute the stored run from history (newest first, stops at the first gap)."""
+    dates = (
+        DailyQuizAttempt.objects
+        .filter(user_id=user_id)
+        .order_by("-date")
+        .values_list("date", flat=True)
+        .iterator(chunk_size=100)
+    )
+    streak, last = _run_ending_at_latest(dates)
+
+    UserProfile.objects.filter(user_id=user_id).update(
+        streak=streak, last_streak_date=last
+    )
+    return streak
+
+
+def rebuild_all_streaks(batch_size=500):
+    """Single ordered pass over DailyQuizAttempt; returns profiles written."""
+    rows = (
+        DailyQuizAttempt.objects
+        .order_by("user_id", "-date")
+        .values_list("user_id", "date")
+        .iterator(chunk_size=2000)
+    )
+
+    runs = {}
+    current_user, dates = None, []
+
+    for user_id, day in rows:
+        if user_id != current_user:
+            if current_user is not None:
+                runs[current_user] = _run_ending_at_latest(dates)
+            current_user, dates = user_id, []
+        dates.append(day)
+
+    if current_user is not None:
+        runs[current_user] = _run_ending_at_latest(dates)
+
+    rows = list(UserProfile.objects.only("id", "user_id", "streak", "last_streak_date"))
+    for profile in rows:
+        profile.streak, profile.last_streak_date = runs.get(profile.user_id, (0, None))
+
+    UserProfile.objects.bulk_update(
+        rows, ["streak", "last_streak_date"], batch_size=batch_size
+    )
+    return len(rows)
@@ -0,0 +1,208 @@
+# core/utils_submission.py
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Sum, Value, When
+from django.db.models.functions import Round
+from django.db.models.lookups import GreaterThan
+from django.utils import timezone
+
+from core.models import (
+    Book,
+    ProctorLog,
+    QuizAttempt,
+    QuizInstance,
+    TopicStat,
+    UsageLog,
+)
+from core.utils_item_stats import iter_graded_items, is_correct
+from core.utils_profile_queue import enqueue_profile_recompute
+from core.utils_running_stats import record_quiz_result
+
+
+# Mastery decays 5% when a topic is picked up after this long
+DECAY_AFTER_DAYS = 14
+DECAY_FACTOR = 0.95
+
+
+# ======================================================
+# GRADING (PURE — NO DB)
+# ======================================================
+def grade_quiz(quiz, answers):
+    """
+    Grades every auto-gradable item (flat list or mcq/fill sections).
+    Returns (correct, total, wrong_items).
+    """
+    correct = 0
+    total = 0
+    wrong = []
+
+    for section, position, q, given, _ in iter_graded_items(quiz.questions_json, answers):
+        total += 1
+        if is_correct(given, q.get("answer")):
+            correct += 1
+        else:
+            wrong.append({"question": q.get("question"), "topic": quiz.chapter})
+
+    return correct, total, wrong
+
+
+def generate_ai_tip(wrong_questions):
+    if not wrong_questions:
+        return "Excellent work! Keep practicing."
+
+    topics = set()
+    for q in wrong_questions:
+        if "topic" in q:
+            topics.add(q["topic"])
+
+    tips = [f"Revise core concepts of {t}" for t in topics]
+    return " | ".join(tips)
+
+
+# ======================================================
+# TOPIC STAT — SINGLE UPDATE STATEMENT
+# ======================================================
+def _topic_stat_update(correct, total, percent, now):
+    """
+    Column expressions for one UPDATE. Every F() reads the pre-update
+    row, so concurrent submits can't lose increments the way
+    read-modify-save does.
+    """
+    if total:
+        new_mastery = (F("correct") + correct) * 100.0 / ((F("attempts") + 1) * total)
+    else:
+        new_mastery = Value(0.0)
+
+    new_mastery = Case(
+        When(
+            last_attempted__lt=now - timedelta(days=DECAY_AFTER_DAYS),
+            then=new_mastery * DECAY_FACTOR,
+        ),
+        default=new_mastery,
+        output_field=FloatField(),
+    )
+
+    return {
+        "attempts": F("attempts") + 1,
+        "correct": F("correct") + correct,
+        "last_mastery_score": F("mastery_score"),
+        "improvement_rate": Round(new_mastery - F("mastery_score"), 2),
+        "last_improved_at": Case(
+            When(GreaterThan(new_mastery, F("mastery_score")), then=Value(now)),
+            default=F("last_improved_at"),
+        ),
+        "mastery_score": Round(new_mastery, 2),
+        "last_attempted": now,
+        # Picked up by the nightly spaced-repetition scheduler
+        "last_review_score": percent,
+        "review_pending": True,
+    }
+
+
+def update_topic_stat(user, book_id, topic, correct, total, percent, now):
+    """Returns (mastery_delta, created) for the running-stats layer."""
+    rows = TopicStat.objects.filter(user=user, book_id=book_id, topic=topic)
+    updated = rows.update(**_topic_stat_update(correct, total, percent, now))
+
+    if updated:
+        # last_mastery_score now holds the pre-update value
+        delta = rows.aggregate(
+            d=Sum(F("mastery_score") - F("last_mastery_score"))
+        )["d"] or 0.0
+        return delta, False
+
+    mastery = round(correct / total * 100, 2) if total else 0
+    TopicStat.objects.create(
+        user=user,
+        book_id=book_id,
+        topic=topic,
+        attempts=1,
+        correct=correct,
+        mastery_score=mastery,
+        improvement_rate=mastery,
+        last_improved_at=now if mastery > 0 else None,
+        last_attempted=now,
+        last_review_score=percent,
+        review_pending=True,
+    )
+    return mastery, True
+
+
+# ======================================================
+# SUBMISSION PIPELINE
+# ======================================================
+def record_submission(user, quiz, answers, instance_id=None, proctor_events=None):
+    """
+    Grades and persists one quiz submission in a single transaction:
+
+    attempt INSERT · TopicStat UPDATE (F-expressions) · running stats
+    UPDATE · ProctorLog bulk INSERT · instance UPDATE · UsageLog INSERT
+
+    Skill profile recomputation is registered with on_commit (queued as
+    one coalesced row, or run inline with the queue off), so the write
+    lock is held only for the cheap statements above.
+    Returns (attempt, correct, total).
+    """
+    correct, total, wrong = grade_quiz(quiz, answers)
+    percent = (correct / total) * 100 if total else 0
+    tip = generate_ai_tip(wrong) if wrong else None
+    now = timezone.now()
+
+    book_id = None
+    if user:
+        book_id = (
+            Book.objects
+            .filter(slug=quiz.subject)
+            .values_list("id", flat=True)
+            .first()
+        )
+
+    with transaction.atomic():
+        inst_exists = bool(instance_id) and QuizInstance.objects.filter(
+            pk=instance_id
+        ).update(finished_at=now)
+
+        attempt = QuizAttempt.objects.create(
+            user=user,
+            quiz=quiz,
+            instance_id=instance_id if inst_exists else None,
+            answers_json=answers,
+            score=percent,
+            correct_count=correct,
+            total_questions=total,
+            mistakes=wrong,
+            ai_tip=tip,
+            submitted_at=now,
+        )
+
+        mastery_delta, new_topic = 0.0, False
+        if user and book_id:
+            mastery_delta, new_topic = update_topic_stat(
+                user, book_id, quiz.chapter, correct, total, percent, now
+            )
+
+        if user:
+            record_quiz_result(user, percent, mastery_delta, new_topic)
+
+        if proctor_events:
+            student_id = getattr(user, "username", "anon")
+            ProctorLog.objects.bulk_create([
+                ProctorLog(
+                    quiz_instance_id=instance_id if inst_exists else None,
+                    student_id=student_id,
+                    event=ev,
+                )
+                for ev in proctor_events
+            ])
+
+        if user:
+            UsageLog.objects.create(user=user, action="quiz")
+
+        if user and book_id:
+            # After commit: the inline recompute (queue off) or the queue
+            # INSERT never runs under the submit transaction's write lock
+            transaction.on_commit(lambda: enqueue_profile_recompute(user))
+
+    return attempt, correct, total
@@ -0,0 +1,279 @@
+# core/utils_training.py
+
+import csv
+import time
+import tracemalloc
+
+import numpy as np
+from joblib import cpu_count
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.model_selection import StratifiedKFold, cross_validate
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from core.models import SkillProfile
+from core.utils_model_registry import save_model
+from core.utils_prediction_engine import FEATURES, MODEL_NAME
+
+
+CLASSES = np.array([0, 1, 2])  # High Risk / Service / Tier-1
+
+MIN_TRAINING_ROWS = 10
+
+
+# =====================================================
+# LABELS
+# =====================================================
+def readiness_labels(X):
+    """TEMP label logic until real outcomes exist: ≥75 Tier-1, ≥50 Service."""
+    readiness = X[:, FEATURES.index("readiness_score")]
+    return np.digitize(readiness, [50, 75])
+
+
+def load_outcome_labels(path):
+    """CSV with user_id,label (0/1/2) — real placement outcomes."""
+    with open(path, newline="") as f:
+        return {
+            int(row["user_id"]): int(row["label"])
+            for row in csv.DictReader(f)
+        }
+
+
+# =====================================================
+# STREAMING FEATURE EXTRACTION
+# =====================================================
+def _profile_rows(chunk_size):
+    return (
+        SkillProfile.objects
+        .order_by("id")
+        .values_list("user_id", *FEATURES)
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def iter_feature_chunks(chunk_size=5000, outcomes=None):
+    """
+    Yields (X, y) blocks of at most chunk_size rows straight from the
+    DB cursor. With `outcomes`, only labelled users are kept.
+    """
+    buf_x = np.empty((chunk_size, len(FEATURES)), dtype=np.float64)
+    buf_y = np.empty(chunk_size, dtype=np.int64)
+    k = 0
+
+    for row in _profile_rows(chunk_size):
+        if outcomes is not None:
+            label = outcomes.get(row[0])
+            if label is None:
+                continue
+            buf_y[k] = label
+
+        buf_x[k] = row[1:]
+        k += 1
+
+        if k == chunk_size:
+            yield _finish_chunk(buf_x, buf_y, k, outcomes)
+            k = 0
+
+    if k:
+        yield _finish_chunk(buf_x, buf_y, k, outcomes)
+
+
+def _finish_chunk(buf_x, buf_y, k, outcomes):
+    X = np.nan_to_num(buf_x[:k].copy())
+    y = buf_y[:k].copy() if outcomes is not None else readiness_labels(X)
+    return X, y
+
+
+def extract_features(chunk_size=5000, outcomes=None):
+    """
+    Fills preallocated (n, features) / (n,) arrays chunk by chunk —
+    no intermediate Python lists of rows.
+    """
+    n = SkillProfile.objects.count()
+    X = np.empty((n, len(FEATURES)), dtype=np.float64)
+    y = np.empty(n, dtype=np.int64)
+
+    k = 0
+    for cx, cy in iter_feature_chunks(chunk_size, outcomes):
+        X[k:k + len(cx)] = cx
+        y[k:k + len(cy)] = cy
+        k += len(cx)
+
+    return X[:k], y[:k]
+
+
+# =====================================================
+# MODELS
+# =====================================================
+def make_batch_model():
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", LogisticRegression(max_iter=1000)),
+    ])
+
+
+def make_incremental_model():
+    # log_loss keeps predict_proba available for the prediction engine
+    return Pipeline([
+        ("scaler", StandardScaler()),
+        ("clf", SGDClassifier(loss="log_loss", alpha=1e-4, random_state=42)),
+    ])
+
+
+def fit_incremental(chunk_source, epochs=3):
+    """
+    Out-of-core fit: pass 1 fits the scaler, then `epochs` passes of
+    SGDClassifier.partial_fit. Memory stays at one chunk.
+    `chunk_source` is a zero-arg callable returning a fresh iterator.
+    """
+    model = make_incremental_model()
+    scaler, clf = model.named_steps["scaler"], model.named_steps["clf"]
+
+    rows = 0
+    for X, _ in chunk_source():
+        scaler.partial_fit(X)
+        rows += len(X)
+
+    for _ in range(epochs):
+        for X, y in chunk_source():
+            clf.partial_fit(scaler.transform(X), y, classes=CLASSES)
+
+    return model, rows
+
+
+# =====================================================
+# PARALLEL CROSS-VALIDATION
+# =====================================================
+def parallel_cv(make_model, X, y, folds=5, n_jobs=-1):
+    """Folds run in parallel joblib workers."""
+    folds = min(folds, int(np.bincount(y).max()) if len(y) else 0)
+    if folds < 2:
+        return {}
+
+    scores = cross_validate(
+        make_model(), X, y,
+        cv=StratifiedKFold(n_splits=folds, shuffle=True, random_state=42),
+        scoring=("accuracy", "f1_macro"),
+        n_jobs=n_jobs,
+        error_score=np.nan,
+    )
+
+    return {
+        "cv_folds": folds,
+        "cv_accuracy_mean": round(float(np.nanmean(scores["test_accuracy"])), 4),
+        "cv_accuracy_std": round(float(np.nanstd(scores["test_accuracy"])), 4),
+        "cv_f1_macro_mean": round(float(np.nanmean(scores["test_f1_macro"])), 4),
+        "cv_fit_seconds_mean": round(float(np.mean(scores["fit_time"])), 4),
+    }
+
+
+def _sample_for_cv(chunk_source, n, size, seed=42):
+    """Uniform row sample (without holding the full matrix) for incremental CV."""
+    size = min(size, n)
+    keep = np.zeros(n, dtype=bool)
+    keep[np.random.default_rng(seed).choice(n, size=size, replace=False)] = True
+
+    xs, ys, offset = [], [], 0
+    for X, y in chunk_source():
+        mask = keep[offset:offset + len(X)]
+        xs.append(X[mask])
+        ys.append(y[mask])
+        offset += len(X)
+
+    if not xs:
+        return np.empty((0, len(FEATURES))), np.empty(0, dtype=np.int64)
+    return np.concatenate(xs), np.concatenate(ys)
+
+
+# =====================================================
+# PIPELINE
+# =====================================================
+def train_placement_model(
+    mode="batch",
+    chunk_size=5000,
+    epochs=3,
+    cv_folds=5,
+    cv_sample=50000,
+    n_jobs=-1,
+    outcomes_csv=None,
+    register=True,
+):
+    """
+    Streams SkillProfile features, fits (batch LogisticRegression or
+    incremental SGD), cross-validates in parallel, and optionally
+    registers the model. Returns the training report dict.
+    """
+    report = {"mode": mode, "chunk_size": chunk_size, "features": list(FEATURES)}
+    timings = {}
+
+    outcomes = load_outcome_labels(outcomes_csv) if outcomes_csv else None
+    report["label_source"] = "outcomes" if outcomes is not None else "readiness"
+
+    tracemalloc.start()
+    t0 = time.perf_counter()
+
+    if mode == "incremental":
+        def chunks():
+            return iter_feature_chunks(chunk_size, outcomes)
+
+        model, rows = fit_incremental(chunks, epochs=epochs)
+        timings["fit_seconds"] = time.perf_counter() - t0
+
+        if rows < MIN_TRAINING_ROWS:
+            tracemalloc.stop()
+            return {**report, "rows": rows, "error": "Not enough data to train model."}
+
+        t1 = time.perf_counter()
+        X_cv, y_cv = _sample_for_cv(chunks, rows, cv_sample)
+        timings["cv_sample_seconds"] = time.perf_counter() - t1
+        X_eval, y_eval, make = X_cv, y_cv, make_incremental_model
+    else:
+        X, y = extract_features(chunk_size, outcomes)
+        rows = len(X)
+        timings["extract_seconds"] = time.perf_counter() - t0
+
+        if rows < MIN_TRAINING_ROWS:
+            tracemalloc.stop()
+            return {**report, "rows": rows, "error": "Not enough data to train model."}
+
+        t1 = time.perf_counter()
+        model = make_batch_model().fit(X, y)
+        timings["fit_seconds"] = time.perf_counter() - t1
+        X_eval, y_eval, make = X, y, make_batch_model
+
+    t2 = time.perf_counter()
+    cv = parallel_cv(make, X_eval, y_eval, folds=cv_folds, n_jobs=n_jobs)
+    timings["cv_seconds"] = time.perf_counter() - t2
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings["total_seconds"] = time.perf_counter() - t0
+
+    report.update({
+        "rows": rows,
+        "label_distribution": {
+            str(c): int(n) for c, n in zip(*np.unique(y_eval, return_counts=True))
+        },
+        "train_accuracy": round(float(model.score(X_eval, y_eval)), 4) if len(y_eval) else None,
+        "timings": {k: round(v, 3) for k, v in timings.items()},
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+        "cv_workers": cpu_count() if n_jobs == -1 else n_jobs,
+        **cv,
+    })
+
+    if register:
+        metrics = {
+            k: report[k] for k in (
+                "train_accuracy", "cv_accuracy_mean", "cv_accuracy_std", "cv_f1_macro_mean",
+            ) if k in report
+        }
+        report["version"] = save_model(
+            MODEL_NAME, model,
+            features=FEATURES,
+            training_size=rows,
+            metrics=metrics,
+            extra={"training_report": report},
+        )
+
+    return report
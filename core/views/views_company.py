@@ -1,9 +1,14 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.db.models import Q
 
-from core.models import CompanyUser, SkillProfile
-from core.utils_prediction_engine import calculate_placement_prediction
+from core import utils_prediction_ml
+from core.models import CompanyUser, InstitutionMembership
+from core.utils_candidate_search import (
+    ModelUnavailableError,
+    SearchLimitError,
+    search_candidates,
+    search_params,
+)
 
 
 @login_required
@@ -16,37 +21,38 @@ def company_dashboard(request):
     if not company_user:
         return render(request, "core/not_authorized.html")
 
-    min_readiness = request.GET.get("min_readiness")
-    branch = request.GET.get("branch")
-
-    profiles = SkillProfile.objects.all().select_related("user")
-
-    if min_readiness:
-        profiles = profiles.filter(readiness_score__gte=min_readiness)
-
-    candidates = []
-
-    for profile in profiles:
-
-        prediction = calculate_placement_prediction(profile.user)
-
-        candidates.append({
-            "username": profile.user.username,
-            "readiness": profile.readiness_score,
-            "behavior": getattr(profile, "behavior_score", 0),
-            "prediction": prediction
-        })
-
-    # Sort by readiness descending
-    candidates = sorted(
-        candidates,
-        key=lambda x: x["readiness"],
-        reverse=True
-    )
+    # Same params, defaults and sort as /api/company/filter/ so the
+    # "Load more" cursor continues this page's result set
+    error = None
+    filters, sort = {}, request.GET.get("sort", "")
+    try:
+        filters, defaults, sort = search_params(
+            request.GET,
+            model_loaded=utils_prediction_ml.model_version() is not None,
+        )
+        page = search_candidates(
+            company_user.company,
+            filters,
+            sort=sort,
+            cursor=request.GET.get("cursor"),
+            defaults=defaults,
+        )
+        filters = {**defaults, **filters}
+    except (ModelUnavailableError, SearchLimitError, ValueError) as e:
+        error = str(e)
+        page = {"results": [], "count": 0, "next_cursor": None, "limit_reached": False}
 
     return render(request, "core/company_dashboard.html", {
         "company": company_user.company,
-        "candidates": candidates[:50]
+        "candidates": page["results"],
+        "count": page["count"],
+        "next_cursor": page["next_cursor"],
+        "error": error,
+        "filters": filters,
+        "risk": request.GET.get("risk", "all"),
+        "sort": sort,
+        "branches": InstitutionMembership.BRANCH_CHOICES,
+        "batches": InstitutionMembership.BATCH_CHOICES,
     })
 
 
@@ -1,25 +1,29 @@
 import json
-import re
 
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
+from django.db import transaction
 
 from core.utils_interview_engine import (
     get_or_create_weekly_session,
-    update_adaptive_difficulty
+    adaptive_difficulty
 )
+from core.utils_answer_scoring import score_answer
 from core.utils_behavior_engine import analyze_session_behavior
-from core.utils_skill_engine import recompute_skill_profile
+from core.utils_profile_queue import enqueue_profile_recompute
+from core.utils_running_stats import record_interview_response
 
 from core.models import (
     InterviewResponse,
     UsageLog,
     InterviewSession,
-    SkillProfile
 )
 
 
+QUESTIONS_PER_SESSION = 5
+
+
 # ======================================================
 # LOCAL HR INTERVIEW EVALUATOR
 # ======================================================
@@ -45,30 +49,15 @@ def hr_interviewer(request):
             )
 
         # ----------------------------------------
-        # BASIC SCORING LOGIC
+        # RUBRIC SCORING (compiled once per subject)
         # ----------------------------------------
-        word_count = len(answer.split())
-
-        java_keywords = [
-            "java", "jvm", "class", "object",
-            "method", "memory", "runtime",
-            "inheritance", "polymorphism"
-        ]
-
-        keyword_hits = sum(
-            1 for k in java_keywords
-            if re.search(rf"\b{k}\b", answer.lower())
-        )
-
-        technical_score = min(10, 3 + keyword_hits)
-        clarity_score = 8 if word_count > 60 else 5
-        communication_score = 7 if "." in answer else 5
-        confidence_score = 7 if word_count > 40 else 5
+        scores = score_answer(answer, data.get("subject"))
 
-        total_score = round(
-            (technical_score + clarity_score + communication_score + confidence_score) / 4,
-            1
-        )
+        technical_score = scores["technical_score"]
+        clarity_score = scores["clarity_score"]
+        communication_score = scores["communication_score"]
+        confidence_score = scores["confidence_score"]
+        total_score = scores["total_score"]
 
         # ----------------------------------------
         # WEEKLY SESSION LOCK
@@ -83,65 +72,45 @@ def hr_interviewer(request):
         # ----------------------------------------
         # SAVE RESPONSE
         # ----------------------------------------
-        InterviewResponse.objects.create(
-            session=session,
-            question_text=question,
-            answer_text=answer,
-            technical_score=technical_score,
-            clarity_score=clarity_score,
-            communication_score=communication_score,
-            confidence_score=confidence_score,
-            total_score=total_score,
-            answer_length=word_count,
-            time_taken_seconds=data.get("time_taken", 0)
-        )
-
-        # ----------------------------------------
-        # UPDATE SESSION ANALYTICS
-        # ----------------------------------------
-        responses = session.responses.all()
-        session.total_questions = responses.count()
-
-        if session.total_questions > 0:
-            session.average_score = (
-                sum(r.total_score for r in responses) / session.total_questions
+        with transaction.atomic():
+            response = InterviewResponse.objects.create(
+                session=session,
+                question_text=question,
+                answer_text=answer,
+                subject=scores["subject"],
+                technical_score=technical_score,
+                clarity_score=clarity_score,
+                communication_score=communication_score,
+                confidence_score=confidence_score,
+                total_score=total_score,
+                answer_length=scores["word_count"],
+                time_taken_seconds=data.get("time_taken", 0)
             )
-            session.avg_answer_length = (
-                sum(r.answer_length for r in responses) / session.total_questions
-            )
-            session.avg_time_taken = (
-                sum(r.time_taken_seconds for r in responses) / session.total_questions
-            )
-
-        session.save()
-
-        # ----------------------------------------
-        # BEHAVIOR ANALYSIS
-        # ----------------------------------------
-        analyze_session_behavior(session)
 
-        # ----------------------------------------
-        # MARK COMPLETE (5 Q rule)
-        # ----------------------------------------
-        if session.total_questions >= 5:
-            session.completed = True
-            session.save()
+            # ----------------------------------------
+            # UPDATE SESSION ANALYTICS + MARK COMPLETE (5 Q rule)
+            # one atomic F-expression UPDATE, safe under parallel answers
+            # ----------------------------------------
+            record_interview_response(
+                session, response, complete_at=QUESTIONS_PER_SESSION
+            )
 
         # ----------------------------------------
-        # ADAPTIVE DIFFICULTY UPDATE
+        # BEHAVIOR ANALYSIS + PROFILE (one SkillProfile write:
+        # interview scores, adaptive difficulty, behavior, risk)
         # ----------------------------------------
-        update_adaptive_difficulty(request.user)
+        profile_updates = {
+            "communication_score": communication_score * 10,
+            "confidence_score": confidence_score * 10,
+        }
 
-        # ----------------------------------------
-        # UPDATE SKILL PROFILE
-        # ----------------------------------------
-        profile, _ = SkillProfile.objects.get_or_create(user=request.user)
+        next_difficulty = adaptive_difficulty(request.user)
+        if next_difficulty:
+            profile_updates["next_difficulty"] = next_difficulty
 
-        profile.communication_score = communication_score * 10
-        profile.confidence_score = confidence_score * 10
-        profile.save()
+        analyze_session_behavior(session, profile_updates)
 
-        recompute_skill_profile(request.user)
+        enqueue_profile_recompute(request.user)
 
         # ----------------------------------------
         # USAGE TRACKING
@@ -19,6 +19,7 @@ from core.models import (
     QuizAttempt,
     TopicStat,
 )
+from core.utils_streak import stored_streak
 
 
 # ======================================================
@@ -162,7 +163,7 @@ def profile_analytics_api(request):
         "total_quizzes": total_quizzes,
         "strong_topics": list(strong_topics),
         "weak_topics": list(weak_topics),
-        "streak": profile.streak if profile else 0,
+        "streak": stored_streak(profile),
         "level": profile.level if profile else 1,
         "xp": profile.xp if profile else 0,
     })
@@ -3,20 +3,16 @@ import random
 import traceback
 from datetime import date, timedelta
 
-from core.models import UsageLog
-
 from django.http import HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
-from django.utils import timezone
 
 
 from core.models import (
     QuizChapter,
     QuizInstance,
-    QuizAttempt,
     DailyQuiz,
     ProctorLog,
     WeeklyQuiz,
@@ -29,6 +25,24 @@ from core.quiz_generator import (
     generate_mixed_quiz_from_text,
     combine_texts_from_sections,
 )
+from core.utils_item_stats import record_item_responses, select_items
+from core.utils_submission import record_submission
+from core.utils_quiz_cache import (
+    cached_json_response,
+    get_chapter_quiz_entry,
+    get_latest_chapter_quiz_entry,
+    get_daily_quiz_entry,
+    strip_answers,
+    build_entry,
+)
+from core.utils_quiz_paging import (
+    SOURCE_MODELS,
+    FLAT_SECTION,
+    DEFAULT_PAGE_SIZE,
+    first_cursor,
+    get_page,
+    get_quiz_sections,
+)
 
 
 
@@ -134,37 +148,24 @@ def generate_quiz(request):
 def get_quiz(request, quiz_id=None):
 
     try:
-        # If quiz_id comes from URL
+        # quiz_id from URL, else from query param
+        quiz_id = quiz_id or request.GET.get("quiz_id")
+
         if quiz_id:
-            qc = QuizChapter.objects.get(pk=quiz_id)
-            return JsonResponse({
-                "quiz_id": qc.id,
-                "questions": qc.questions_json
-            })
-
-        # If quiz_id comes from query param
-        quiz_id_param = request.GET.get("quiz_id")
-
-        if quiz_id_param:
-            qc = QuizChapter.objects.get(pk=quiz_id_param)
-            return JsonResponse({
-                "quiz_id": qc.id,
-                "questions": qc.questions_json
-            })
+            entry = get_chapter_quiz_entry(quiz_id)
+
+            if entry is None:
+                return JsonResponse({"error": "Quiz not found"}, status=404)
+
+            return cached_json_response(request, entry)
 
         # Otherwise return latest quiz
-        qc = QuizChapter.objects.order_by("-created_at").first()
+        entry = get_latest_chapter_quiz_entry()
 
-        if not qc:
+        if entry is None:
             return JsonResponse({"questions": []})
 
-        return JsonResponse({
-            "quiz_id": qc.id,
-            "questions": qc.questions_json
-        })
-
-    except QuizChapter.DoesNotExist:
-        return JsonResponse({"error": "Quiz not found"}, status=404)
+        return cached_json_response(request, entry)
 
     except Exception as e:
         return JsonResponse({"error": str(e)}, status=500)
@@ -179,190 +180,188 @@ def get_quiz(request, quiz_id=None):
 def start_quiz(request):
     try:
         payload = json.loads(request.body or "{}")
+        source = payload.get("source", "chapter")
         quiz_id = payload.get("quiz_id")
         student_id = payload.get("student_id", "anon")
 
-        quiz = QuizChapter.objects.get(pk=quiz_id)
+        if source not in SOURCE_MODELS:
+            return HttpResponseBadRequest("Unknown quiz source")
+
+        quiz_id = _resolve_quiz_id(request, source, quiz_id)
+        if not quiz_id:
+            return HttpResponseBadRequest("Quiz not found")
+
+        data = get_quiz_sections(source, quiz_id)
+        if data is None:
+            return HttpResponseBadRequest("Quiz not found")
+
+        cursor = first_cursor(data["sections"]) or {"section": "", "offset": 0}
 
         inst = QuizInstance.objects.create(
-            quiz=quiz,
-            student_id=student_id
+            source=source,
+            quiz_id=quiz_id if source == "chapter" else None,
+            daily_quiz_id=quiz_id if source == "daily" else None,
+            weekly_quiz_id=quiz_id if source == "weekly" else None,
+            student_id=student_id,
+            cursor_section=cursor["section"],
+            cursor_offset=cursor["offset"],
         )
 
         return JsonResponse({
             "instance_id": inst.id,
-            "started_at": inst.started_at.isoformat()
+            "started_at": inst.started_at.isoformat(),
+            "sections": {name: len(qs) for name, qs in data["sections"].items()},
+            "cursor": cursor,
         })
 
-    except QuizChapter.DoesNotExist:
-        return HttpResponseBadRequest("Quiz not found")
     except Exception as e:
         return HttpResponseBadRequest(str(e))
 
-# ======================================================
-# SUBMIT QUIZ + PROCTOR DATA
-# ======================================================
-# ======================================================
-# SUBMIT QUIZ + PROCTOR DATA (WEEK 3 INTELLIGENCE VERSION)
-# ======================================================
-@csrf_exempt
-@require_http_methods(["POST"])
-def submit_quiz(request):
 
-    
-    UsageLog.objects.create(
-    user=user,
-    action="quiz"
-)
+def _resolve_quiz_id(request, source, quiz_id=None, inst=None):
+    """quiz_id param → instance link → today's / this week's quiz."""
+    if quiz_id:
+        return int(quiz_id)
 
-    try:
-        payload = json.loads(request.body or "{}")
+    if inst is not None:
+        return {
+            "chapter": inst.quiz_id,
+            "daily": inst.daily_quiz_id,
+            "weekly": inst.weekly_quiz_id,
+        }[source]
 
-        quiz_id = payload.get("quiz_id")
-        answers = payload.get("answers", [])
-        instance_id = payload.get("instance_id")
-        proctor_events = payload.get("proctor_events", [])
+    if source == "daily":
+        return (
+            DailyQuiz.objects
+            .filter(date=date.today())
+            .values_list("id", flat=True)
+            .first()
+        )
 
-        user = request.user if request.user.is_authenticated else None
+    if source == "weekly" and request.user.is_authenticated:
+        return (
+            WeeklyQuiz.objects
+            .filter(user=request.user, week_start=_week_start())
+            .values_list("id", flat=True)
+            .first()
+        )
 
-        # ----------------------------------
-        # FETCH QUIZ
-        # ----------------------------------
-        quiz = QuizChapter.objects.get(pk=quiz_id)
+    return None
 
-        # ----------------------------------
-        # FETCH QUIZ INSTANCE (OPTIONAL)
-        # ----------------------------------
+
+# ======================================================
+# PAGED QUESTION FETCH
+# ======================================================
+@require_http_methods(["GET"])
+def quiz_page(request):
+    """
+    GET /api/quiz-page/?source=chapter&quiz_id=1&section=mcq&offset=0&limit=5
+
+    Serves one page of questions (answers stripped) from the cached
+    section index, plus a `next` cursor the client can prefetch.
+    With instance_id and no section/offset, resumes from the
+    instance's cursor and advances it.
+    """
+    try:
         inst = None
+        instance_id = request.GET.get("instance_id")
+
         if instance_id:
-            try:
-                inst = QuizInstance.objects.get(pk=instance_id)
-            except QuizInstance.DoesNotExist:
-                inst = None
+            inst = QuizInstance.objects.filter(pk=instance_id).first()
+            if inst is None:
+                return JsonResponse({"error": "Quiz instance not found"}, status=404)
 
-        # ----------------------------------
-        # EVALUATE QUIZ
-        # ----------------------------------
-        score = 0
-        total = 0
-        wrong = []
+        source = request.GET.get("source") or (inst.source if inst else "chapter")
+        if source not in SOURCE_MODELS:
+            return JsonResponse({"error": "Unknown quiz source"}, status=400)
 
-        questions = quiz.questions_json  # assuming list
+        quiz_id = _resolve_quiz_id(request, source, request.GET.get("quiz_id"), inst)
+        data = get_quiz_sections(source, quiz_id) if quiz_id else None
 
-        for idx, q in enumerate(questions):
-            total += 1
-            given = answers[idx] if idx < len(answers) else None
-            correct_answer = q.get("answer")
+        if data is None:
+            return JsonResponse({"error": "Quiz not found"}, status=404)
 
-            if str(given).strip().lower() == str(correct_answer).strip().lower():
-                score += 1
-            else:
-                wrong.append({
-                    "question": q.get("question"),
-                    "topic": quiz.chapter
-                })
+        if data["owner_id"] and data["owner_id"] != request.user.id:
+            return JsonResponse({"error": "Forbidden"}, status=403)
+
+        section = request.GET.get("section")
+        offset = request.GET.get("offset")
+        from_cursor = section is None and inst is not None
+
+        if from_cursor:
+            section, offset = inst.cursor_section, inst.cursor_offset
+        if not section:
+            cursor = first_cursor(data["sections"])
+            section = cursor["section"] if cursor else FLAT_SECTION
 
-        percent_score = (score / total) * 100 if total else 0
-
-        # ----------------------------------
-        # CREATE QUIZ ATTEMPT
-        # ----------------------------------
-        attempt = QuizAttempt.objects.create(
-            user=user,
-            quiz=quiz,
-            instance=inst,
-            answers_json=answers,
-            score=percent_score,
-            correct_count=score,
-            total_questions=total,
-            submitted_at=timezone.now()
+        page = get_page(
+            data, section, offset or 0,
+            request.GET.get("limit") or DEFAULT_PAGE_SIZE,
         )
 
-        # ----------------------------------
-        # 🔥 WEEK 3: UPDATE TOPIC STAT (INTELLIGENCE CORE)
-        # ----------------------------------
-        if user:
-            from core.models import Book, TopicStat
-            from core.utils_skill_engine import recompute_skill_profile
+        if page is None:
+            return JsonResponse({"error": f"Unknown section '{section}'"}, status=400)
 
-            book = Book.objects.filter(slug=quiz.subject).first()
+        page.update({"source": source, "quiz_id": quiz_id})
 
-            if book:
-                topic_stat, _ = TopicStat.objects.get_or_create(
-                    user=user,
-                    book=book,
-                    topic=quiz.chapter
-                )
+        if inst is not None:
+            nxt = page["next"] or {
+                "section": section, "offset": page["offset"] + len(page["questions"]),
+            }
+            QuizInstance.objects.filter(pk=inst.pk).update(
+                cursor_section=nxt["section"],
+                cursor_offset=nxt["offset"],
+            )
 
-                previous_mastery = topic_stat.mastery_score
+        response = cached_json_response(
+            request, build_entry(page, data["last_modified"])
+        )
 
-                topic_stat.attempts += 1
-                topic_stat.correct += score
+        # Same URL returns a different page as the cursor moves
+        if from_cursor:
+            response["Cache-Control"] = "no-cache"
 
-                # Calculate new mastery
-                new_mastery = (
-                    (topic_stat.correct / (topic_stat.attempts * total)) * 100
-                    if total else 0
-                )
+        return response
 
-                # -------------------------
-                # 1️⃣ IMPROVEMENT RATE
-                # -------------------------
-                improvement = new_mastery - previous_mastery
-                topic_stat.improvement_rate = round(improvement, 2)
-                topic_stat.last_mastery_score = previous_mastery
-
-                if improvement > 0:
-                    topic_stat.last_improved_at = timezone.now()
-
-                # -------------------------
-                # 2️⃣ DECAY ENGINE
-                # -------------------------
-                if topic_stat.last_attempted:
-                    days_idle = (timezone.now() - topic_stat.last_attempted).days
-                    if days_idle > 14:
-                        new_mastery *= 0.95  # 5% decay
-
-                topic_stat.mastery_score = round(new_mastery, 2)
-                topic_stat.last_attempted = timezone.now()
-                topic_stat.save()
-
-                # -------------------------
-                # 3️⃣ ADAPTIVE TRIGGER
-                # -------------------------
-                recompute_skill_profile(user)
-
-        # ----------------------------------
-        # AI TIP GENERATION
-        # ----------------------------------
-        if wrong:
-            attempt.ai_tip = generate_ai_tip(wrong)
-            attempt.save()
-
-        # ----------------------------------
-        # SAVE PROCTOR EVENTS
-        # ----------------------------------
-        for ev in proctor_events:
-            ProctorLog.objects.create(
-                quiz_instance=inst,
-                student_id=getattr(user, "username", "anon"),
-                event=ev
-            )
+    except ValueError:
+        return JsonResponse({"error": "offset/limit must be integers"}, status=400)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+# ======================================================
+# SUBMIT QUIZ + PROCTOR DATA
+# ======================================================
+# ======================================================
+# SUBMIT QUIZ + PROCTOR DATA (WEEK 3 INTELLIGENCE VERSION)
+# ======================================================
+@csrf_exempt
+@require_http_methods(["POST"])
+def submit_quiz(request):
+    try:
+        payload = json.loads(request.body or "{}")
 
-        # ----------------------------------
-        # FINISH QUIZ INSTANCE
-        # ----------------------------------
-        if inst:
-            inst.finished_at = timezone.now()
-            inst.save()
+        quiz_id = payload.get("quiz_id")
+        answers = payload.get("answers", [])
+        instance_id = payload.get("instance_id")
+        proctor_events = payload.get("proctor_events", [])
+
+        user = request.user if request.user.is_authenticated else None
+
+        quiz = QuizChapter.objects.only(
+            "id", "subject", "chapter", "questions_json"
+        ).get(pk=quiz_id)
+
+        # Grade + persist in one transaction; profile recompute runs after commit
+        attempt, score, total = record_submission(
+            user, quiz, answers,
+            instance_id=instance_id,
+            proctor_events=proctor_events,
+        )
 
-        # ----------------------------------
-        # FINAL RESPONSE
-        # ----------------------------------
         return JsonResponse({
             "status": "submitted",
             "attempt_id": attempt.id,
-            "score": percent_score,
+            "score": attempt.score,
             "correct": score,
             "total": total,
             "ai_tip": attempt.ai_tip
@@ -446,9 +445,9 @@ def generate_daily_quiz(request):
             total_questions=25
         )
 
-        dq, _ = DailyQuiz.objects.update_or_create(
+        DailyQuiz.objects.update_or_create(
             date=today,
-            defaults={"questions_json": quiz}
+            defaults={"subject": subject, "questions_json": quiz}
         )
 
         return JsonResponse({
@@ -469,14 +468,10 @@ def generate_daily_quiz(request):
 def get_daily_quiz(request):
     try:
         today = date.today()
-        dq = DailyQuiz.objects.filter(date=today).first()
+        entry = get_daily_quiz_entry(today)
 
-        if dq:
-            return JsonResponse({
-                "date": str(today),
-                "quiz": dq.questions_json,
-                "new": False
-            })
+        if entry:
+            return cached_json_response(request, entry)
 
         # auto-generate if missing
         subject = _pick_subject_by_rotation()
@@ -495,14 +490,15 @@ def get_daily_quiz(request):
         raw_text = combine_texts_from_sections(texts)
         quiz = generate_mixed_quiz_from_text(raw_text, total_questions=25)
 
-        dq = DailyQuiz.objects.create(
+        DailyQuiz.objects.create(
             date=today,
+            subject=subject,
             questions_json=quiz
         )
 
         return JsonResponse({
             "date": str(today),
-            "quiz": quiz,
+            "quiz": strip_answers(quiz),
             "new": True
         })
 
@@ -573,6 +569,11 @@ def submit_daily_quiz(request):
 
         percent = (score / total) * 100 if total else 0
 
+        # ✅ Per-item outcomes for difficulty calibration
+        record_item_responses(
+            request.user, f"daily:{dq.id}", dq.subject, dq.questions_json, answers
+        )
+
         return JsonResponse({
             "score": percent,
             "correct": score,
@@ -638,20 +639,22 @@ def generate_weekly_quiz(request):
     )
 
     texts = []
+    subject = None
 
     for topic in weak_topics:
         for subj, info in BOOK_KB.items():
             if topic in info["sections"]:
+                subject = subject or subj
                 texts.append(
                     " ".join(info["sections"][topic]["sentences"])
                 )
 
     if not texts:
         # fallback
-        subj = random.choice(list(BOOK_KB.keys()))
+        subject = random.choice(list(BOOK_KB.keys()))
         texts = [
             " ".join(sec["sentences"])
-            for sec in list(BOOK_KB[subj]["sections"].values())[:5]
+            for sec in list(BOOK_KB[subject]["sections"].values())[:5]
         ]
 
     quiz = generate_mixed_quiz_from_text(
@@ -659,9 +662,15 @@ def generate_weekly_quiz(request):
         total_questions=30
     )
 
+    # ✅ Difficulty-calibrated items at the student's next_difficulty
+    calibrated = select_items(user, subject, count=5)
+    if calibrated:
+        quiz["mcq"] = calibrated + quiz["mcq"][:max(0, 10 - len(calibrated))]
+
     WeeklyQuiz.objects.create(
         user=user,
         week_start=week,
+        subject=subject,
         questions_json=quiz
     )
 
@@ -692,6 +701,15 @@ def submit_weekly_quiz(request):
     quiz.score = (score / total) * 100 if total else 0
     quiz.save()
 
+    # ✅ Per-item outcomes for difficulty calibration (MCQs are the graded part)
+    record_item_responses(
+        request.user,
+        f"weekly:{quiz.id}",
+        quiz.subject,
+        {"mcq": quiz.questions_json.get("mcq", [])},
+        {"mcq": answers.get("mcq", [])},
+    )
+
     return JsonResponse({
         "score": quiz.score,
         "total": total
@@ -699,21 +717,6 @@ def submit_weekly_quiz(request):
 
 
 
-def generate_ai_tip(wrong_questions):
-    if not wrong_questions:
-        return "Excellent work! Keep practicing."
-
-    topics = set()
-    for q in wrong_questions:
-        if "topic" in q:
-            topics.add(q["topic"])
-
-    tips = [f"Revise core concepts of {t}" for t in topics]
-    return " | ".join(tips)
-
-
-
-
 from django.shortcuts import render
 
 @login_required
@@ -1,7 +1,6 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from core.models import Institution, SkillProfile
-from django.db.models import Avg, Sum
+from core.utils_platform_analytics import institutions_page, platform_totals
 
 
 @login_required
@@ -16,53 +15,23 @@ def super_admin_dashboard(request):
     ):
         return render(request, "core/not_authorized.html")
 
-    institutions = Institution.objects.all()
-
-
     # --------------------------------------------------
-    # Platform-wide analytics
+    # Platform-wide analytics (two aggregates)
     # --------------------------------------------------
-    total_colleges = institutions.count()
-    total_students = SkillProfile.objects.count()
-
-    avg_readiness = (
-        SkillProfile.objects.aggregate(
-            avg=Avg("readiness_score")
-        )["avg"] or 0
-    )
-
-    total_revenue = (
-        Institution.objects.filter(is_active=True)
-        .aggregate(total=Sum("monthly_price"))["total"] or 0
-    )
-
-    college_analytics = []
+    totals = platform_totals()
 
     # --------------------------------------------------
-    # Per College Analytics
+    # Per College Analytics (one grouped query, paged + sorted)
     # --------------------------------------------------
-    for inst in institutions:
-
-        student_ids = inst.institutionmembership_set.filter(
-            role="student"
-        ).values_list("user", flat=True)
-
-        avg = SkillProfile.objects.filter(
-            user__in=student_ids
-        ).aggregate(avg=Avg("readiness_score"))["avg"] or 0
-
-        college_analytics.append({
-            "name": inst.name,
-            "avg_readiness": round(avg, 2),
-            "students": len(student_ids),
-            "plan": inst.plan,
-        })
+    page, sort = institutions_page(
+        page=request.GET.get("page"),
+        sort=request.GET.get("sort"),
+    )
 
     return render(request, "core/super_admin_dashboard.html", {
-        "institutions": institutions,
-        "total_colleges": total_colleges,
-        "total_students": total_students,
-        "total_revenue": total_revenue,
-        "college_analytics": college_analytics,
-        "avg_readiness": round(avg_readiness, 2),
+        **totals,
+        "institutions": page.object_list,
+        "college_analytics": page.object_list,
+        "page": page,
+        "sort": sort,
     })